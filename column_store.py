@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stockage en colonnes des éléments
+Les identifiants, codes de type, longueurs et indicateurs sont conservés dans des tableaux NumPy
+pour les filtres, comptages et sélections vectorisés ; les chaînes restent dans les dictionnaires
+des éléments (vue liste de dictionnaires).
+"""
+
+from typing import Dict, List, Any, Iterator
+
+import numpy as np
+
+class ColumnStore:
+    """Colonnes NumPy indexées par numéro de ligne, avec la liste des éléments correspondants"""
+    
+    INITIAL_CAPACITY = 1024  # Capacité initiale des colonnes (doublée à chaque dépassement)
+    ITER_CHUNK = 10000  # Lignes converties à la fois lors d'un parcours des éléments
+    
+    # Colonnes et types NumPy
+    COLUMNS = {
+        "id": np.int64,
+        "type_code": np.int16,
+        "order": np.int64,  # Position d'affichage : rang du type (32 bits de poids fort) puis rang dans le type
+        "title_length": np.int32,
+        "description_length": np.int32,
+        "alive": np.bool_,  # False pour une ligne supprimée
+        "modified": np.bool_,
+        "selected": np.bool_,
+        "rank_math": np.bool_,
+        "title_issue": np.bool_,
+        "description_issue": np.bool_,
+        "description_missing": np.bool_
+    }
+    
+    def __init__(self):
+        """Initialisation d'un stockage vide"""
+        self.clear()
+    
+    def clear(self) -> None:
+        """Vide le stockage"""
+        self.records = []  # Élément (dictionnaire) de chaque ligne
+        self.type_names = []  # Nom de chaque code de type
+        self._type_codes = {}  # Nom du type -> code
+        self.size = 0
+        self._columns = {name: np.zeros(self.INITIAL_CAPACITY, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+    
+    def __len__(self) -> int:
+        """Nombre de lignes (y compris les lignes supprimées)"""
+        return self.size
+    
+    def type_code(self, content_type: str, create: bool = True) -> int:
+        """
+        Retourne le code d'un type de contenu
+        
+        Args:
+            content_type: Nom du type de contenu
+            create: Créer le code s'il n'existe pas
+        
+        Returns:
+            Code du type (-1 si inconnu et create=False)
+        """
+        code = self._type_codes.get(content_type)
+        if code is None:
+            if not create:
+                return -1
+            code = len(self.type_names)
+            self._type_codes[content_type] = code
+            self.type_names.append(content_type)
+        return code
+    
+    def column(self, name: str) -> np.ndarray:
+        """
+        Retourne une colonne (vue sur les lignes utilisées, modifiable)
+        
+        Args:
+            name: Nom de la colonne
+        """
+        return self._columns[name][:self.size]
+    
+    def extend(self, records: List[Dict[str, Any]], content_type: str, orders: np.ndarray) -> np.ndarray:
+        """
+        Ajoute des lignes en bloc
+        
+        Args:
+            records: Éléments
+            content_type: Type de contenu des éléments
+            orders: Position d'affichage de chaque élément
+        
+        Returns:
+            Numéros des lignes ajoutées
+        """
+        count = len(records)
+        capacity = len(self._columns["id"])
+        
+        if self.size + count > capacity:
+            # Doublement de la capacité jusqu'à contenir les nouvelles lignes
+            while capacity < self.size + count:
+                capacity *= 2
+            for name, values in self._columns.items():
+                grown = np.zeros(capacity, dtype=values.dtype)
+                grown[:self.size] = values[:self.size]
+                self._columns[name] = grown
+        
+        rows = np.arange(self.size, self.size + count, dtype=np.int64)
+        for values in self._columns.values():
+            values[rows] = 0
+        self._columns["id"][rows] = np.fromiter((record["id"] for record in records), dtype=np.int64, count=count)
+        self._columns["type_code"][rows] = self.type_code(content_type)
+        self._columns["order"][rows] = orders
+        self._columns["alive"][rows] = True
+        
+        self.records.extend(records)
+        self.size += count
+        return rows
+    
+    def set(self, row: int, **values: Any) -> None:
+        """
+        Modifie des valeurs d'une ligne
+        
+        Args:
+            row: Numéro de la ligne
+            values: Valeurs par nom de colonne
+        """
+        for name, value in values.items():
+            self._columns[name][row] = value
+    
+    def get(self, row: int, name: str) -> Any:
+        """Retourne la valeur d'une colonne pour une ligne"""
+        return self._columns[name][row]
+    
+    def rows_where(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Retourne les lignes vivantes satisfaisant un masque, dans l'ordre d'affichage
+        
+        Args:
+            mask: Masque booléen sur les lignes utilisées
+        """
+        rows = np.flatnonzero(mask & self.column("alive"))
+        return rows[np.argsort(self.column("order")[rows], kind="stable")]
+    
+    def records_at(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """Retourne les éléments des lignes données"""
+        records = self.records
+        return [records[row] for row in rows.tolist()]
+    
+    def iter_records_at(self, rows: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """Parcourt les éléments des lignes données sans construire de liste (exportation en flux)"""
+        records = self.records
+        for start in range(0, len(rows), self.ITER_CHUNK):
+            for row in rows[start:start + self.ITER_CHUNK].tolist():
+                yield records[row]
+    
+    def set_flag(self, name: str, item_ids: Any, rows: np.ndarray = None) -> None:
+        """
+        Définit un indicateur à partir d'un ensemble d'IDs (vrai pour les IDs présents, faux sinon)
+        
+        Args:
+            name: Nom de la colonne booléenne
+            item_ids: IDs concernés
+            rows: Lignes à mettre à jour (None = toutes les lignes)
+        """
+        ids = np.fromiter((int(item_id) for item_id in item_ids), dtype=np.int64)
+        if rows is None:
+            self.column(name)[:] = np.isin(self.column("id"), ids)
+        else:
+            self.column(name)[rows] = np.isin(self.column("id")[rows], ids)
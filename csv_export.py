@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Exportation CSV en flux
+Les lignes sont écrites au fur et à mesure de leur production (mémoire constante), au format commun
+à l'interface, à la ligne de commande et au script de mise à jour directe : BOM UTF-8, toutes les
+valeurs entre guillemets, compression gzip optionnelle.
+"""
+
+import csv
+import gzip
+import time
+from typing import Dict, List, Any, Callable, Iterable, TextIO
+
+EXPORT_COLUMNS = [
+    "id", "type", "title", "url", "date_modified",
+    "original_seo_title", "original_seo_description", "original_title_h1",
+    "seo_title", "seo_description", "title_h1"
+]
+
+PROGRESS_INTERVAL = 0.2  # Intervalle minimal entre deux notifications de progression (secondes)
+COMPRESS_LEVEL = 6  # Niveau de compression gzip (compromis entre vitesse et taille)
+
+def is_gzip_path(filepath: str) -> bool:
+    """Indique si un chemin désigne un fichier compressé en gzip (extension .gz)"""
+    return filepath.lower().endswith(".gz")
+
+def open_csv_output(filepath: str, compress: bool = None) -> TextIO:
+    """
+    Ouvre un fichier CSV en écriture (texte avec BOM UTF-8)
+    
+    Args:
+        filepath: Chemin du fichier
+        compress: Compression gzip (None = selon l'extension .gz)
+    
+    Returns:
+        Fichier texte ouvert
+    """
+    if compress is None:
+        compress = is_gzip_path(filepath)
+    
+    if compress:
+        return gzip.open(filepath, "wt", newline="", encoding="utf-8-sig", compresslevel=COMPRESS_LEVEL)
+    return open(filepath, "w", newline="", encoding="utf-8-sig")
+
+def write_csv(rows: Iterable[Dict[str, Any]], filepath: str, columns: List[str] = None, compress: bool = None,
+              callback: Callable[[int, int], None] = None, total: int = 0) -> int:
+    """
+    Écrit un flux d'enregistrements dans un fichier CSV, ligne par ligne
+    
+    Args:
+        rows: Itérable de dictionnaires (générateur de préférence, consommé au fil de l'écriture)
+        filepath: Chemin du fichier CSV
+        columns: Colonnes exportées (EXPORT_COLUMNS par défaut, valeurs absentes écrites vides)
+        compress: Compression gzip (None = selon l'extension .gz)
+        callback: Fonction de progression (lignes écrites, total), appelée au plus tous les PROGRESS_INTERVAL
+                  secondes puis à la fin
+        total: Nombre total de lignes attendu (0 si inconnu)
+    
+    Returns:
+        Nombre de lignes écrites
+    """
+    count = 0
+    last_progress = time.monotonic()
+    
+    with open_csv_output(filepath, compress) as f:
+        writer = csv.DictWriter(f, fieldnames=columns or EXPORT_COLUMNS, extrasaction="ignore", restval="",
+                                quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writeheader()
+        
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            
+            # Progression limitée en fréquence
+            if callback is not None:
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    callback(count, total)
+    
+    if callback is not None:
+        callback(count, total or count)
+    
+    return count
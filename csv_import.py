@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Importation CSV par blocs
+Lecture en flux d'un fichier CSV par blocs de lignes, limitée aux colonnes utiles et aux valeurs
+en chaînes : la mémoire occupée dépend de la taille des blocs et non de celle du fichier.
+Le séparateur est détecté sur un échantillon du fichier (guillemets doubles imposés) ; l'analyse utilise
+pyarrow s'il est installé (blocs alignés sur les enregistrements analysés en parallèle), pandas sinon.
+Module partagé par DataManager, le script de mise à jour directe et la ligne de commande.
+"""
+
+import os
+import csv
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Sequence
+
+import pandas as pd
+
+# Import conditionnel du lecteur CSV pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Colonnes lues (les autres colonnes du fichier sont ignorées dès la lecture)
+IMPORT_COLUMNS = (
+    "id", "type", "title", "url", "date_modified",
+    "seo_title", "seo_description", "title_h1",
+    "original_seo_title", "original_seo_description", "original_title_h1"
+)
+REQUIRED_COLUMNS = ("id", "type")
+SEO_COLUMNS = ("seo_title", "seo_description", "title_h1")  # Colonnes de métadonnées SEO à mettre à jour
+DELIMITERS = ";,\t"  # Séparateurs reconnus par la détection du dialecte
+SNIFF_BYTES = 64 * 1024  # Taille de l'échantillon analysé pour détecter le dialecte
+QUOTECHAR = '"'  # Caractère de citation (non détecté : le Sniffer retient parfois l'apostrophe des textes français)
+
+def sniff_dialect(filepath: str) -> csv.Dialect:
+    """
+    Détecte le dialecte d'un fichier CSV sur un échantillon de lignes complètes
+    
+    Contrairement à la seule première ligne, l'échantillon permet d'ignorer les séparateurs
+    présents dans les champs entre guillemets. Seul le séparateur détecté est retenu : le
+    caractère de citation reste QUOTECHAR, le Sniffer prenant l'apostrophe pour un guillemet
+    dans les textes en français.
+    
+    Args:
+        filepath: Chemin du fichier CSV
+    
+    Returns:
+        Dialecte détecté (csv.excel, virgule, si la détection échoue)
+    """
+    with open(filepath, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        sample = f.read(SNIFF_BYTES)
+    
+    # Dernière ligne de l'échantillon écartée si elle est incomplète
+    if len(sample) >= SNIFF_BYTES and "\n" in sample:
+        sample = sample[:sample.rindex("\n") + 1]
+    
+    dialect = csv.excel()
+    dialect.quotechar = QUOTECHAR
+    try:
+        dialect.delimiter = csv.Sniffer().sniff(sample, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # Échantillon ambigu : séparateur le plus fréquent de la première ligne
+        first_line = sample.split("\n", 1)[0]
+        dialect.delimiter = max(DELIMITERS, key=first_line.count) if any(char in first_line for char in DELIMITERS) else ","
+    return dialect
+
+def detect_separator(filepath: str) -> str:
+    """
+    Détecte le séparateur d'un fichier CSV
+    
+    Args:
+        filepath: Chemin du fichier CSV
+    
+    Returns:
+        Séparateur détecté (virgule par défaut)
+    """
+    return sniff_dialect(filepath).delimiter
+
+class CSVChunkReader:
+    """Lecteur CSV par blocs en colonnes, avec la progression en octets lus et le débit d'analyse"""
+    
+    CHUNK_ROWS = 50000  # Lignes par bloc du moteur pandas (borne la mémoire occupée par la lecture)
+    BLOCK_BYTES = 16 * 1024 * 1024  # Octets par bloc du moteur pyarrow (un bloc analysé par thread)
+    WORKERS = os.cpu_count() or 1  # Blocs analysés simultanément par le moteur pyarrow
+    
+    def __init__(self, filepath: str, separator: str = None, columns: Sequence[str] = IMPORT_COLUMNS,
+                 chunk_rows: int = None, engine: str = None):
+        """
+        Initialisation du lecteur (détection du dialecte et lecture de l'en-tête uniquement)
+        
+        Args:
+            filepath: Chemin du fichier CSV
+            separator: Séparateur CSV (None = auto-détection)
+            columns: Colonnes à lire si elles sont présentes
+            chunk_rows: Lignes par bloc du moteur pandas (CHUNK_ROWS par défaut)
+            engine: Moteur d'analyse ("pyarrow" ou "pandas", None = pyarrow si disponible)
+        """
+        self.filepath = filepath
+        self.dialect = sniff_dialect(filepath)
+        self.separator = separator or self.dialect.delimiter
+        self.quotechar = self.dialect.quotechar
+        self.chunk_rows = chunk_rows or self.CHUNK_ROWS
+        self.engine = engine or ("pyarrow" if PYARROW_AVAILABLE else "pandas")
+        if self.engine == "pyarrow" and not PYARROW_AVAILABLE:
+            self.engine = "pandas"
+        self.total_bytes = os.path.getsize(filepath)
+        self.bytes_read = 0
+        self.parse_seconds = 0.0  # Durée cumulée de l'analyse (hors traitement des blocs)
+        
+        self.header = list(pd.read_csv(filepath, encoding="utf-8-sig", sep=self.separator, quotechar=self.quotechar, nrows=0).columns)
+        self.columns = [column for column in self.header if column in columns]
+        self.missing_columns = [column for column in REQUIRED_COLUMNS if column not in self.header]
+    
+    def _pandas_chunks(self, f) -> Iterator[pd.DataFrame]:
+        """Blocs de lignes analysés par pandas (moteur C, un seul cœur)"""
+        return iter(pd.read_csv(f, encoding="utf-8-sig", sep=self.separator, quotechar=self.quotechar,
+                                usecols=self.columns, dtype=str, keep_default_na=False, chunksize=self.chunk_rows))
+    
+    def _record_blocks(self, f) -> Iterator[bytes]:
+        """
+        Découpe le fichier en blocs d'octets terminés par une fin d'enregistrement
+        
+        Chaque bloc commence au début d'un enregistrement : un saut de ligne n'est une fin
+        d'enregistrement que si le nombre de guillemets qui le précèdent dans le bloc est pair.
+        
+        Args:
+            f: Fichier ouvert en binaire
+        
+        Returns:
+            Itérateur de blocs d'environ BLOCK_BYTES octets
+        """
+        quote = self.quotechar.encode()
+        pending = b""
+        while True:
+            data = f.read(self.BLOCK_BYTES)
+            if not data:
+                break
+            block = pending + data
+            quotes = block.count(quote)
+            
+            # Dernier saut de ligne hors guillemets
+            end = block.rfind(b"\n")
+            while end >= 0 and (quotes - block.count(quote, end)) % 2:
+                end = block.rfind(b"\n", 0, end)
+            
+            if end < 0:
+                # Enregistrement plus long que le bloc : lecture du bloc suivant
+                pending = block
+                continue
+            yield block[:end + 1]
+            pending = block[end + 1:]
+        if pending:
+            yield pending
+    
+    def _parse_block(self, block: bytes, first: bool) -> pd.DataFrame:
+        """Analyse d'un bloc par pyarrow (un seul thread par bloc), convertie en DataFrame"""
+        table = pa_csv.read_csv(
+            pa.py_buffer(block),
+            read_options=pa_csv.ReadOptions(use_threads=False, column_names=self.header, skip_rows=1 if first else 0),
+            parse_options=pa_csv.ParseOptions(delimiter=self.separator, quote_char=self.quotechar, newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=self.columns,
+                column_types={column: pa.string() for column in self.columns},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False
+            )
+        )
+        return table.to_pandas()
+    
+    def _pyarrow_chunks(self, f) -> Iterator[pd.DataFrame]:
+        """
+        Blocs analysés par pyarrow en parallèle (WORKERS blocs à la fois), restitués dans l'ordre du fichier
+        
+        Le lecteur en flux de pyarrow (open_csv) n'analyse qu'un bloc à la fois : les blocs alignés sur
+        les enregistrements sont donc répartis entre plusieurs threads (pyarrow libère le GIL pendant
+        l'analyse), la mémoire restant bornée à environ WORKERS blocs en cours.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            for index, block in enumerate(self._record_blocks(f)):
+                pending.append(executor.submit(self._parse_block, block, index == 0))
+                if len(pending) > self.WORKERS:
+                    chunk = pending.popleft().result()
+                    if len(chunk):
+                        yield chunk
+            while pending:
+                chunk = pending.popleft().result()
+                if len(chunk):
+                    yield chunk
+    
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt le fichier par blocs
+        
+        Returns:
+            Itérateur de DataFrames (colonnes lues, valeurs en chaînes, cellules vides conservées comme chaînes vides)
+        """
+        self.bytes_read = 0
+        self.parse_seconds = 0.0
+        with open(self.filepath, "rb") as f:
+            chunks = self._pyarrow_chunks(f) if self.engine == "pyarrow" else self._pandas_chunks(f)
+            while True:
+                start_time = time.perf_counter()
+                chunk = next(chunks, None)
+                self.parse_seconds += time.perf_counter() - start_time
+                if chunk is None:
+                    break
+                
+                # Position dans le fichier (lecture tamponnée : approximation par excès du bloc courant)
+                self.bytes_read = min(f.tell(), self.total_bytes)
+                yield chunk
+        self.bytes_read = self.total_bytes
+    
+    def iter_records(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parcourt le fichier par blocs de dictionnaires (un bloc converti à la fois)
+        
+        Returns:
+            Itérateur de listes d'enregistrements
+        """
+        for chunk in self:
+            yield chunk.to_dict(orient="records")
+    
+    def progress(self) -> float:
+        """Proportion du fichier lue (entre 0 et 1)"""
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+    
+    def throughput(self) -> float:
+        """Débit d'analyse en Mo/s (octets lus rapportés à la durée cumulée de l'analyse)"""
+        return self.bytes_read / 1e6 / self.parse_seconds if self.parse_seconds else 0.0
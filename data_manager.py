@@ -7,133 +7,243 @@ Gère l'importation et l'exportation des données, ainsi que la validation des m
 """
 
 import os
-import csv
-import json
 import logging
+import itertools
+import threading
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
-from PyQt6.QtCore import QObject, pyqtSignal, QCoreApplication
+from PyQt6.QtCore import QObject, pyqtSignal, QCoreApplication, QTimer
+
+from search_index import SearchIndex
+from column_store import ColumnStore
+from session_store import SessionStore
+from edit_history import EditHistory
+from csv_import import CSVChunkReader
+from csv_export import write_csv
 
 class DataManager(QObject):
     """Classe pour gérer les données de l'application"""
     
     # Signaux pour la communication avec l'interface utilisateur
     data_changed = pyqtSignal()
+    item_updated = pyqtSignal(int)  # ID de l'élément modifié ou supprimé
+    # Modifications ligne par ligne de filtered_data (position dans la liste filtrée)
+    row_about_to_be_inserted = pyqtSignal(int)
+    row_inserted = pyqtSignal(int)
+    row_about_to_be_removed = pyqtSignal(int)
+    row_removed = pyqtSignal(int)
+    row_changed = pyqtSignal(int)
+    rows_about_to_be_inserted = pyqtSignal(int, int)  # Bloc de lignes ajouté (première et dernière position)
+    rows_inserted = pyqtSignal()
+    restore_progress = pyqtSignal(int, int)  # Éléments restaurés, total de la session
+    _search_job_done = pyqtSignal()  # Lot d'indexation préparé dans un thread (traité par la boucle d'événements)
     import_progress = pyqtSignal(int, int, str)
     export_progress = pyqtSignal(int, int, str)
     
+    # Longueurs recommandées des métadonnées SEO (en caractères)
+    SEO_TITLE_MIN_LENGTH = 30
+    SEO_TITLE_MIN_LENGTH_RANK_MATH = 40  # Minimum recommandé par Rank Math SEO
+    SEO_TITLE_MAX_LENGTH = 60
+    SEO_DESCRIPTION_MIN_LENGTH = 120
+    SEO_DESCRIPTION_MAX_LENGTH = 160
+    
+    MERGE_FIELDS = ("seo_title", "seo_description", "title_h1")  # Champs fusionnés depuis un CSV
+    SEARCH_BACKGROUND_MIN = 1000  # Éléments à partir desquels l'indexation pour la recherche est préparée dans un thread
+    RESTORE_FIRST_CHUNK = 500  # Éléments restaurés avant le premier affichage
+    RESTORE_CHUNK = 5000  # Éléments restaurés à chaque étape de la restauration progressive
+    
     def __init__(self, logger: logging.Logger):
         """Initialisation du gestionnaire de données"""
         super().__init__()
         self.logger = logger
         self.data = {}  # Données actuelles
-        self.history = []  # Historique des modifications
+        self.history = EditHistory()  # Historique des modifications (annuler / rétablir)
         self.modified_items = set()  # Éléments modifiés
         self.selected_items = set()  # Éléments sélectionnés
         self.filtered_data = []  # Données filtrées pour l'affichage
         self.filter_criteria = {}  # Critères de filtrage
-        self.session_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "session_data.json")
+        self._index = {}  # Index (type, id) -> élément
+        self._id_index = {}  # Index id -> élément
+        self._row_of = {}  # Index (type, id) -> ligne du stockage en colonnes
+        self._type_rank = {}  # Rang de chaque type de contenu
+        self._next_rank = {}  # Prochain rang disponible dans chaque type
+        self.store = ColumnStore()  # Colonnes NumPy (IDs, types, longueurs, indicateurs)
+        self.filtered_rows = np.zeros(0, dtype=np.int64)  # Lignes du stockage affichées, dans l'ordre de filtered_data
+        self.search_index = SearchIndex()  # Index de recherche par trigrammes
+        self._search_jobs = []  # Lots d'indexation préparés dans un thread, dans l'ordre de soumission
+        self._search_job_done.connect(self._attach_search_jobs)
+        self._search_job_timer = QTimer(self)  # Démarrage des lots soumis au retour dans la boucle d'événements
+        self._search_job_timer.setSingleShot(True)
+        self._search_job_timer.timeout.connect(self._start_search_jobs)
+        self.session_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "session.db")
+        self._session = None  # Stockage SQLite de la session (ouvert au premier accès)
+        self._session_synced = False  # Session enregistrée ou chargée : les modifications sont écrites ligne par ligne
+        self._restore = None  # Restauration progressive en cours (position, éléments chargés, total)
+        self._restore_timer = None  # Minuterie des étapes de la restauration progressive
+    
+    def _session_store(self) -> SessionStore:
+        """Retourne le stockage SQLite de la session (rouvert si le fichier de session a changé)"""
+        if self._session is None or self._session.path != self.session_file:
+            if self._session is not None:
+                self._session.close()
+            self._session = SessionStore(self.session_file, self.logger)
+            self._session_synced = False
+        return self._session
+    
+    def _legacy_session_file(self) -> str:
+        """Chemin de l'ancienne session JSON (version 1.0), à côté de la base de session"""
+        return os.path.join(os.path.dirname(self.session_file), "session_data.json")
+    
+    def has_session(self) -> bool:
+        """
+        Vérifie si une session précédente existe (base SQLite ou ancienne session JSON)
+        
+        Returns:
+            True si une session peut être restaurée
+        """
+        try:
+            if self._session_store().has_session():
+                return True
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'ouverture de la session: {str(e)}")
+        
+        legacy_file = self._legacy_session_file()
+        return legacy_file != self.session_file and os.path.exists(legacy_file)
     
     def save_session_data(self) -> bool:
         """
-        Sauvegarde les données de la session dans un fichier JSON
+        Sauvegarde la session complète dans la base SQLite
         
         Returns:
             Succès de la sauvegarde
         """
+        # Une session partiellement restaurée ne doit pas remplacer la session enregistrée
+        self._finish_restore()
+        
         if not self.data:
             self.logger.info("Aucune donnée à sauvegarder")
             return False
-            
+        
         try:
-            # Création du répertoire data s'il n'existe pas
-            os.makedirs(os.path.dirname(self.session_file), exist_ok=True)
-            
-            # Préparation des métadonnées
-            metadata = {
-                "timestamp": datetime.now().isoformat(),
-                "version": "1.0",
-                "total_items": sum(len(items) for items in self.data.values()),
-                "content_types": list(self.data.keys())
-            }
-            
-            # Sauvegarde dans un fichier JSON
-            session_data = {
-                "metadata": metadata,
-                "modified_items": list(self.modified_items),
-                "selected_items": list(self.selected_items),
-                "filter_criteria": self.filter_criteria,
-                "data": self.data
-            }
-            
-            with open(self.session_file, "w", encoding="utf-8-sig") as f:
-                json.dump(session_data, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"Session sauvegardée: {metadata['total_items']} éléments dans {self.session_file}")
-            return True
+            store = self._session_store()
+            total_items = store.save_all(self.data, self.modified_items, self.selected_items, self.filter_criteria)
+            self._session_synced = True
+            store.start_compaction()
             
+            self.logger.info(f"Session sauvegardée: {total_items} éléments dans {self.session_file}")
+            return True
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde de la session: {str(e)}")
             return False
     
+    def flush_session(self) -> bool:
+        """
+        Enregistre la session à la fermeture : compactage du journal, ou sauvegarde complète
+        si la session n'a pas encore été enregistrée
+        
+        Returns:
+            Succès de l'enregistrement
+        """
+        if not self._session_synced:
+            return self.save_session_data()
+        
+        try:
+            count = self._session_store().compact()
+            self.logger.info(f"Session enregistrée: {count} modifications journalisées repliées")
+            return True
+        except Exception as e:
+            self.logger.error(f"Erreur lors du compactage du journal de session: {str(e)}")
+            return False
+    
+    def _persist(self, operation: str, *args: Any) -> None:
+        """
+        Journalise une modification de la session, si la session est synchronisée
+        
+        Args:
+            operation: Méthode de SessionStore (upsert_record, upsert_records, set_selected, clear_selected,
+                       delete_record, delete_records, save_filters)
+            args: Arguments de la méthode
+        """
+        if not self._session_synced:
+            return
+        
+        try:
+            getattr(self._session_store(), operation)(*args)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'écriture de la session: {str(e)}")
+    
+    def _persist_item(self, item: Dict[str, Any]) -> None:
+        """Écrit un élément dans la session avec ses états modifié et sélectionné"""
+        self._persist("upsert_record", item.get("type"), item,
+                      item["id"] in self.modified_items, item["id"] in self.selected_items)
+    
+    def _migrate_legacy_session(self, store: SessionStore) -> None:
+        """Migration unique de l'ancienne session JSON vers la base SQLite"""
+        legacy_file = self._legacy_session_file()
+        if not store.has_session() and legacy_file != self.session_file and os.path.exists(legacy_file):
+            store.migrate_json(legacy_file)
+    
     def load_session_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Charge les données de la session depuis un fichier JSON
+        Charge la session depuis la base SQLite (après migration d'une ancienne session JSON)
         
         Returns:
             Dictionnaire des données chargées ou None en cas d'erreur
         """
-        if not os.path.exists(self.session_file):
-            self.logger.info(f"Aucun fichier de session trouvé: {self.session_file}")
-            return None
-            
         try:
-            with open(self.session_file, "r", encoding="utf-8-sig") as f:
-                session_data = json.load(f)
+            store = self._session_store()
+            self._migrate_legacy_session(store)
             
-            # Vérification de la structure des données
-            if "data" not in session_data:
-                self.logger.error("Structure de session invalide: clé 'data' manquante")
+            session = store.load()
+            if session is None:
+                self.logger.info(f"Aucune session trouvée: {self.session_file}")
                 return None
             
-            # Restauration des éléments modifiés et sélectionnés
-            if "modified_items" in session_data:
-                self.modified_items = set(int(item_id) for item_id in session_data["modified_items"])
-            
-            if "selected_items" in session_data:
-                self.selected_items = set(int(item_id) for item_id in session_data["selected_items"])
-            
-            # Restauration des critères de filtrage
-            if "filter_criteria" in session_data:
-                self.filter_criteria = session_data["filter_criteria"]
-            
-            # Restauration des données
-            data = session_data["data"]
+            # Restauration des éléments modifiés et sélectionnés, et des critères de filtrage
+            data, self.modified_items, self.selected_items, self.filter_criteria = session
+            self._session_synced = True
+            store.start_compaction()
             
             self.logger.info(f"Session chargée: {sum(len(items) for items in data.values())} éléments depuis {self.session_file}")
             return data
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement de la session: {str(e)}")
             return None
     
     def restore_session(self) -> bool:
         """
-        Restaure la session précédente
+        Restaure la session précédente de façon progressive
+        
+        Seuls l'état de la session et les premiers éléments sont lus avant l'affichage ; les éléments
+        suivants sont chargés par étapes depuis la boucle d'événements (signal restore_progress).
         
         Returns:
             Succès de la restauration
         """
         try:
-            # Chargement des données de session
-            data = self.load_session_data()
+            self._cancel_restore()
+            store = self._session_store()
+            self._migrate_legacy_session(store)
             
-            if not data:
+            # État de la session (éléments modifiés et sélectionnés, filtres) lu par les index
+            state = store.load_state()
+            if state is None:
+                self.logger.info(f"Aucune session trouvée: {self.session_file}")
                 return False
             
-            # Mise à jour des données
-            self.data = data
+            total, self.modified_items, self.selected_items, self.filter_criteria = state
+            self._session_synced = True
+            store.start_compaction()
+            
+            # Premiers éléments, affichés immédiatement
+            self.data = {}
+            self.history.clear()
+            self._rebuild_index()
+            self._restore = {"position": -1, "loaded": 0, "total": total}
+            self._restore_chunk(self.RESTORE_FIRST_CHUNK)
             
             # Mise à jour des données filtrées
             self._apply_filters()
@@ -141,13 +251,530 @@ class DataManager(QObject):
             # Notification de changement de données
             self.data_changed.emit()
             
-            self.logger.info("Session restaurée avec succès")
-            return True
+            # Éléments suivants chargés par étapes
+            if self._restore is not None:
+                self._restore_timer = QTimer(self)
+                self._restore_timer.timeout.connect(self._on_restore_timer)
+                self._restore_timer.start(0)
             
+            self.logger.info(f"Session restaurée: {total} éléments depuis {self.session_file}")
+            return True
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la restauration de la session: {str(e)}")
             return False
     
+    def is_restoring(self) -> bool:
+        """Indique si une restauration progressive de la session est en cours"""
+        return self._restore is not None
+    
+    def _restore_chunk(self, limit: int) -> np.ndarray:
+        """
+        Charge une étape de la restauration progressive
+        
+        Args:
+            limit: Nombre maximal d'éléments chargés
+        
+        Returns:
+            Lignes du stockage en colonnes ajoutées
+        """
+        records, position = self._session_store().load_chunk(self._restore["position"], limit)
+        self._restore["position"] = position
+        self._restore["loaded"] += len(records)
+        
+        # Ajout par séries d'éléments consécutifs de même type
+        rows = [np.zeros(0, dtype=np.int64)]
+        for content_type, group in itertools.groupby(records, key=lambda record: record[0]):
+            items = [item for _, item in group]
+            self.data.setdefault(content_type, []).extend(items)
+            rows.append(self._index_items(content_type, items))
+        rows = np.concatenate(rows)
+        
+        self.store.set_flag("modified", self.modified_items, rows)
+        self.store.set_flag("selected", self.selected_items, rows)
+        
+        # Éléments de l'étape indexés pour la recherche au fil du chargement
+        self._search_add({(content_type, item["id"]): item for content_type, item in records})
+        
+        # Fin de la restauration
+        if not records or self._restore["loaded"] >= self._restore["total"]:
+            self._stop_restore_timer()
+            self._restore = None
+        
+        return rows
+    
+    def _on_restore_timer(self) -> None:
+        """Étape de la restauration progressive : chargement et affichage des éléments suivants"""
+        if self._restore is None:
+            self._stop_restore_timer()
+            return
+        
+        total = self._restore["total"]
+        rows = self._restore_chunk(self.RESTORE_CHUNK)
+        loaded = total if self._restore is None else self._restore["loaded"]
+        
+        # Éléments affichés : ajout en fin de liste filtrée, ou reconstruction s'ils s'intercalent
+        rows = rows[self._filter_mask(rows)]
+        if len(rows):
+            order = self.store.column("order")
+            rows = rows[np.argsort(order[rows], kind="stable")]
+            
+            if not len(self.filtered_rows) or order[rows[0]] > order[self.filtered_rows[-1]]:
+                first = len(self.filtered_rows)
+                self.rows_about_to_be_inserted.emit(first, first + len(rows) - 1)
+                self.filtered_rows = np.concatenate((self.filtered_rows, rows))
+                self.filtered_data.extend(self.store.records_at(rows))
+                self.rows_inserted.emit()
+            else:
+                self._apply_filters()
+                self.data_changed.emit()
+        
+        self.restore_progress.emit(loaded, total)
+    
+    def _stop_restore_timer(self) -> None:
+        """Arrête la minuterie de la restauration progressive"""
+        if self._restore_timer is not None:
+            self._restore_timer.stop()
+            self._restore_timer.deleteLater()
+            self._restore_timer = None
+    
+    def _cancel_restore(self) -> None:
+        """Abandonne une restauration progressive (données remplacées)"""
+        self._stop_restore_timer()
+        self._restore = None
+    
+    def _finish_restore(self) -> None:
+        """Termine immédiatement une restauration progressive (opérations portant sur toute la session)"""
+        if self._restore is None:
+            return
+        
+        total = self._restore["total"]
+        while self._restore is not None:
+            self._restore_chunk(self.RESTORE_CHUNK)
+        
+        self._apply_filters()
+        self.data_changed.emit()
+        self.restore_progress.emit(total, total)
+    
+    def _rebuild_index(self) -> None:
+        """Reconstruit les index et le stockage en colonnes à partir de self.data"""
+        self._index = {}
+        self._id_index = {}
+        self._row_of = {}
+        self._type_rank = {}
+        self._next_rank = {}
+        self.store.clear()
+        
+        for content_type, items in self.data.items():
+            self._type_rank[content_type] = len(self._type_rank)
+            self._next_rank[content_type] = 0
+            self._index_items(content_type, items)
+        
+        # Indicateurs restaurés avec la session
+        self.store.set_flag("modified", self.modified_items)
+        self.store.set_flag("selected", self.selected_items)
+        
+        # Index de recherche dans l'ordre d'affichage
+        self._rebuild_search_index()
+    
+    def _rebuild_search_index(self) -> None:
+        """
+        Reconstruit l'index de recherche (données remplacées)
+        
+        Au-delà de SEARCH_BACKGROUND_MIN éléments, l'index est préparé dans un thread : les recherches
+        portent sur un index vide jusqu'à son rattachement, puis les filtres sont réappliqués.
+        """
+        self._search_jobs = []  # Lots en cours abandonnés (données remplacées)
+        self.search_index = SearchIndex()
+        self._search_add(dict(self._index))
+    
+    def _search_add(self, records: Dict[Tuple[str, int], Dict[str, Any]]) -> None:
+        """
+        Indexe pour la recherche des éléments ajoutés ou modifiés
+        
+        Un lot de SEARCH_BACKGROUND_MIN éléments ou plus est préparé dans un thread (normalisation et
+        listes de trigrammes), puis rattaché à l'index par la boucle d'événements : les versions
+        précédentes des éléments restent trouvées jusque-là.
+        
+        Args:
+            records: Éléments par (type, id), non modifié ensuite par l'appelant (lu par le thread)
+        """
+        self._mark_search_dirty(records)
+        
+        if len(records) >= self.SEARCH_BACKGROUND_MIN:
+            self._submit_search_job(lambda: SearchIndex.prepare(records.items()), lambda prepared: self.search_index.attach(prepared),
+                                    records)
+        elif len(records) == 1:
+            self.search_index.add(*next(iter(records.items())))
+        elif records:
+            self.search_index.add_many(records.items())
+        
+        self._compact_search_index()
+    
+    def _search_remove(self, keys: List[Tuple[str, int]]) -> None:
+        """
+        Retire des éléments de l'index de recherche
+        
+        Args:
+            keys: Couples (type, id)
+        """
+        self._mark_search_dirty(keys)
+        for key in keys:
+            self.search_index.remove(key)
+        
+        self._compact_search_index()
+    
+    def _mark_search_dirty(self, keys) -> None:
+        """Note les éléments modifiés pendant la préparation des lots en cours (réindexés à leur rattachement)"""
+        if self._search_jobs:
+            keys = set(keys)
+            for job in self._search_jobs:
+                job["dirty"] |= keys
+    
+    def _compact_search_index(self) -> None:
+        """Compacte l'index de recherche dans un thread quand les documents périmés deviennent nombreux"""
+        if not self.search_index.needs_compaction() or any(job["compaction"] for job in self._search_jobs):
+            return
+        
+        texts = self.search_index.compaction_texts()
+        self._submit_search_job(lambda: SearchIndex.prepare_compaction(texts),
+                                lambda segment: self.search_index.attach_compaction(segment), [], compaction=True)
+    
+    def _submit_search_job(self, prepare, attach, keys: List[Tuple[str, int]], compaction: bool = False) -> None:
+        """
+        Prépare un lot d'indexation dans un thread
+        
+        Args:
+            prepare: Préparation (thread, sans accès à l'index courant)
+            attach: Rattachement du résultat à l'index (boucle d'événements)
+            keys: Clés des éléments du lot
+            compaction: Lot de compactage
+        """
+        job = {"prepare": prepare, "attach": attach, "keys": set(keys), "dirty": set(), "compaction": compaction,
+               "result": None, "error": None, "done": threading.Event()}
+        job["thread"] = threading.Thread(target=self._search_job_thread, args=(job,), daemon=True)
+        self._search_jobs.append(job)
+        
+        # Thread démarré au retour dans la boucle d'événements : l'opération en cours n'est pas ralentie
+        # (sans application Qt, par wait_search_index)
+        if QCoreApplication.instance() is not None:
+            self._search_job_timer.start(0)
+    
+    def _start_search_jobs(self) -> None:
+        """Démarre la préparation des lots d'indexation en attente"""
+        for job in self._search_jobs:
+            if job["thread"].ident is None:
+                job["thread"].start()
+    
+    def _search_job_thread(self, job: Dict[str, Any]) -> None:
+        """Thread de préparation d'un lot d'indexation"""
+        try:
+            job["result"] = job["prepare"]()
+        except Exception as e:
+            job["error"] = e
+        job["done"].set()
+        try:
+            self._search_job_done.emit()
+        except RuntimeError:
+            # Gestionnaire de données détruit pendant la préparation
+            pass
+    
+    def _attach_search_jobs(self, wait: bool = False) -> None:
+        """
+        Rattache à l'index de recherche les lots préparés, dans l'ordre de soumission, puis réapplique
+        les filtres si une recherche est active
+        
+        Args:
+            wait: Attendre la préparation des lots en cours
+        """
+        attached = False
+        if wait:
+            self._start_search_jobs()
+        
+        while self._search_jobs and (wait or self._search_jobs[0]["done"].is_set()):
+            job = self._search_jobs.pop(0)
+            job["done"].wait()
+            
+            if job["error"] is None:
+                job["attach"](job["result"])
+                stale = job["keys"] & job["dirty"]
+            else:
+                self.logger.error(f"Erreur lors de l'indexation pour la recherche: {str(job['error'])}")
+                stale = job["keys"]
+            
+            # Éléments modifiés ou supprimés depuis la soumission du lot : état courant réindexé
+            self.search_index.add_many([(key, self._index[key]) for key in stale if key in self._index])
+            for key in stale:
+                if key not in self._index:
+                    self.search_index.remove(key)
+            attached = True
+        
+        if attached:
+            self._compact_search_index()
+            if self.filter_criteria.get("search_text"):
+                self._apply_filters()
+                self.data_changed.emit()
+    
+    def wait_search_index(self) -> None:
+        """Attend et rattache les lots d'indexation en cours (scripts et tests, sans boucle d'événements)"""
+        self._attach_search_jobs(wait=True)
+    
+    def _index_items(self, content_type: str, items: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Ajoute des éléments aux index et au stockage en colonnes
+        
+        Args:
+            content_type: Type de contenu des éléments
+            items: Éléments ajoutés à self.data[content_type]
+        
+        Returns:
+            Lignes du stockage en colonnes ajoutées
+        """
+        if content_type not in self._type_rank:
+            self._type_rank[content_type] = len(self._type_rank)
+            self._next_rank[content_type] = 0
+        
+        # Lignes du stockage, avec leur position d'affichage (rang du type, rang dans le type)
+        first = self._next_rank[content_type]
+        orders = (self._type_rank[content_type] << 32) | np.arange(first, first + len(items), dtype=np.int64)
+        rows = self.store.extend(items, content_type, orders)
+        self._next_rank[content_type] += len(items)
+        
+        for item, row in zip(items, rows.tolist()):
+            self._index[(content_type, item["id"])] = item
+            self._id_index[item["id"]] = item
+            self._row_of[(content_type, item["id"])] = row
+        
+        # Qualité SEO calculée à l'entrée des éléments
+        self._update_seo_quality_rows(rows)
+        return rows
+    
+    @staticmethod
+    def is_rank_math(item: Dict[str, Any]) -> bool:
+        """
+        Détermine si les métadonnées d'un élément proviennent de Rank Math SEO
+        
+        Args:
+            item: Élément
+        
+        Returns:
+            True si l'élément est géré par Rank Math SEO
+        """
+        return ("rank_math_title" in item or "rank_math_description" in item or
+                item.get("seo_source") == "rank_math" or
+                item.get("original_seo_title_source") == "rank_math")
+    
+    @classmethod
+    def evaluate_seo_quality(cls, seo_title: str, seo_description: str, rank_math: bool = False) -> Dict[str, Any]:
+        """
+        Évalue la qualité SEO d'un titre et d'une description
+        
+        Args:
+            seo_title: Titre SEO
+            seo_description: Description SEO
+            rank_math: Métadonnées gérées par Rank Math SEO (minimum du titre plus élevé)
+        
+        Returns:
+            Longueurs, limites appliquées et problèmes détectés
+        """
+        title_length = len(seo_title) if isinstance(seo_title, str) else 0
+        description_length = len(seo_description) if isinstance(seo_description, str) else 0
+        return cls._quality_from_lengths(title_length, description_length, rank_math)
+    
+    @classmethod
+    def _quality_from_lengths(cls, title_length: Any, description_length: Any, rank_math: Any) -> Dict[str, Any]:
+        """
+        Limites appliquées et problèmes détectés à partir des longueurs
+        
+        Les opérations valent pour des scalaires comme pour des tableaux NumPy (évaluation en bloc).
+        
+        Args:
+            title_length: Longueur du titre SEO
+            description_length: Longueur de la description SEO
+            rank_math: Métadonnées gérées par Rank Math SEO
+        
+        Returns:
+            Qualité SEO (mêmes clés que evaluate_seo_quality)
+        """
+        # Minimum du titre plus élevé pour Rank Math SEO
+        title_min_length = cls.SEO_TITLE_MIN_LENGTH + (cls.SEO_TITLE_MIN_LENGTH_RANK_MATH - cls.SEO_TITLE_MIN_LENGTH) * rank_math
+        
+        quality = {
+            "rank_math": rank_math,
+            "title_length": title_length,
+            "title_min_length": title_min_length,
+            "title_max_length": cls.SEO_TITLE_MAX_LENGTH,
+            "title_too_short": title_length < title_min_length,
+            "title_too_long": title_length > cls.SEO_TITLE_MAX_LENGTH,
+            "description_length": description_length,
+            "description_min_length": cls.SEO_DESCRIPTION_MIN_LENGTH,
+            "description_max_length": cls.SEO_DESCRIPTION_MAX_LENGTH,
+            "description_missing": description_length == 0,
+            "description_too_short": description_length < cls.SEO_DESCRIPTION_MIN_LENGTH,
+            "description_too_long": description_length > cls.SEO_DESCRIPTION_MAX_LENGTH
+        }
+        quality["title_issue"] = quality["title_too_short"] | quality["title_too_long"]
+        quality["description_issue"] = quality["description_too_short"] | quality["description_too_long"]
+        quality["has_issues"] = quality["title_issue"] | quality["description_issue"]
+        return quality
+    
+    def _update_seo_quality(self, content_type: str, item: Dict[str, Any]) -> None:
+        """
+        Recalcule la qualité SEO d'un élément (item["seo_quality"] et colonnes du stockage)
+        
+        Args:
+            content_type: Type de contenu de l'élément
+            item: Élément ajouté ou modifié
+        """
+        self._update_seo_quality_rows(np.array([self._row_of[(content_type, item["id"])]], dtype=np.int64))
+    
+    def _update_seo_quality_rows(self, rows: np.ndarray) -> None:
+        """
+        Recalcule en bloc la qualité SEO des éléments de plusieurs lignes du stockage
+        
+        Args:
+            rows: Lignes du stockage en colonnes
+        """
+        records = self.store.records_at(rows)
+        count = len(records)
+        
+        def lengths(field):
+            values = (record.get(field) for record in records)
+            return np.fromiter((len(value) if isinstance(value, str) else 0 for value in values), dtype=np.int32, count=count)
+        
+        def flags(test):
+            return np.fromiter(map(test, records), dtype=bool, count=count)
+        
+        quality = self._quality_from_lengths(lengths("seo_title"), lengths("seo_description"), flags(self.is_rank_math))
+        # Source Rank Math par champ, pour l'affichage
+        quality["rank_math_title"] = flags(lambda item: "rank_math_title" in item or item.get("seo_title_source") == "rank_math")
+        quality["rank_math_description"] = flags(lambda item: "rank_math_description" in item or item.get("seo_description_source") == "rank_math")
+        
+        # Colonnes du stockage
+        for name in ("title_length", "description_length", "rank_math", "title_issue", "description_issue", "description_missing"):
+            self.store.column(name)[rows] = quality[name]
+        
+        # Dictionnaire de qualité de chaque élément (valeurs Python, sérialisables en JSON)
+        keys = list(quality)
+        columns = [np.broadcast_to(quality[key], (count,)).tolist() for key in keys]
+        for record, values in zip(records, zip(*columns)):
+            record["seo_quality"] = dict(zip(keys, values))
+    
+    def _row(self, item_id: int, content_type: str = None) -> Optional[int]:
+        """Retourne la ligne du stockage en colonnes d'un élément (None si absent)"""
+        if content_type is None:
+            item = self._id_index.get(item_id)
+            if item is None:
+                return None
+            content_type = item.get("type")
+        return self._row_of.get((content_type, item_id))
+    
+    def _set_modified(self, item: Dict[str, Any], modified: bool) -> None:
+        """Marque un élément comme modifié ou non (ensemble modified_items et colonne)"""
+        if modified:
+            self.modified_items.add(item["id"])
+        else:
+            self.modified_items.discard(item["id"])
+        
+        row = self._row(item["id"], item.get("type"))
+        if row is not None:
+            self.store.set(row, modified=modified)
+    
+    def _update_modified_rows(self, rows: np.ndarray) -> None:
+        """
+        Recalcule en bloc l'état modifié de plusieurs lignes (comparaison vectorisée avec les valeurs originales)
+        
+        Args:
+            rows: Lignes du stockage en colonnes
+        """
+        records = self.store.records_at(rows)
+        differs = np.zeros(len(records), dtype=bool)
+        for field in self.MERGE_FIELDS:
+            current = np.fromiter((record.get(field) for record in records), dtype=object, count=len(records))
+            original = np.fromiter((record.get(f"original_{field}") for record in records), dtype=object, count=len(records))
+            differs |= current != original
+        
+        self.store.column("modified")[rows] = differs
+        ids = self.store.column("id")[rows]
+        self.modified_items.update(ids[differs].tolist())
+        self.modified_items.difference_update(ids[~differs].tolist())
+    
+    def get_item_count(self) -> int:
+        """Retourne le nombre total d'éléments"""
+        return len(self._index)
+    
+    def get_issue_count(self, content_type: str = None) -> int:
+        """
+        Retourne le nombre d'éléments présentant des problèmes SEO
+        
+        Args:
+            content_type: Type de contenu (None = tous les types)
+        
+        Returns:
+            Nombre d'éléments avec un titre ou une description hors des longueurs recommandées
+        """
+        store = self.store
+        mask = store.column("alive") & (store.column("title_issue") | store.column("description_issue"))
+        if content_type is not None:
+            mask &= store.column("type_code") == store.type_code(content_type, create=False)
+        return int(np.count_nonzero(mask))
+    
+    def get_item(self, item_id: int, content_type: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Retourne un élément par son ID en temps constant
+        
+        Args:
+            item_id: ID de l'élément
+            content_type: Type de contenu (None = tous les types)
+        
+        Returns:
+            Élément trouvé ou None
+        """
+        if content_type is not None:
+            return self._index.get((content_type, item_id))
+        return self._id_index.get(item_id)
+    
+    def remove_item(self, item_id: int, content_type: str = None) -> bool:
+        """
+        Supprime un élément des données, des index, de la sélection et des modifications
+        
+        Args:
+            item_id: ID de l'élément
+            content_type: Type de contenu (None = tous les types)
+        
+        Returns:
+            Succès de la suppression
+        """
+        item = self.get_item(item_id, content_type)
+        if item is None:
+            return False
+        
+        item_type = content_type or item.get("type")
+        
+        # Retrait de la liste filtrée avant de perdre sa position de tri
+        self._refilter_item(item_type, item, removed=True)
+        
+        items = self.data.get(item_type, [])
+        for i, candidate in enumerate(items):
+            if candidate is item:
+                del items[i]
+                break
+        
+        self._index.pop((item_type, item_id), None)
+        row = self._row_of.pop((item_type, item_id), None)
+        if row is not None:
+            self.store.set(row, alive=False, selected=False, modified=False)
+        self._search_remove([(item_type, item_id)])
+        if self._id_index.get(item_id) is item:
+            del self._id_index[item_id]
+        
+        self.modified_items.discard(item_id)
+        self.selected_items.discard(item_id)
+        self._persist("delete_record", item_type, item_id)
+        
+        self.item_updated.emit(item_id)
+        return True
+    
     def select_item(self, item_id: int, selected: bool = True) -> None:
         """
         Sélectionne ou désélectionne un élément
@@ -160,6 +787,33 @@ class DataManager(QObject):
             self.selected_items.add(item_id)
         else:
             self.selected_items.discard(item_id)
+        
+        row = self._row(item_id)
+        if row is not None:
+            self.store.set(row, selected=selected)
+            self._persist("set_selected", [(self._id_index[item_id].get("type"), item_id)], selected)
+    
+    def select_all(self, selected: bool = True) -> None:
+        """
+        Sélectionne tous les éléments affichés ou désélectionne tous les éléments
+        
+        Args:
+            selected: True pour sélectionner les éléments affichés, False pour tout désélectionner
+        """
+        self._finish_restore()
+        column = self.store.column("selected")
+        
+        if selected:
+            column[self.filtered_rows] = True
+            self.selected_items.update(self.store.column("id")[self.filtered_rows].tolist())
+            self._persist("set_selected", [(item["type"], item["id"]) for item in self.filtered_data], True)
+        else:
+            column[:] = False
+            self.selected_items.clear()
+            self._persist("clear_selected")
+        
+        # Notification de changement de données
+        self.data_changed.emit()
     
     def update_original_values(self, item_id: int, seo_title: str = None, seo_description: str = None, title_h1: str = None) -> bool:
         """
@@ -170,33 +824,33 @@ class DataManager(QObject):
             seo_title: Titre SEO (None = pas de modification)
             seo_description: Description SEO (None = pas de modification)
             title_h1: Titre H1 (None = pas de modification)
-            
+        
         Returns:
             Succès de la mise à jour
         """
-        # Recherche de l'élément dans toutes les données
-        for content_type, items in self.data.items():
-            for i, item in enumerate(items):
-                if item["id"] == item_id:
-                    # Mise à jour des valeurs originales
-                    if seo_title is not None:
-                        self.data[content_type][i]["original_seo_title"] = seo_title
-                    
-                    if seo_description is not None:
-                        self.data[content_type][i]["original_seo_description"] = seo_description
-                    
-                    if title_h1 is not None:
-                        self.data[content_type][i]["original_title_h1"] = title_h1
-                    
-                    # Retirer des éléments modifiés si les valeurs sont maintenant identiques aux originales
-                    if (self.data[content_type][i]["seo_title"] == self.data[content_type][i]["original_seo_title"] and
-                        self.data[content_type][i]["seo_description"] == self.data[content_type][i]["original_seo_description"] and
-                        self.data[content_type][i]["title_h1"] == self.data[content_type][i]["original_title_h1"]):
-                        self.modified_items.discard(item_id)
-                    
-                    return True
+        # Recherche de l'élément par l'index
+        item = self.get_item(item_id)
+        if item is None:
+            return False
+        
+        # Mise à jour des valeurs originales
+        if seo_title is not None:
+            item["original_seo_title"] = seo_title
         
-        return False
+        if seo_description is not None:
+            item["original_seo_description"] = seo_description
+        
+        if title_h1 is not None:
+            item["original_title_h1"] = title_h1
+        
+        # Retirer des éléments modifiés si les valeurs sont maintenant identiques aux originales
+        if (item["seo_title"] == item["original_seo_title"] and
+            item["seo_description"] == item["original_seo_description"] and
+            item["title_h1"] == item["original_title_h1"]):
+            self._set_modified(item, False)
+        
+        self._persist_item(item)
+        return True
     
     def update_item(self, item_id: int, seo_title: str = None, seo_description: str = None, title_h1: str = None) -> bool:
         """
@@ -207,104 +861,328 @@ class DataManager(QObject):
             seo_title: Nouveau titre SEO (None = pas de modification)
             seo_description: Nouvelle description SEO (None = pas de modification)
             title_h1: Nouveau titre H1 (None = pas de modification)
-            
+        
         Returns:
             Succès de la mise à jour
         """
-        # Recherche de l'élément dans toutes les données
-        for content_type, items in self.data.items():
-            for i, item in enumerate(items):
-                if item["id"] == item_id:
-                    # Mise à jour du titre SEO
-                    if seo_title is not None:
-                        self.data[content_type][i]["seo_title"] = seo_title
-                    
-                    # Mise à jour de la description SEO
-                    if seo_description is not None:
-                        self.data[content_type][i]["seo_description"] = seo_description
-                    
-                    # Mise à jour du titre H1
-                    if title_h1 is not None:
-                        self.data[content_type][i]["title_h1"] = title_h1
-                    
-                    # Vérification si l'élément est modifié
-                    if (self.data[content_type][i]["seo_title"] != self.data[content_type][i]["original_seo_title"] or
-                        self.data[content_type][i]["seo_description"] != self.data[content_type][i]["original_seo_description"] or
-                        self.data[content_type][i]["title_h1"] != self.data[content_type][i]["original_title_h1"]):
-                        # Marquer comme modifié
-                        self.modified_items.add(item_id)
-                    else:
-                        # Retirer des éléments modifiés si identique à l'original
-                        self.modified_items.discard(item_id)
-                    
-                    # Mise à jour des données filtrées
-                    self._apply_filters()
-                    
-                    # Notification de changement de données
-                    self.data_changed.emit()
-                    
-                    return True
+        # Recherche de l'élément par l'index
+        item = self.get_item(item_id)
+        if item is None:
+            return False
+        
+        # Différences enregistrées dans l'historique
+        self.history.record("Modification", [
+            (item.get("type"), item_id, field, item.get(field), value)
+            for field, value in (("seo_title", seo_title), ("seo_description", seo_description), ("title_h1", title_h1))
+            if value is not None and item.get(field) != value
+        ])
+        
+        # Mise à jour du titre SEO
+        if seo_title is not None:
+            item["seo_title"] = seo_title
+        
+        # Mise à jour de la description SEO
+        if seo_description is not None:
+            item["seo_description"] = seo_description
+        
+        # Mise à jour du titre H1
+        if title_h1 is not None:
+            item["title_h1"] = title_h1
+        
+        # Vérification si l'élément est modifié
+        if (item["seo_title"] != item["original_seo_title"] or
+            item["seo_description"] != item["original_seo_description"] or
+            item["title_h1"] != item["original_title_h1"]):
+            # Marquer comme modifié
+            self._set_modified(item, True)
+        else:
+            # Retirer des éléments modifiés si identique à l'original
+            self._set_modified(item, False)
+        
+        # Mise à jour de la qualité SEO, de l'index de recherche et réévaluation des filtres pour cet élément uniquement
+        self._update_seo_quality(item.get("type"), item)
+        self._search_add({(item.get("type"), item_id): item})
+        self._refilter_item(item.get("type"), item)
+        self._persist_item(item)
+        
+        # Notification de changement de l'élément
+        self.item_updated.emit(item_id)
+        
+        return True
+    
+    def restore_from_history(self) -> bool:
+        """
+        Annule la dernière modification de l'historique (modification d'un élément ou importation CSV)
+        
+        Returns:
+            True si une modification a été annulée
+        """
+        entry = self.history.peek_undo()
+        if entry is None:
+            return False
+        
+        # Entrée déplacée vers la pile de rétablissement seulement une fois appliquée
+        self._apply_history_entry(entry, undo=True)
+        self.history.pop_undo()
+        self.logger.info(f"Modification annulée: {entry['label']} ({entry['size']} changements)")
+        return True
+    
+    def redo_from_history(self) -> bool:
+        """
+        Rétablit la dernière modification annulée
+        
+        Returns:
+            True si une modification a été rétablie
+        """
+        entry = self.history.peek_redo()
+        if entry is None:
+            return False
+        
+        self._apply_history_entry(entry, undo=False)
+        self.history.pop_redo()
+        self.logger.info(f"Modification rétablie: {entry['label']} ({entry['size']} changements)")
+        return True
+    
+    def _apply_history_entry(self, entry: Dict[str, Any], undo: bool) -> None:
+        """
+        Applique une entrée de l'historique dans un sens ou dans l'autre
+        
+        Seuls les champs enregistrés sont réécrits ; la qualité SEO et l'état modifié sont recalculés
+        en bloc pour les éléments touchés, et les éléments ajoutés par une importation sont retirés
+        (annulation) ou ajoutés de nouveau (rétablissement).
+        
+        Args:
+            entry: Entrée de l'historique
+            undo: True pour annuler, False pour rétablir
+        """
+        diffs, added = EditHistory.decode(entry)
+        touched = {}  # Éléments dont un champ est réécrit
+        readded = {}  # Éléments ajoutés de nouveau (état de fin de leur bloc d'importation)
+        
+        # Rétablissement : éléments ajoutés replacés avant les différences (un bloc suivant de
+        # l'importation a pu les modifier)
+        if not undo:
+            by_type = {}
+            for content_type, item in added:
+                if (content_type, item["id"]) not in self._index:
+                    by_type.setdefault(content_type, []).append(dict(item))
+            for content_type, items in by_type.items():
+                self.data.setdefault(content_type, []).extend(items)
+                self._index_items(content_type, items)
+                readded.update(((content_type, item["id"]), item) for item in items)
+        
+        # Valeurs des champs (ordre inverse pour une annulation)
+        for content_type, item_id, field, old_value, new_value in (reversed(diffs) if undo else diffs):
+            item = self._index.get((content_type, item_id))
+            if item is not None:
+                item[field] = old_value if undo else new_value
+                touched[(content_type, item_id)] = item
+        
+        # Annulation : éléments ajoutés retirés après les différences (y compris ceux modifiés par un bloc suivant)
+        if undo:
+            removed = [(content_type, item["id"]) for content_type, item in added]
+            self._remove_items(removed)
+            for key in removed:
+                touched.pop(key, None)
+        
+        # Qualité SEO et état modifié recalculés en bloc pour les éléments réécrits
+        # (éléments seulement ajoutés de nouveau : état de fin d'importation conservé)
+        rows = np.fromiter((self._row_of[key] for key in touched), dtype=np.int64, count=len(touched))
+        self._update_seo_quality_rows(rows)
+        self._update_modified_rows(rows)
+        touched.update(readded)
+        
+        # Index de recherche : éléments réécrits ou ajoutés de nouveau réindexés
+        self._search_add(touched)
+        
+        # Affichage : réévaluation d'un seul élément, ou reconstruction de la liste filtrée
+        if len(touched) == 1 and not added:
+            (content_type, item_id), item = next(iter(touched.items()))
+            self._refilter_item(content_type, item)
+            self.item_updated.emit(item_id)
+        else:
+            self._apply_filters()
+            self.data_changed.emit()
+        
+        self._persist("upsert_records", [
+            (content_type, item, item["id"] in self.modified_items, item["id"] in self.selected_items)
+            for (content_type, _), item in touched.items()
+        ])
+    
+    def _remove_items(self, keys: List[Tuple[str, int]]) -> None:
+        """
+        Supprime plusieurs éléments en bloc (données, index, sélection et modifications)
+        
+        Les données filtrées ne sont pas recalculées.
+        
+        Args:
+            keys: Couples (type, id)
+        """
+        keys = [key for key in keys if key in self._index]
+        if not keys:
+            return
+        
+        removed = set(keys)
+        for content_type in {content_type for content_type, _ in keys}:
+            items = self.data.get(content_type, [])
+            items[:] = [item for item in items if (content_type, item["id"]) not in removed]
+        
+        for key in keys:
+            item = self._index.pop(key)
+            row = self._row_of.pop(key)
+            self.store.set(row, alive=False, selected=False, modified=False)
+            if self._id_index.get(key[1]) is item:
+                del self._id_index[key[1]]
+            self.modified_items.discard(key[1])
+            self.selected_items.discard(key[1])
+        self._search_remove(keys)
+        
+        self._persist("delete_records", keys)
+    
+    def set_filter_criteria(self, filter_criteria: Dict[str, Any]) -> None:
+        """
+        Définit les critères de filtrage et reconstruit la liste filtrée
+        
+        Args:
+            filter_criteria: Critères (search_text, content_type, modified_only, seo_issues)
+        """
+        self.filter_criteria = dict(filter_criteria)
+        self._persist("save_filters", self.filter_criteria)
+        
+        # Seul un changement de critères nécessite une reconstruction complète
+        self._apply_filters()
+        self.data_changed.emit()
+    
+    def _row_matches(self, row: int, check_search: bool = True) -> bool:
+        """
+        Vérifie si une ligne du stockage satisfait les critères de filtrage
+        
+        Args:
+            row: Ligne du stockage en colonnes
+            check_search: False si le texte de recherche a déjà été vérifié par l'index
+        
+        Returns:
+            True si l'élément doit apparaître dans les données filtrées
+        """
+        store = self.store
+        criteria = self.filter_criteria
+        
+        if not store.get(row, "alive"):
+            return False
+        
+        content_type = store.type_names[store.get(row, "type_code")]
+        
+        # Filtre par type de contenu
+        if criteria.get("content_type", "all") != "all" and content_type != criteria["content_type"]:
+            return False
+        
+        # Filtre par état de modification
+        if criteria.get("modified_only") and not store.get(row, "modified"):
+            return False
+        
+        # Filtre par problèmes SEO (qualité précalculée)
+        if criteria.get("seo_issues") and not (store.get(row, "title_issue") or store.get(row, "description_issue")):
+            return False
+        
+        # Filtre par texte de recherche (titre, URL, titre SEO, description SEO et titre H1)
+        if check_search and criteria.get("search_text"):
+            if not self.search_index.matches((content_type, int(store.get(row, "id"))), criteria["search_text"]):
+                return False
+        
+        return True
+    
+    def _filter_mask(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Évalue les critères de filtrage de façon vectorisée
+        
+        Args:
+            rows: Lignes du stockage en colonnes
+        
+        Returns:
+            Masque booléen des lignes retenues
+        """
+        store = self.store
+        criteria = self.filter_criteria
+        mask = store.column("alive")[rows]
         
-        return False
+        # Filtre par type de contenu
+        if criteria.get("content_type", "all") != "all":
+            mask &= store.column("type_code")[rows] == store.type_code(criteria["content_type"], create=False)
+        
+        # Filtre par état de modification
+        if criteria.get("modified_only"):
+            mask &= store.column("modified")[rows]
+        
+        # Filtre par problèmes SEO
+        if criteria.get("seo_issues"):
+            mask &= store.column("title_issue")[rows] | store.column("description_issue")[rows]
+        
+        # Filtre par texte de recherche
+        if criteria.get("search_text"):
+            # Lignes des candidats de l'index
+            found = np.zeros(len(store), dtype=bool)
+            found[np.asarray([self._row_of[key] for key in self.search_index.search(criteria["search_text"])], dtype=np.int64)] = True
+            mask &= found[rows]
+        
+        return mask
     
     def _apply_filters(self) -> None:
-        """Applique les filtres aux données"""
-        self.filtered_data = []
+        """Applique les filtres aux données (reconstruction complète et vectorisée de la liste filtrée)"""
+        mask = self._filter_mask(np.arange(len(self.store), dtype=np.int64))
         
-        for content_type, items in self.data.items():
-            # Filtre par type de contenu
-            if "content_type" in self.filter_criteria and self.filter_criteria["content_type"] != "all":
-                if content_type != self.filter_criteria["content_type"]:
-                    continue
-            
-            for item in items:
-                # Filtre par texte de recherche
-                if "search_text" in self.filter_criteria and self.filter_criteria["search_text"]:
-                    search_text = self.filter_criteria["search_text"].lower()
-                    
-                    # Recherche dans le titre, l'URL, le titre SEO, la description SEO et le titre H1
-                    if (search_text not in item["title"].lower() and
-                        search_text not in item["url"].lower() and
-                        search_text not in item["seo_title"].lower() and
-                        search_text not in item["seo_description"].lower() and
-                        search_text not in item.get("title_h1", "").lower()):
-                        continue
-                
-                # Filtre par état de modification
-                if "modified_only" in self.filter_criteria and self.filter_criteria["modified_only"]:
-                    if item["id"] not in self.modified_items:
-                        continue
-                
-                # Filtre par problèmes SEO
-                if "seo_issues" in self.filter_criteria and self.filter_criteria["seo_issues"]:
-                    has_issues = False
-                    
-                    # Vérification de la longueur du titre SEO
-                    if len(item["seo_title"]) < 30 or len(item["seo_title"]) > 60:
-                        has_issues = True
-                    
-                    # Vérification de la longueur de la description SEO
-                    if len(item["seo_description"]) < 120 or len(item["seo_description"]) > 160:
-                        has_issues = True
-                    
-                    if not has_issues:
-                        continue
-                
-                # Ajout de l'élément aux données filtrées
-                self.filtered_data.append(item)
+        # Lignes retenues dans l'ordre d'affichage
+        self.filtered_rows = self.store.rows_where(mask)
+        self.filtered_data = self.store.records_at(self.filtered_rows)
     
-    def import_from_wp(self, content_data: Dict[str, List[Dict[str, Any]]]) -> None:
+    def _refilter_item(self, content_type: str, item: Dict[str, Any], removed: bool = False) -> None:
+        """
+        Réévalue les filtres pour un seul élément et met à jour sa ligne dans les données filtrées
+        
+        L'élément est inséré ou retiré à sa position (recherche dichotomique sur les positions d'affichage)
+        et les signaux row_* correspondants sont émis, sans reconstruire la liste.
+        
+        Args:
+            content_type: Type de contenu de l'élément
+            item: Élément modifié
+            removed: True si l'élément est en cours de suppression
+        """
+        row = self._row_of.get((content_type, item["id"]))
+        if row is None:
+            return
+        
+        filtered_rows = self.filtered_rows
+        position = int(np.searchsorted(self.store.column("order")[filtered_rows], self.store.get(row, "order")))
+        present = position < len(filtered_rows) and filtered_rows[position] == row
+        matches = not removed and self._row_matches(row)
+        
+        if matches and not present:
+            self.row_about_to_be_inserted.emit(position)
+            self.filtered_rows = np.insert(filtered_rows, position, row)
+            self.filtered_data.insert(position, item)
+            self.row_inserted.emit(position)
+        
+        elif present and not matches:
+            self.row_about_to_be_removed.emit(position)
+            self.filtered_rows = np.delete(filtered_rows, position)
+            del self.filtered_data[position]
+            self.row_removed.emit(position)
+        
+        elif present:
+            self.row_changed.emit(position)
+    
+    def import_from_wp(self, content_data: Dict[str, List[Dict[str, Any]]], extracted: bool = False) -> None:
         """
         Importe les données depuis WordPress
         
         Args:
             content_data: Dictionnaire avec les types de contenu comme clés et les listes d'éléments comme valeurs
+            extracted: Les éléments sont déjà des métadonnées extraites (fetch_all_content avec extract=True)
         """
         self.logger.info("Importation des données depuis WordPress")
         
         try:
             # Vérification si des données de session existent
-            if os.path.exists(self.session_file):
+            if self.has_session():
                 # Demander à l'utilisateur s'il souhaite fusionner les données
                 from PyQt6.QtWidgets import QMessageBox
                 reply = QMessageBox.question(
@@ -346,10 +1224,13 @@ class DataManager(QObject):
                                 # Traitement des événements pour éviter le gel de l'interface
                                 QCoreApplication.processEvents()
             
-            # Réinitialisation des données
+            # Réinitialisation des données (abandon d'une restauration en cours)
+            self._cancel_restore()
             self.data = {}
             self.filtered_data = []
+            self.filtered_rows = np.zeros(0, dtype=np.int64)
             self.modified_items = set()
+            self.history.clear()
             
             # Traitement des données importées
             total_items = sum(len(items) for items in content_data.values())
@@ -371,8 +1252,11 @@ class DataManager(QObject):
                             # Extraction des métadonnées SEO
                             title_value = item.get("title", {}).get("rendered", "") if isinstance(item.get("title"), dict) else item.get("title", "")
                             
+                            # Métadonnées déjà extraites pendant la récupération des pages
+                            if extracted:
+                                metadata = item
                             # Utilisation du connecteur WordPress pour extraire les métadonnées SEO
-                            if hasattr(self, 'wp_connector') and self.wp_connector:
+                            elif hasattr(self, 'wp_connector') and self.wp_connector:
                                 # Si le connecteur WordPress est disponible, utiliser sa méthode d'extraction
                                 try:
                                     metadata = self.wp_connector.extract_seo_metadata(item)
@@ -422,6 +1306,9 @@ class DataManager(QObject):
                     # Traitement des événements pour éviter le gel de l'interface
                     QCoreApplication.processEvents()
             
+            # Reconstruction des index après remplacement des données
+            self._rebuild_index()
+            
             # Mise à jour des données filtrées
             self._apply_filters()
             
@@ -431,7 +1318,7 @@ class DataManager(QObject):
             
             # Sauvegarde automatique de la session après importation
             self.save_session_data()
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de l'importation depuis WordPress: {str(e)}")
             # Notification de changement de données même en cas d'erreur
@@ -441,106 +1328,49 @@ class DataManager(QObject):
         """
         Importe les données depuis un fichier CSV
         
+        Le fichier est lu et fusionné par blocs (CSVChunkReader) : la mémoire occupée dépend de la taille
+        des blocs et non de celle du fichier. La progression (signal import_progress) est exprimée
+        en kilo-octets lus.
+        
         Args:
             filepath: Chemin du fichier CSV
             separator: Séparateur CSV (None = auto-détection)
-            
+        
         Returns:
             Tuple (succès, message, nombre d'éléments importés)
         """
         try:
-            # Détection du séparateur
-            if separator is None:
-                # Essai de détection automatique du séparateur
-                with open(filepath, 'r', encoding='utf-8-sig') as f:
-                    first_line = f.readline().strip()
-                
-                if ';' in first_line:
-                    separator = ';'
-                elif ',' in first_line:
-                    separator = ','
-                elif '\t' in first_line:
-                    separator = '\t'
-                else:
-                    separator = ','
-            
-            # Lecture du fichier CSV
-            df = pd.read_csv(filepath, encoding="utf-8-sig", sep=separator)
+            reader = CSVChunkReader(filepath, separator)
             
             # Vérification des colonnes requises
-            required_columns = ["id", "type"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                error_msg = f"Colonnes requises manquantes: {', '.join(missing_columns)}"
+            if reader.missing_columns:
+                error_msg = f"Colonnes requises manquantes: {', '.join(reader.missing_columns)}"
                 self.logger.error(error_msg)
                 return False, error_msg, 0
             
-            # Conversion en liste de dictionnaires
-            csv_data = df.to_dict(orient="records")
-            
-            # Mise à jour des données
+            # Fusion bloc par bloc avec la session complète, en une seule entrée de l'historique
+            self._finish_restore()
             updated_count = 0
+            total_mb = reader.total_bytes / 1e6
             
-            for csv_item in csv_data:
-                try:
-                    # Conversion de l'ID en entier
-                    item_id = int(csv_item["id"])
-                    item_type = csv_item["type"]
-                    
-                    # Vérification si le type de contenu existe
-                    if item_type not in self.data:
-                        self.data[item_type] = []
+            self.history.begin_group("Importation CSV")
+            try:
+                for chunk in reader:
+                    count, merged_items = self.merge_csv_frame(chunk)
+                    updated_count += count
                     
-                    # Recherche de l'élément correspondant
-                    found = False
+                    # Éléments fusionnés journalisés bloc par bloc
+                    self._persist("upsert_records", [
+                        (item["type"], item, item["id"] in self.modified_items, item["id"] in self.selected_items)
+                        for item in merged_items
+                    ])
                     
-                    for i, item in enumerate(self.data[item_type]):
-                        if item["id"] == item_id:
-                            # Mise à jour des métadonnées SEO
-                            if "seo_title" in csv_item:
-                                self.data[item_type][i]["seo_title"] = csv_item["seo_title"]
-                            
-                            if "seo_description" in csv_item:
-                                self.data[item_type][i]["seo_description"] = csv_item["seo_description"]
-                            
-                            # Mise à jour du titre H1
-                            if "title_h1" in csv_item:
-                                self.data[item_type][i]["title_h1"] = csv_item["title_h1"]
-                            
-                            # Marquer comme modifié si différent de l'original
-                            if (self.data[item_type][i]["seo_title"] != self.data[item_type][i]["original_seo_title"] or
-                                self.data[item_type][i]["seo_description"] != self.data[item_type][i]["original_seo_description"] or
-                                self.data[item_type][i]["title_h1"] != self.data[item_type][i]["original_title_h1"]):
-                                self.modified_items.add(item_id)
-                            
-                            updated_count += 1
-                            found = True
-                            break
-                    
-                    if not found:
-                        # Si l'élément n'existe pas et que nous avons suffisamment d'informations, créer un nouvel élément
-                        if "title" in csv_item and "url" in csv_item:
-                            new_item = {
-                                "id": item_id,
-                                "type": item_type,
-                                "title": csv_item["title"],
-                                "url": csv_item["url"],
-                                "date_modified": csv_item.get("date_modified", ""),
-                                "seo_title": csv_item.get("seo_title", ""),
-                                "seo_description": csv_item.get("seo_description", ""),
-                                "title_h1": csv_item.get("title_h1", csv_item["title"]),
-                                "original_seo_title": csv_item.get("original_seo_title", ""),
-                                "original_seo_description": csv_item.get("original_seo_description", ""),
-                                "original_title_h1": csv_item.get("original_title_h1", csv_item["title"])
-                            }
-                            
-                            # Ajout à la liste
-                            self.data[item_type].append(new_item)
-                            updated_count += 1
-                except Exception as item_error:
-                    # Gestion des erreurs par élément pour éviter d'interrompre tout le processus
-                    self.logger.warning(f"Erreur lors du traitement de l'élément {csv_item.get('id', 'inconnu')}: {str(item_error)}")
+                    self.import_progress.emit(
+                        reader.bytes_read // 1024, reader.total_bytes // 1024,
+                        f"Importation CSV: {updated_count} éléments ({reader.bytes_read / 1e6:.1f} / {total_mb:.1f} Mo)"
+                    )
+            finally:
+                self.history.end_group()
             
             # Mise à jour des données filtrées
             self._apply_filters()
@@ -548,100 +1378,185 @@ class DataManager(QObject):
             # Notification de changement de données
             self.data_changed.emit()
             
-            # Sauvegarde automatique de la session après importation
-            self.save_session_data()
+            # Sauvegarde automatique de la session complète si elle n'est pas encore enregistrée
+            if not self._session_synced:
+                self.save_session_data()
             
-            self.logger.info(f"Importation CSV réussie: {updated_count} éléments mis à jour depuis {filepath}")
+            self.logger.info(f"Importation CSV réussie: {updated_count} éléments mis à jour depuis {filepath} "
+                             f"(analyse {reader.engine}: {reader.throughput():.1f} Mo/s)")
             return True, f"Importation réussie: {updated_count} éléments mis à jour", updated_count
-            
+        
         except Exception as e:
             error_msg = f"Erreur lors de l'importation CSV: {str(e)}"
             self.logger.error(error_msg)
+            # Blocs déjà fusionnés affichés (et annulables) malgré l'erreur
+            self._apply_filters()
+            self.data_changed.emit()
             return False, error_msg, 0
     
+    def merge_csv_frame(self, df: pd.DataFrame) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Fusionne des lignes CSV dans la session par jointure sur (type, id)
+        
+        Les éléments existants ne sont réécrits que si un champ fusionné change, et l'état modifié est
+        calculé par comparaison vectorisée avec les valeurs originales. Les nouveaux éléments (colonnes
+        title et url présentes) sont ajoutés en bloc. L'opération forme une seule entrée de l'historique.
+        Les données filtrées ne sont pas recalculées et la session n'est pas enregistrée.
+        
+        Args:
+            df: Lignes CSV (colonnes id et type requises, valeurs en chaînes)
+        
+        Returns:
+            Tuple (nombre d'éléments mis à jour ou ajoutés, éléments changés ou ajoutés)
+        """
+        # IDs invalides écartés, dernière occurrence conservée pour chaque (type, id)
+        ids = pd.to_numeric(df["id"], errors="coerce")
+        invalid = (ids.isna() | (ids != ids.round())).to_numpy()
+        if invalid.any():
+            self.logger.warning(f"{int(invalid.sum())} lignes CSV ignorées (ID invalide)")
+        df = df.loc[~invalid].assign(id=ids[~invalid].astype(np.int64), type=df["type"][~invalid].astype(str))
+        df = df.drop_duplicates(["type", "id"], keep="last")
+        
+        # Jointure avec les lignes du stockage en colonnes
+        store = self.store
+        alive = np.flatnonzero(store.column("alive"))
+        session = pd.DataFrame({
+            "type": np.array(store.type_names, dtype=object)[store.column("type_code")[alive]],
+            "id": store.column("id")[alive],
+            "_row": alive
+        })
+        merged = df.merge(session, on=["type", "id"], how="left")
+        found = merged["_row"].notna().to_numpy()
+        
+        # Éléments existants changés : comparaison vectorisée avec les valeurs courantes
+        existing = merged.loc[found]
+        rows = existing["_row"].to_numpy(dtype=np.int64)
+        records = store.records_at(rows)
+        fields = [field for field in self.MERGE_FIELDS if field in existing.columns]
+        changed = np.zeros(len(rows), dtype=bool)
+        values = {}
+        
+        for field in fields:
+            values[field] = existing[field].to_numpy(dtype=object)
+            changed |= values[field] != np.fromiter((record.get(field) for record in records), dtype=object, count=len(records))
+        
+        # Réécriture des seuls éléments changés, avec les différences pour l'historique
+        positions = np.flatnonzero(changed)
+        changed_rows = rows[positions]
+        changed_records = [records[position] for position in positions.tolist()]
+        changed_keys = list(zip(np.array(store.type_names, dtype=object)[store.column("type_code")[changed_rows]].tolist(),
+                                store.column("id")[changed_rows].tolist()))
+        diffs = []
+        for field in fields:
+            for (content_type, item_id), record, value in zip(changed_keys, changed_records, values[field][positions].tolist()):
+                if record.get(field) != value:
+                    diffs.append((content_type, item_id, field, record.get(field), value))
+                    record[field] = value
+        self._update_seo_quality_rows(changed_rows)
+        self._update_modified_rows(changed_rows)
+        
+        updated_count = len(rows)
+        added = []
+        search_updates = changed_records
+        search_records = dict(zip(changed_keys, changed_records))
+        
+        # Nouveaux éléments, ajoutés en bloc par type de contenu
+        new_rows = merged.loc[~found]
+        if len(new_rows) and "title" in new_rows.columns and "url" in new_rows.columns:
+            title = new_rows["title"]
+            new_items = pd.DataFrame({
+                "id": new_rows["id"],
+                "type": new_rows["type"],
+                "title": title,
+                "url": new_rows["url"],
+                "date_modified": new_rows.get("date_modified", ""),
+                "seo_title": new_rows.get("seo_title", ""),
+                "seo_description": new_rows.get("seo_description", ""),
+                "title_h1": new_rows.get("title_h1", title),
+                "original_seo_title": new_rows.get("original_seo_title", ""),
+                "original_seo_description": new_rows.get("original_seo_description", ""),
+                "original_title_h1": new_rows.get("original_title_h1", title)
+            }).to_dict(orient="records")
+            
+            by_type = {}
+            for item in new_items:
+                by_type.setdefault(item["type"], []).append(item)
+            for content_type, items in by_type.items():
+                self.data.setdefault(content_type, []).extend(items)
+                self._index_items(content_type, items)
+            
+            updated_count += len(new_items)
+            search_updates = search_updates + new_items
+            search_records.update(((item["type"], item["id"]), item) for item in new_items)
+            added = [(item["type"], item) for item in new_items]
+        
+        # Index de recherche : éléments changés ou ajoutés réindexés (préparés dans un thread pour un gros lot)
+        self._search_add(search_records)
+        
+        # Une seule entrée groupée (compressée) dans l'historique pour toute l'importation
+        self.history.record("Importation CSV", diffs, added)
+        
+        return updated_count, search_updates
+    
     def get_items_for_update(self, selected_only: bool = False) -> List[Dict[str, Any]]:
         """
         Récupère les éléments à mettre à jour
         
         Args:
             selected_only: Récupérer uniquement les éléments sélectionnés
-            
+        
         Returns:
             Liste des éléments à mettre à jour
         """
-        items_to_update = []
-        
-        # Détermination des IDs à mettre à jour
-        if selected_only:
-            # Uniquement les éléments sélectionnés
-            update_ids = self.selected_items
-        else:
-            # Tous les éléments modifiés
-            update_ids = self.modified_items
+        self._finish_restore()
         
-        # Récupération des éléments correspondants
-        for content_type, items in self.data.items():
-            for item in items:
-                if item["id"] in update_ids:
-                    items_to_update.append(item)
+        # Uniquement les éléments sélectionnés, ou tous les éléments modifiés
+        mask = self.store.column("selected" if selected_only else "modified")
         
-        return items_to_update
+        # Récupération des éléments correspondants, dans l'ordre d'affichage
+        return self.store.records_at(self.store.rows_where(mask))
     
-    def export_to_csv(self, filepath: str, export_all: bool = True) -> bool:
+    def export_to_csv(self, filepath: str, export_all: bool = True, compress: bool = None) -> bool:
         """
         Exporte les données vers un fichier CSV
         
+        Les lignes sont écrites en flux depuis le stockage en colonnes (mémoire constante) ;
+        la progression est notifiée par le signal export_progress, à fréquence limitée.
+        
         Args:
             filepath: Chemin du fichier CSV
             export_all: Exporter toutes les données ou seulement les éléments sélectionnés
-            
+            compress: Compression gzip (None = selon l'extension .gz)
+        
         Returns:
             Succès de l'exportation
         """
         try:
-            # Détermination des données à exporter
-            export_data = []
+            self._finish_restore()
             
+            # Détermination des lignes à exporter
             if export_all:
                 # Exportation de toutes les données
-                for content_type, items in self.data.items():
-                    export_data.extend(items)
+                rows = self.store.rows_where(np.ones(len(self.store), dtype=bool))
             else:
-                # Exportation des éléments sélectionnés uniquement
-                selected_ids = self.selected_items
-                for item in self.filtered_data:
-                    if item["id"] in selected_ids:
-                        export_data.append(item)
+                # Exportation des éléments sélectionnés parmi les éléments affichés
+                displayed = np.zeros(len(self.store), dtype=bool)
+                displayed[self.filtered_rows] = True
+                rows = self.store.rows_where(displayed & self.store.column("selected"))
             
-            if not export_data:
+            if not len(rows):
                 self.logger.warning("Aucune donnée à exporter")
                 return False
             
-            # Création du DataFrame pandas
-            df = pd.DataFrame(export_data)
-            
-            # Réorganisation des colonnes
-            columns = [
-                "id", "type", "title", "url", "date_modified",
-                "original_seo_title", "original_seo_description", "original_title_h1",
-                "seo_title", "seo_description", "title_h1"
-            ]
-            
-            # Filtrer les colonnes qui existent réellement dans le DataFrame
-            existing_columns = [col for col in columns if col in df.columns]
-            
-            # Exportation vers CSV avec BOM UTF-8
-            df.to_csv(
-                filepath,
-                columns=existing_columns,
-                index=False,
-                encoding="utf-8-sig",
-                quoting=csv.QUOTE_ALL
-            )
-            
-            self.logger.info(f"Exportation CSV réussie: {len(export_data)} éléments exportés vers {filepath}")
-            return True
+            def on_progress(count: int, total: int) -> None:
+                self.export_progress.emit(count, total, f"Exportation CSV: {count}/{total} éléments")
             
+            count = write_csv(self.store.iter_records_at(rows), filepath, compress=compress,
+                              callback=on_progress, total=len(rows))
+            
+            self.logger.info(f"Exportation CSV réussie: {count} éléments exportés vers {filepath}")
+            return True
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de l'exportation CSV: {str(e)}")
             return False
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Historique des modifications (annuler / rétablir)
+Chaque entrée conserve des différences par champ (élément, champ, ancienne et nouvelle valeur)
+dans un tampon circulaire borné ; les opérations volumineuses forment une seule entrée compressée.
+"""
+
+import json
+import zlib
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+# Différence sur un champ : (type de contenu, ID, champ, ancienne valeur, nouvelle valeur)
+FieldDiff = Tuple[str, int, str, Any, Any]
+
+class EditHistory:
+    """Piles d'annulation et de rétablissement à base de différences par champ"""
+    
+    MAX_ENTRIES = 100  # Entrées conservées (les plus anciennes sont écartées)
+    COMPRESS_MIN_DIFFS = 64  # Taille à partir de laquelle une entrée est compressée (zlib)
+    
+    def __init__(self, max_entries: int = None):
+        """
+        Initialisation d'un historique vide
+        
+        Args:
+            max_entries: Nombre maximal d'entrées (MAX_ENTRIES par défaut)
+        """
+        self._undo = deque(maxlen=max_entries or self.MAX_ENTRIES)
+        self._redo = deque(maxlen=max_entries or self.MAX_ENTRIES)
+        self._group = None  # Entrée groupée en cours (opération en plusieurs étapes)
+    
+    def __len__(self) -> int:
+        """Nombre d'entrées annulables"""
+        return len(self._undo)
+    
+    def clear(self) -> None:
+        """Vide l'historique (données remplacées)"""
+        self._undo.clear()
+        self._redo.clear()
+    
+    def can_undo(self) -> bool:
+        """Indique si une entrée peut être annulée"""
+        return bool(self._undo)
+    
+    def can_redo(self) -> bool:
+        """Indique si une entrée peut être rétablie"""
+        return bool(self._redo)
+    
+    def begin_group(self, label: str) -> None:
+        """
+        Commence une entrée groupée : les opérations enregistrées jusqu'à end_group forment une seule entrée
+        
+        Args:
+            label: Libellé de l'opération
+        """
+        self._group = {"label": label, "size": 0, "payloads": []}
+    
+    def end_group(self) -> None:
+        """Termine l'entrée groupée en cours et l'ajoute à l'historique si elle n'est pas vide"""
+        group, self._group = self._group, None
+        if group is not None and group["size"]:
+            self._undo.append(group)
+            self._redo.clear()
+    
+    @staticmethod
+    def _compress(diffs: List[FieldDiff], added: List[Tuple[str, Dict[str, Any]]]) -> bytes:
+        """Sérialise et compresse des différences et des éléments ajoutés"""
+        return zlib.compress(json.dumps([diffs, added], ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    
+    def record(self, label: str, diffs: List[FieldDiff], added: List[Tuple[str, Dict[str, Any]]] = None) -> None:
+        """
+        Enregistre une opération (la pile de rétablissement est vidée)
+        
+        Dans une entrée groupée, l'opération est compressée immédiatement et ajoutée à l'entrée en cours.
+        
+        Args:
+            label: Libellé de l'opération
+            diffs: Différences par champ
+            added: Éléments ajoutés par l'opération, couples (type de contenu, élément)
+        """
+        added = added or []
+        if not diffs and not added:
+            return
+        
+        if self._group is not None:
+            self._group["payloads"].append(self._compress(diffs, added))
+            self._group["size"] += len(diffs) + len(added)
+            return
+        
+        entry = {"label": label, "size": len(diffs) + len(added)}
+        if entry["size"] >= self.COMPRESS_MIN_DIFFS:
+            # Entrée volumineuse : différences et éléments ajoutés sérialisés puis compressés
+            entry["payloads"] = [self._compress(diffs, added)]
+        else:
+            entry["diffs"] = list(diffs)
+            # Copies des éléments ajoutés : leur état à la fin de l'opération
+            entry["added"] = [(content_type, dict(item)) for content_type, item in added]
+        
+        self._undo.append(entry)
+        self._redo.clear()
+    
+    @staticmethod
+    def decode(entry: Dict[str, Any]) -> Tuple[List[FieldDiff], List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Retourne le contenu d'une entrée
+        
+        Args:
+            entry: Entrée de l'historique
+        
+        Returns:
+            Tuple (différences par champ, éléments ajoutés)
+        """
+        if "payloads" not in entry:
+            return entry["diffs"], entry["added"]
+        
+        diffs = []
+        added = []
+        for payload in entry["payloads"]:
+            part_diffs, part_added = json.loads(zlib.decompress(payload).decode("utf-8"))
+            diffs.extend(tuple(diff) for diff in part_diffs)
+            added.extend(tuple(item) for item in part_added)
+        return diffs, added
+    
+    def peek_undo(self) -> Optional[Dict[str, Any]]:
+        """Retourne la dernière entrée annulable sans la retirer"""
+        return self._undo[-1] if self._undo else None
+    
+    def peek_redo(self) -> Optional[Dict[str, Any]]:
+        """Retourne la dernière entrée annulée sans la retirer"""
+        return self._redo[-1] if self._redo else None
+    
+    def pop_undo(self) -> Optional[Dict[str, Any]]:
+        """Retire la dernière entrée annulable et la place sur la pile de rétablissement"""
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry
+    
+    def pop_redo(self) -> Optional[Dict[str, Any]]:
+        """Retire la dernière entrée annulée et la replace sur la pile d'annulation"""
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return entry
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Index de recherche par trigrammes
+Répond aux recherches par sous-chaîne de la zone de recherche (titre, URL, titre SEO,
+description SEO, titre H1) par intersection de listes de documents, suivie d'une vérification finale.
+Les listes sont réparties en segments ajoutés par lots : un lot est préparé sans toucher à l'index
+(éventuellement dans un autre thread), puis rattaché en un temps proportionnel à sa taille.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Any, Iterable, Hashable, Optional, Tuple
+
+import numpy as np
+
+# Marques diacritiques combinantes supprimées après décomposition NFKD (é -> e)
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+# Alphabet réduit des trigrammes : 0 = séparateur de documents (exclu), 1-26 = lettres, 27-36 = chiffres,
+# 37 = autre caractère, 38 = limite de champ
+_SYMBOL_COUNT = 39
+_SYMBOLS = np.full(129, 37, dtype=np.uint32)
+_SYMBOLS[0] = 0
+_SYMBOLS[ord("\n")] = 38
+for _position, _char in enumerate("abcdefghijklmnopqrstuvwxyz0123456789"):
+    _SYMBOLS[ord(_char)] = _position + 1
+
+class SearchIndex:
+    """Index inversé de trigrammes normalisés (minuscules, sans accents) vers les documents"""
+    
+    SEARCH_FIELDS = ("title", "url", "seo_title", "seo_description", "title_h1")  # Champs couverts par la recherche
+    BUILD_CHUNK = 4096  # Documents traités par bloc lors de la construction (au plus 2^14, blocs courts pour le thread de fond)
+    NORMALIZE_CHUNK = 1024  # Documents normalisés ensemble, en une seule chaîne
+    DELTA_MAX = 1000  # Documents ajoutés un par un avant leur regroupement dans un segment CSR
+    MERGE_MAX = 4000000  # Entrées au-delà desquelles deux segments ne sont plus fusionnés (durée d'une fusion bornée)
+    COMPACT_MIN = 50000  # Documents périmés avant compactage...
+    COMPACT_RATIO = 1.0  # ...et proportion minimale par rapport aux documents courants
+    
+    def __init__(self):
+        """Initialisation d'un index vide"""
+        self._keys = []  # Clé de chaque document (None = document périmé)
+        self._texts = []  # Texte normalisé de chaque document (None = document périmé)
+        self._doc_of = {}  # Clé -> numéro du document courant
+        # Segments CSR par numéros de documents croissants : (premier document, fin, offsets, postings),
+        # documents d'un trigramme : postings[offsets[code]:offsets[code + 1]]
+        self._segments = []
+        self._delta_start = 0  # Premier document non couvert par les segments
+        self._delta = {}  # Trigramme -> documents ajoutés un par un depuis _delta_start (numéros croissants)
+        self._compaction_end = 0  # Fin des documents en cours de compactage (aucune fusion de part et d'autre)
+    
+    @staticmethod
+    def normalize(text: Any) -> str:
+        """
+        Normalise un texte pour la recherche (décomposition, suppression des accents, minuscules)
+        
+        Args:
+            text: Texte à normaliser
+        
+        Returns:
+            Texte normalisé
+        """
+        if not text or not isinstance(text, str):
+            return ""
+        
+        # Texte ASCII : pas d'accents à supprimer
+        if text.isascii():
+            return text.lower()
+        
+        return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text)).casefold()
+    
+    @classmethod
+    def _document_text(cls, item: Dict[str, Any]) -> str:
+        """
+        Texte normalisé d'un élément
+        
+        Chaque champ est encadré par des limites : une recherche ne peut pas chevaucher deux champs
+        et chaque paire de caractères d'un champ appartient au moins à un trigramme.
+        """
+        return "\n" + "\n".join(cls.normalize(item.get(field, "")) for field in cls.SEARCH_FIELDS) + "\n"
+    
+    @classmethod
+    def _document_texts(cls, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Textes normalisés de plusieurs éléments, identiques à ceux de _document_text
+        
+        Les textes de NORMALIZE_CHUNK éléments sont réunis en une seule chaîne : une décomposition,
+        une suppression des accents et un passage en minuscules par bloc au lieu d'un par champ.
+        """
+        texts = []
+        
+        for start in range(0, len(items), cls.NORMALIZE_CHUNK):
+            chunk = items[start:start + cls.NORMALIZE_CHUNK]
+            text = "\0".join(
+                "\n" + "\n".join(value if isinstance(value, str) else "" for value in map(item.get, cls.SEARCH_FIELDS)) + "\n"
+                for item in chunk
+            )
+            
+            if text.isascii():
+                text = text.lower()
+            else:
+                # Marques combinantes retirées sur les points de code (plus rapide qu'une expression régulière)
+                codepoints = np.frombuffer(unicodedata.normalize("NFKD", text).encode("utf-32-le"), dtype=np.uint32)
+                text = codepoints[(codepoints < 0x300) | (codepoints > 0x36f)].tobytes().decode("utf-32-le").casefold()
+            
+            parts = text.split("\0")
+            if len(parts) != len(chunk):
+                # Caractère nul dans un champ : normalisation élément par élément
+                parts = [cls._document_text(item) for item in chunk]
+            texts.extend(parts)
+        
+        return texts
+    
+    @staticmethod
+    def _trigrams(text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Codes des trigrammes d'un texte (les trigrammes contenant un séparateur de documents sont exclus)
+        
+        Returns:
+            Tuple (codes, positions de début des trigrammes retenus)
+        """
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        if len(codepoints) < 3:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int64)
+        
+        # Caractères non ASCII regroupés sous le symbole "autre"
+        symbols = _SYMBOLS[np.minimum(codepoints, 128)]
+        first, second, third = symbols[:-2], symbols[1:-1], symbols[2:]
+        positions = np.flatnonzero((first != 0) & (second != 0) & (third != 0))
+        codes = (first * (_SYMBOL_COUNT * _SYMBOL_COUNT) + second * _SYMBOL_COUNT + third)[positions]
+        return codes, positions
+    
+    def build(self, records: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> None:
+        """
+        Reconstruit l'index complet
+        
+        Les numéros de documents suivent l'ordre des enregistrements, les résultats de recherche aussi.
+        
+        Args:
+            records: Couples (clé, élément) dans l'ordre d'affichage
+        """
+        self.__init__()
+        self.add_many(records)
+    
+    @classmethod
+    def _segment(cls, first: int, texts: List[Optional[str]]) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """
+        Construit le segment CSR de documents consécutifs (traitement vectorisé par blocs)
+        
+        Args:
+            first: Numéro du premier document
+            texts: Textes normalisés des documents (None = document périmé, non indexé)
+        
+        Returns:
+            Segment (premier document, fin, offsets, postings)
+        """
+        chunks = []
+        
+        for start in range(0, len(texts), cls.BUILD_CHUNK):
+            chunk = [text or "" for text in texts[start:start + cls.BUILD_CHUNK]]
+            # Documents séparés par un caractère nul, exclu des trigrammes comme les fins de champ
+            codes, positions = cls._trigrams("\0".join(chunk) + "\0")
+            lengths = np.fromiter((len(text) + 1 for text in chunk), dtype=np.int64, count=len(chunk))
+            documents = np.repeat(np.arange(len(chunk), dtype=np.uint32), lengths)[positions]
+            
+            # Tri par (trigramme, document) et suppression des doublons dans un même document
+            # (trigramme sur 16 bits, document du bloc sur 14 bits)
+            pairs = np.sort((codes << 14) | documents)
+            if len(pairs):
+                pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+            chunks.append(((pairs >> 14).astype(np.intp), (pairs & 0x3FFF).astype(np.int32) + (first + start)))
+        
+        offsets, postings = cls._assemble(chunks)
+        return first, first + len(texts), offsets, postings
+    
+    @staticmethod
+    def _assemble(chunks: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assemble des blocs (trigrammes, documents) en listes CSR, sans tri global
+        
+        Args:
+            chunks: Blocs triés par trigramme puis par document, dans l'ordre croissant des documents
+        
+        Returns:
+            Tuple (offsets, postings)
+        """
+        counts = np.zeros(_SYMBOL_COUNT ** 3, dtype=np.int64)
+        for codes, _ in chunks:
+            counts += np.bincount(codes, minlength=_SYMBOL_COUNT ** 3)
+        
+        offsets = np.zeros(_SYMBOL_COUNT ** 3 + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        postings = np.empty(int(offsets[-1]), dtype=np.int32)
+        written = offsets[:-1].copy()
+        
+        for codes, documents in chunks:
+            chunk_counts = np.bincount(codes, minlength=_SYMBOL_COUNT ** 3)
+            chunk_starts = np.cumsum(chunk_counts) - chunk_counts
+            destinations = written[codes] + (np.arange(len(codes)) - chunk_starts[codes])
+            postings[destinations] = documents
+            written += chunk_counts
+        
+        return offsets, postings
+    
+    def _push_segment(self, segment: Tuple[int, int, np.ndarray, np.ndarray]) -> None:
+        """
+        Ajoute un segment, puis fusionne les derniers segments de tailles comparables
+        
+        Un segment n'est fusionné qu'avec un segment au plus aussi grand, et jamais au-delà de MERGE_MAX
+        entrées : le nombre de segments reste faible et la durée d'une fusion reste bornée.
+        """
+        self._segments.append(segment)
+        
+        while len(self._segments) >= 2:
+            previous, last = self._segments[-2], self._segments[-1]
+            if len(previous[3]) > len(last[3]) or len(previous[3]) + len(last[3]) > self.MERGE_MAX:
+                break
+            if previous[0] < self._compaction_end <= last[0]:
+                break
+            self._segments[-2:] = [self._merge_segments(previous, last)]
+    
+    @staticmethod
+    def _merge_segments(previous: Tuple[int, int, np.ndarray, np.ndarray],
+                        last: Tuple[int, int, np.ndarray, np.ndarray]) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """Fusionne deux segments consécutifs (listes concaténées trigramme par trigramme, sans tri)"""
+        _, _, previous_offsets, previous_postings = previous
+        _, _, last_offsets, last_postings = last
+        
+        # Une entrée est précédée des entrées de son segment et de celles de l'autre segment pour les
+        # trigrammes inférieurs (et, pour le second segment, pour son propre trigramme)
+        postings = np.empty(len(previous_postings) + len(last_postings), dtype=np.int32)
+        postings[np.arange(len(previous_postings)) + np.repeat(last_offsets[:-1], np.diff(previous_offsets))] = previous_postings
+        postings[np.arange(len(last_postings)) + np.repeat(previous_offsets[1:], np.diff(last_offsets))] = last_postings
+        return previous[0], last[1], previous_offsets + last_offsets, postings
+    
+    def _flush_delta(self) -> None:
+        """Regroupe les documents ajoutés un par un dans un segment CSR"""
+        if self._delta_start < len(self._keys):
+            self._push_segment(self._segment(self._delta_start, self._texts[self._delta_start:]))
+        self._delta_start = len(self._keys)
+        self._delta = {}
+    
+    def add(self, key: Hashable, item: Dict[str, Any]) -> None:
+        """
+        Indexe un élément ajouté ou modifié
+        
+        L'élément reçoit un nouveau numéro de document ; l'ancien devient périmé et n'est plus
+        retourné grâce à la vérification finale.
+        
+        Args:
+            key: Clé de l'élément
+            item: Élément
+        """
+        self.remove(key)
+        
+        doc = len(self._keys)
+        text = self._document_text(item)
+        self._keys.append(key)
+        self._texts.append(text)
+        self._doc_of[key] = doc
+        
+        for code in set(self._trigrams(text)[0].tolist()):
+            self._delta.setdefault(code, []).append(doc)
+        
+        # Regroupement quand les ajouts un par un deviennent nombreux
+        if len(self._keys) - self._delta_start > self.DELTA_MAX:
+            self._flush_delta()
+    
+    @classmethod
+    def prepare(cls, records: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> Tuple[List[Hashable], List[str], Tuple[int, int, np.ndarray, np.ndarray]]:
+        """
+        Prépare l'indexation d'un lot d'éléments (normalisation et segment CSR vectorisés)
+        
+        Aucun index n'est modifié : la préparation peut avoir lieu dans un autre thread, le lot étant
+        ensuite rattaché par attach.
+        
+        Args:
+            records: Couples (clé, élément)
+        
+        Returns:
+            Lot préparé (clés, textes normalisés, segment numéroté à partir de 0)
+        """
+        records = list(records)
+        keys = [key for key, _ in records]
+        texts = cls._document_texts([item for _, item in records])
+        return keys, texts, cls._segment(0, texts)
+    
+    def attach(self, prepared: Tuple[List[Hashable], List[str], Tuple[int, int, np.ndarray, np.ndarray]]) -> None:
+        """
+        Rattache un lot préparé : ses éléments remplacent leurs versions précédentes
+        
+        Args:
+            prepared: Lot retourné par prepare
+        """
+        keys, texts, (_, count, offsets, postings) = prepared
+        if not keys:
+            return
+        
+        # Documents ajoutés un par un placés avant le nouveau segment (numéros croissants)
+        self._flush_delta()
+        first = len(self._keys)
+        for key, text in zip(keys, texts):
+            self.remove(key)
+            self._doc_of[key] = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+        
+        self._push_segment((first, first + count, offsets, postings + first))
+        self._delta_start = len(self._keys)
+    
+    def add_many(self, records: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> None:
+        """
+        Indexe des éléments ajoutés ou modifiés en bloc
+        
+        Le coût est proportionnel au nombre d'éléments ajoutés, pas à la taille de l'index.
+        
+        Args:
+            records: Couples (clé, élément)
+        """
+        self.attach(self.prepare(records))
+    
+    def remove(self, key: Hashable) -> None:
+        """
+        Retire un élément de l'index
+        
+        Args:
+            key: Clé de l'élément
+        """
+        doc = self._doc_of.pop(key, None)
+        if doc is not None:
+            self._keys[doc] = None
+            self._texts[doc] = None
+    
+    def needs_compaction(self) -> bool:
+        """Indique si les documents périmés justifient un compactage"""
+        stale = len(self._keys) - len(self._doc_of)
+        return stale > max(self.COMPACT_MIN, self.COMPACT_RATIO * len(self._doc_of))
+    
+    def compaction_texts(self) -> List[Optional[str]]:
+        """
+        Textes des documents à compacter (copie), après regroupement des ajouts un par un
+        
+        Returns:
+            Textes de tous les documents actuels (None = document périmé)
+        """
+        self._flush_delta()
+        self._compaction_end = len(self._texts)
+        return list(self._texts)
+    
+    @classmethod
+    def prepare_compaction(cls, texts: List[Optional[str]]) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """
+        Construit le segment unique des documents à compacter, sans les documents périmés
+        
+        Aucun index n'est modifié : la construction peut avoir lieu dans un autre thread.
+        
+        Args:
+            texts: Textes retournés par compaction_texts
+        
+        Returns:
+            Segment couvrant les mêmes numéros de documents
+        """
+        return cls._segment(0, texts)
+    
+    def attach_compaction(self, segment: Tuple[int, int, np.ndarray, np.ndarray]) -> None:
+        """
+        Remplace les segments couverts par un segment compacté
+        
+        Les numéros de documents sont conservés : les documents ajoutés ou retirés depuis
+        compaction_texts restent valides (segments suivants, vérification finale).
+        
+        Args:
+            segment: Segment retourné par prepare_compaction
+        """
+        end = segment[1]
+        self._segments = [segment] + [other for other in self._segments if other[0] >= end]
+        self._compaction_end = 0
+    
+    def matches(self, key: Hashable, query: str) -> bool:
+        """
+        Vérifie si un élément indexé contient la recherche
+        
+        Args:
+            key: Clé de l'élément
+            query: Texte recherché
+        
+        Returns:
+            True si le texte normalisé de l'élément contient la recherche normalisée
+        """
+        doc = self._doc_of.get(key)
+        return doc is not None and self.normalize(query) in self._texts[doc]
+    
+    def contains(self, item: Dict[str, Any], query: str) -> bool:
+        """
+        Vérifie si un élément, indexé ou non, contient la recherche (comparaison directe)
+        
+        Args:
+            item: Élément
+            query: Texte recherché
+        
+        Returns:
+            True si le texte normalisé de l'élément contient la recherche normalisée
+        """
+        return self.normalize(query) in self._document_text(item)
+    
+    def _documents(self, code: int) -> np.ndarray:
+        """Documents contenant un trigramme (segments puis ajouts un par un, numéros croissants)"""
+        parts = [postings[offsets[code]:offsets[code + 1]] for _, _, offsets, postings in self._segments]
+        delta = self._delta.get(code)
+        if delta:
+            parts.append(np.asarray(delta, dtype=np.int32))
+        
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int32)
+    
+    def search(self, query: str) -> List[Hashable]:
+        """
+        Recherche les éléments contenant un texte (sans tenir compte de la casse ni des accents)
+        
+        Args:
+            query: Texte recherché
+        
+        Returns:
+            Clés des éléments trouvés, dans l'ordre des numéros de documents
+        """
+        query = self.normalize(query)
+        
+        if len(query) >= 3:
+            # Intersection des listes de chaque trigramme, en partant de la plus courte
+            lists = sorted((self._documents(code) for code in set(self._trigrams(query)[0].tolist())), key=len)
+            candidates = lists[0]
+            for documents in lists[1:]:
+                if not len(candidates) or not len(documents):
+                    candidates = candidates[:0]
+                    break
+                positions = np.minimum(np.searchsorted(documents, candidates), len(documents) - 1)
+                candidates = candidates[documents[positions] == candidates]
+        
+        elif len(query) == 2:
+            # Union des trigrammes se terminant par les deux caractères (précédés d'un caractère ou d'une limite)
+            second, third = (int(_SYMBOLS[min(ord(char), 128)]) for char in query)
+            candidates = np.sort(np.concatenate([
+                self._documents(first * _SYMBOL_COUNT * _SYMBOL_COUNT + second * _SYMBOL_COUNT + third)
+                for first in range(1, _SYMBOL_COUNT)
+            ]))
+            if len(candidates):
+                candidates = candidates[np.concatenate(([True], candidates[1:] != candidates[:-1]))]
+        
+        else:
+            # Un seul caractère : vérification directe de chaque document
+            return [key for key, text in zip(self._keys, self._texts) if key is not None and query in text]
+        
+        keys = self._keys
+        texts = self._texts
+        
+        # Un seul trigramme de lettres et chiffres : la liste est exacte, seuls les documents périmés sont écartés
+        if len(query) == 3 and query.isascii() and query.isalnum():
+            return [keys[doc] for doc in candidates.tolist() if keys[doc] is not None]
+        
+        # Vérification finale (alphabet réduit des trigrammes, documents périmés)
+        return [keys[doc] for doc in candidates.tolist() if keys[doc] is not None and query in texts[doc]]
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Stockage SQLite de la session
+Une ligne par élément (indexée par type, état modifié et sélection), l'état des filtres et les
+métadonnées de la session. Les modifications sont ajoutées à un journal, replié périodiquement
+dans les tables en arrière-plan et rejoué au chargement après un arrêt brutal.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+# Schéma de la base de session
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    modified INTEGER NOT NULL DEFAULT 0,
+    selected INTEGER NOT NULL DEFAULT 0,
+    record TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS idx_records_type ON records (type);
+CREATE INDEX IF NOT EXISTS idx_records_modified ON records (modified);
+CREATE INDEX IF NOT EXISTS idx_records_selected ON records (selected);
+CREATE INDEX IF NOT EXISTS idx_records_position ON records (position);
+CREATE TABLE IF NOT EXISTS filters (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+class SessionStore:
+    """Session persistée dans une base SQLite"""
+    
+    VERSION = "2.0"  # Version du format de session (1.0 = fichier JSON unique)
+    
+    # Champs calculés, non persistés (recalculés à la restauration)
+    DERIVED_FIELDS = ("seo_quality",)
+    
+    COMPACT_INTERVAL = 30  # Secondes entre deux compactages du journal en arrière-plan
+    COMPACT_MIN_ENTRIES = 1  # Entrées de journal minimales pour déclencher un compactage
+    BUSY_TIMEOUT = 10  # Attente maximale (secondes) d'un verrou d'écriture détenu par l'autre connexion
+    MMAP_SIZE = 256 * 1024 * 1024  # Taille maximale de la base projetée en mémoire (PRAGMA mmap_size)
+    LOAD_CHUNK = 10000  # Éléments lus par requête lors d'un chargement complet
+    
+    def __init__(self, path: str, logger: logging.Logger = None):
+        """
+        Initialisation du stockage
+        
+        Args:
+            path: Chemin de la base SQLite
+            logger: Logger
+        """
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._connection = None
+        self._lock = threading.Lock()  # Accès depuis l'interface et depuis les threads de mise à jour
+        self._compact_lock = threading.Lock()  # Un seul compactage à la fois
+        self._compaction_stop = None  # Événement d'arrêt du thread de compactage (None = arrêté)
+    
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une connexion à la base (création du schéma si nécessaire)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, check_same_thread=False)
+        # Mode WAL : ajouts au journal sans réécriture de la base, lectures pendant le compactage
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # Lectures par projection du fichier en mémoire plutôt que par copies dans le cache de pages
+        connection.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        connection.executescript(_SCHEMA)
+        return connection
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Retourne la connexion principale (ouverte au premier accès)"""
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+    
+    def close(self) -> None:
+        """Arrête le compactage en arrière-plan et ferme la base"""
+        self.stop_compaction()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def has_session(self) -> bool:
+        """
+        Vérifie si la base contient une session
+        
+        Returns:
+            True si au moins un élément est enregistré
+        """
+        if not os.path.exists(self.path):
+            return False
+        
+        with self._lock:
+            return self._connect().execute("SELECT 1 FROM records LIMIT 1").fetchone() is not None
+    
+    def _encode(self, item: Dict[str, Any]) -> str:
+        """Sérialise un élément sans ses champs calculés"""
+        return json.dumps(self._strip(item), ensure_ascii=False, separators=(",", ":"))
+    
+    def save_all(self, data: Dict[str, List[Dict[str, Any]]], modified_items: Iterable[int],
+                 selected_items: Iterable[int], filter_criteria: Dict[str, Any]) -> int:
+        """
+        Remplace la session complète (une seule transaction)
+        
+        Args:
+            data: Éléments par type de contenu
+            modified_items: IDs des éléments modifiés
+            selected_items: IDs des éléments sélectionnés
+            filter_criteria: Critères de filtrage
+        
+        Returns:
+            Nombre d'éléments enregistrés
+        """
+        modified_items = set(modified_items)
+        selected_items = set(selected_items)
+        
+        rows = (
+            (content_type, item["id"], position, item["id"] in modified_items, item["id"] in selected_items, self._encode(item))
+            for position, (content_type, item) in enumerate(
+                (content_type, item) for content_type, items in data.items() for item in items
+            )
+        )
+        
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                # L'instantané remplace les tables et le journal
+                connection.execute("DELETE FROM records")
+                connection.execute("DELETE FROM journal")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO records (type, id, position, modified, selected, record) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._write_filters(connection, filter_criteria)
+                total_items = sum(len(items) for items in data.values())
+                self._write_metadata(connection, {
+                    "timestamp": datetime.now().isoformat(),
+                    "version": self.VERSION,
+                    "total_items": total_items,
+                    "content_types": list(data.keys())
+                })
+        
+        return total_items
+    
+    def _append(self, operation: str, payload: Any) -> None:
+        """
+        Ajoute une entrée au journal (une insertion, sans modification des tables de la session)
+        
+        Args:
+            operation: Opération (upsert, select, clear_selected, delete, delete_many, filters)
+            payload: Données de l'opération, sérialisées en JSON
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT INTO journal (operation, payload) VALUES (?, ?)",
+                    (operation, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+                )
+    
+    def _strip(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Retourne un élément sans ses champs calculés"""
+        return {key: value for key, value in item.items() if key not in self.DERIVED_FIELDS}
+    
+    def upsert_record(self, content_type: str, item: Dict[str, Any], modified: bool, selected: bool) -> None:
+        """
+        Journalise l'écriture d'un élément (insertion en fin de session ou remplacement à sa position)
+        
+        Args:
+            content_type: Type de contenu
+            item: Élément
+            modified: Élément modifié
+            selected: Élément sélectionné
+        """
+        self._append("upsert", [[content_type, item["id"], modified, selected, self._strip(item)]])
+    
+    def upsert_records(self, records: Iterable[Tuple[str, Dict[str, Any], bool, bool]]) -> None:
+        """
+        Journalise l'écriture de plusieurs éléments en une seule entrée (importation)
+        
+        Args:
+            records: Tuples (type de contenu, élément, modifié, sélectionné)
+        """
+        payload = [[content_type, item["id"], modified, selected, self._strip(item)]
+                   for content_type, item, modified, selected in records]
+        if payload:
+            self._append("upsert", payload)
+    
+    def set_selected(self, keys: Iterable[Tuple[str, int]], selected: bool) -> None:
+        """
+        Journalise l'état de sélection d'éléments
+        
+        Args:
+            keys: Couples (type, id)
+            selected: Nouvel état de sélection
+        """
+        self._append("select", [selected, [list(key) for key in keys]])
+    
+    def clear_selected(self) -> None:
+        """Journalise la désélection de tous les éléments"""
+        self._append("clear_selected", None)
+    
+    def delete_record(self, content_type: str, item_id: int) -> None:
+        """
+        Journalise la suppression d'un élément
+        
+        Args:
+            content_type: Type de contenu
+            item_id: ID de l'élément
+        """
+        self._append("delete", [content_type, item_id])
+    
+    def delete_records(self, keys: Iterable[Tuple[str, int]]) -> None:
+        """
+        Journalise la suppression de plusieurs éléments en une seule entrée (annulation d'une importation)
+        
+        Args:
+            keys: Couples (type, id)
+        """
+        payload = [list(key) for key in keys]
+        if payload:
+            self._append("delete_many", payload)
+    
+    def save_filters(self, filter_criteria: Dict[str, Any]) -> None:
+        """
+        Journalise les critères de filtrage
+        
+        Args:
+            filter_criteria: Critères de filtrage
+        """
+        self._append("filters", filter_criteria)
+    
+    def _apply(self, connection: sqlite3.Connection, operation: str, payload: Any) -> None:
+        """Applique une entrée du journal aux tables de la session (dans la transaction en cours)"""
+        if operation == "upsert":
+            connection.executemany(
+                "INSERT INTO records (type, id, position, modified, selected, record) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM records), ?, ?, ?) "
+                "ON CONFLICT (type, id) DO UPDATE SET modified = excluded.modified, "
+                "selected = excluded.selected, record = excluded.record",
+                ((content_type, item_id, modified, selected, json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+                 for content_type, item_id, modified, selected, item in payload)
+            )
+        elif operation == "select":
+            selected, keys = payload
+            connection.executemany(
+                "UPDATE records SET selected = ? WHERE type = ? AND id = ?",
+                ((selected, content_type, item_id) for content_type, item_id in keys)
+            )
+        elif operation == "clear_selected":
+            connection.execute("UPDATE records SET selected = 0 WHERE selected = 1")
+        elif operation == "delete":
+            connection.execute("DELETE FROM records WHERE type = ? AND id = ?", payload)
+        elif operation == "delete_many":
+            connection.executemany("DELETE FROM records WHERE type = ? AND id = ?", payload)
+        elif operation == "filters":
+            self._write_filters(connection, payload)
+        else:
+            self.logger.warning(f"Opération de journal inconnue ignorée: {operation}")
+    
+    def journal_size(self) -> int:
+        """Retourne le nombre d'entrées du journal non encore compactées"""
+        if not os.path.exists(self.path):
+            return 0
+        
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+    
+    def compact(self, connection: sqlite3.Connection = None) -> int:
+        """
+        Replie le journal dans les tables de la session (compactage ou rejeu après un arrêt brutal)
+        
+        Args:
+            connection: Connexion à utiliser (connexion principale par défaut)
+        
+        Returns:
+            Nombre d'entrées repliées
+        """
+        with self._compact_lock:
+            if connection is None:
+                with self._lock:
+                    return self._compact(self._connect())
+            return self._compact(connection)
+    
+    def _compact(self, connection: sqlite3.Connection) -> int:
+        """Replie le journal dans une transaction d'écriture (les ajouts concurrents attendent sa fin)"""
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            entries = connection.execute("SELECT seq, operation, payload FROM journal ORDER BY seq").fetchall()
+            for _, operation, payload in entries:
+                self._apply(connection, operation, json.loads(payload))
+            if entries:
+                connection.execute("DELETE FROM journal WHERE seq <= ?", (entries[-1][0],))
+                self._write_metadata(connection, {"timestamp": datetime.now().isoformat()})
+        return len(entries)
+    
+    def start_compaction(self) -> None:
+        """Démarre le compactage périodique du journal dans un thread, sur sa propre connexion"""
+        if self._compaction_stop is not None:
+            return
+        
+        self._compaction_stop = threading.Event()
+        thread = threading.Thread(target=self._compaction_thread, args=(self._compaction_stop,))
+        thread.daemon = True
+        thread.start()
+    
+    def stop_compaction(self) -> None:
+        """Arrête le compactage périodique du journal"""
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+            self._compaction_stop = None
+    
+    def _compaction_thread(self, stop: threading.Event) -> None:
+        """Thread de compactage périodique du journal"""
+        connection = None
+        try:
+            while not stop.wait(self.COMPACT_INTERVAL):
+                try:
+                    if connection is None:
+                        connection = self._open()
+                    if connection.execute("SELECT COUNT(*) FROM journal").fetchone()[0] >= self.COMPACT_MIN_ENTRIES:
+                        count = self.compact(connection)
+                        self.logger.debug(f"Journal de session compacté: {count} entrées")
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du compactage du journal de session: {str(e)}")
+        finally:
+            if connection is not None:
+                connection.close()
+    
+    @staticmethod
+    def _write_filters(connection: sqlite3.Connection, filter_criteria: Dict[str, Any]) -> None:
+        """Remplace les critères de filtrage (dans la transaction en cours)"""
+        connection.execute("DELETE FROM filters")
+        connection.executemany(
+            "INSERT INTO filters (key, value) VALUES (?, ?)",
+            ((key, json.dumps(value, ensure_ascii=False)) for key, value in (filter_criteria or {}).items())
+        )
+    
+    @staticmethod
+    def _write_metadata(connection: sqlite3.Connection, metadata: Dict[str, Any]) -> None:
+        """Remplace les métadonnées de la session (dans la transaction en cours)"""
+        connection.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            ((key, json.dumps(value, ensure_ascii=False)) for key, value in metadata.items())
+        )
+    
+    def load_state(self) -> Optional[Tuple[int, set, set, Dict[str, Any]]]:
+        """
+        Charge l'état de la session sans ses éléments (lectures par les index)
+        
+        Le journal est d'abord replié dans les tables.
+        
+        Returns:
+            Tuple (nombre d'éléments, IDs modifiés, IDs sélectionnés, critères de filtrage),
+            ou None si la base ne contient aucune session
+        """
+        if not os.path.exists(self.path):
+            return None
+        
+        # Rejeu des modifications journalisées depuis le dernier compactage
+        replayed = self.compact()
+        if replayed:
+            self.logger.info(f"Journal de session rejoué: {replayed} entrées")
+        
+        with self._lock:
+            connection = self._connect()
+            total = connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            if not total:
+                return None
+            
+            modified_items = {item_id for (item_id,) in connection.execute("SELECT id FROM records WHERE modified = 1")}
+            selected_items = {item_id for (item_id,) in connection.execute("SELECT id FROM records WHERE selected = 1")}
+            filter_criteria = {key: json.loads(value) for key, value in connection.execute("SELECT key, value FROM filters")}
+        
+        return total, modified_items, selected_items, filter_criteria
+    
+    def load_chunk(self, after_position: int, limit: int) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        """
+        Charge les éléments qui suivent une position d'enregistrement (parcours par l'index des positions)
+        
+        Args:
+            after_position: Dernière position déjà chargée (-1 au début)
+            limit: Nombre maximal d'éléments
+        
+        Returns:
+            Tuple (couples (type, élément) dans l'ordre d'enregistrement, dernière position chargée)
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT type, position, record FROM records WHERE position > ? ORDER BY position LIMIT ?",
+                (after_position, limit)
+            ).fetchall()
+        
+        if not rows:
+            return [], after_position
+        return [(content_type, json.loads(record)) for content_type, _, record in rows], rows[-1][1]
+    
+    def load(self) -> Optional[Tuple[Dict[str, List[Dict[str, Any]]], set, set, Dict[str, Any]]]:
+        """
+        Charge la session complète
+        
+        Returns:
+            Tuple (éléments par type dans l'ordre d'enregistrement, IDs modifiés, IDs sélectionnés,
+            critères de filtrage), ou None si la base ne contient aucune session
+        """
+        state = self.load_state()
+        if state is None:
+            return None
+        
+        _, modified_items, selected_items, filter_criteria = state
+        data = {}
+        position = -1
+        
+        while True:
+            records, position = self.load_chunk(position, self.LOAD_CHUNK)
+            if not records:
+                break
+            for content_type, item in records:
+                data.setdefault(content_type, []).append(item)
+        
+        return data, modified_items, selected_items, filter_criteria
+    
+    def migrate_json(self, json_file: str) -> bool:
+        """
+        Importe une session au format JSON (version 1.0) ; le fichier JSON est conservé
+        
+        Args:
+            json_file: Chemin du fichier session_data.json
+        
+        Returns:
+            Succès de la migration
+        """
+        try:
+            with open(json_file, "r", encoding="utf-8-sig") as f:
+                session_data = json.load(f)
+            
+            if "data" not in session_data:
+                self.logger.error("Structure de session invalide: clé 'data' manquante")
+                return False
+            
+            total_items = self.save_all(
+                session_data["data"],
+                (int(item_id) for item_id in session_data.get("modified_items", [])),
+                (int(item_id) for item_id in session_data.get("selected_items", [])),
+                session_data.get("filter_criteria", {})
+            )
+            self.logger.info(f"Session JSON migrée vers SQLite: {total_items} éléments depuis {json_file}")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la migration de la session JSON: {str(e)}")
+            return False
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de comparaison des backends MySQL du connecteur direct
+Ce script écrit le même fichier CSV avec le pilote bloquant (mysql.connector) puis avec
+le backend asynchrone (aiomysql), et compare les durées et les débits obtenus.
+Les deux passes écrivent autant de lots simultanés (workers du pool bloquant, lots
+concurrents du backend asynchrone) et les mêmes valeurs : la seconde est donc idempotente.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+
+# Ajout du répertoire courant au chemin de recherche des modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import des modules nécessaires
+from wp_meta_direct_update import WordPressDirectConnector, import_from_csv
+from wp_meta_async_update import AsyncWordPressDirectConnector, AIOMYSQL_AVAILABLE
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger("test_async_direct_update")
+
+def run_blocking(connector: WordPressDirectConnector, items, commit_size: int, workers: int):
+    """
+    Exécute la mise à jour avec le pilote bloquant
+    
+    Args:
+        connector: Connecteur configuré
+        items: Articles à mettre à jour
+        commit_size: Nombre d'articles par lot
+        workers: Nombre de workers parallèles (une connexion du pool chacun)
+    
+    Returns:
+        Tuple (statistiques, durée en secondes)
+    """
+    if not connector.connect():
+        raise ConnectionError("Impossible de se connecter à la base de données MySQL")
+    
+    try:
+        start_time = time.perf_counter()
+        stats = connector.bulk_update_metadata(items, commit_size=commit_size, workers=workers)
+        return stats, time.perf_counter() - start_time
+    finally:
+        connector.disconnect()
+
+async def run_async(connector: WordPressDirectConnector, items, commit_size: int, concurrency: int):
+    """
+    Exécute la mise à jour avec le backend asynchrone
+    
+    Returns:
+        Tuple (statistiques, durée en secondes)
+    """
+    async_connector = AsyncWordPressDirectConnector(connector, logger)
+    async_connector.concurrency = concurrency
+    
+    try:
+        await async_connector.open()
+        start_time = time.perf_counter()
+        stats = await async_connector.bulk_update_metadata(items, commit_size=commit_size)
+        return stats, time.perf_counter() - start_time
+    finally:
+        await async_connector.close()
+
+def print_result(label: str, stats, duration: float) -> None:
+    """Affiche le résultat d'une passe"""
+    rate = stats["total"] / duration if duration > 0 else 0
+    print(f"{label:<10} {duration:8.2f}s  {rate:10.0f} éléments/s  ({stats['success']} réussis, {stats['failed']} échoués)")
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Comparaison des backends MySQL bloquant et asynchrone")
+    parser.add_argument("--host", required=True, help="Hôte de la base de données MySQL")
+    parser.add_argument("--user", required=True, help="Nom d'utilisateur MySQL")
+    parser.add_argument("--password", required=True, help="Mot de passe MySQL")
+    parser.add_argument("--database", required=True, help="Nom de la base de données WordPress")
+    parser.add_argument("--prefix", default="wp_", help="Préfixe des tables WordPress (par défaut: wp_)")
+    parser.add_argument("--input", required=True, help="Chemin du fichier CSV d'entrée (séparateur détecté automatiquement)")
+    parser.add_argument("--commit-size", type=int, default=100, help="Nombre d'articles par lot (par défaut: 100)")
+    parser.add_argument("--concurrency", type=int, default=AsyncWordPressDirectConnector.CONCURRENCY, help="Lots simultanés des deux backends (workers du pilote bloquant)")
+    args = parser.parse_args()
+    
+    if not AIOMYSQL_AVAILABLE:
+        print("Le module aiomysql n'est pas installé: pip install aiomysql")
+        return
+    
+    items = import_from_csv(args.input)
+    if not items:
+        print("Aucun élément à mettre à jour")
+        return
+    
+    connector = WordPressDirectConnector(logger)
+    # Une connexion par worker, plus celle du thread appelant
+    connector.configure(args.host, args.user, args.password, args.database, args.prefix, args.concurrency + 1)
+    # Pas de limitation de débit pendant la mesure
+    connector.BATCH_DELAY_MS = 0
+    connector.MAX_ROWS_PER_SECOND = 0
+    
+    print(f"{len(items)} éléments, lots de {args.commit_size}, {args.concurrency} lots simultanés")
+    
+    stats, duration = run_blocking(connector, items, args.commit_size, args.concurrency)
+    print_result("bloquant", stats, duration)
+    
+    stats, duration = asyncio.run(run_async(connector, items, args.commit_size, args.concurrency))
+    print_result("asyncio", stats, duration)
+    
+    connector.close_pool()
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@
 Script de test pour l'importation CSV avec différents séparateurs
 """
 
+import os
 import logging
 import sys
+import tempfile
 from data_manager import DataManager
 
 # Configuration du logger
@@ -23,6 +25,8 @@ def main():
     """Fonction principale de test"""
     # Création du gestionnaire de données
     data_manager = DataManager(logger)
+    # Session temporaire pour ne pas écraser la session de l'application (data/session.db)
+    data_manager.session_file = os.path.join(tempfile.mkdtemp(), "session.db")
     
     # Initialisation avec des données fictives pour simuler une importation WordPress
     content_data = {
@@ -77,11 +81,41 @@ def main():
     success, message, count = data_manager.import_from_csv("import-test-comma.csv")
     logger.info(f"Résultat: {success}, {message}, {count} éléments importés")
     
+    # Test d'importation avec séparateurs dans des champs entre guillemets (dialecte détecté sur un échantillon)
+    logger.info("=== Test d'importation avec séparateurs entre guillemets ===")
+    quoted_file = os.path.join(tempfile.mkdtemp(), "import-test-quoted.csv")
+    with open(quoted_file, "w", encoding="utf-8-sig") as f:
+        f.write('id,type,seo_title,seo_description,"note; interne"\n')
+        f.write('1,post,"Titre; avec point-virgule","Description, avec; séparateurs",x\n')
+    success, message, count = data_manager.import_from_csv(quoted_file)
+    logger.info(f"Résultat: {success}, {message}, {count} éléments importés")
+    os.remove(quoted_file)
+
+    # Test d'importation d'un fichier français (apostrophes dans les textes, point-virgule entre guillemets)
+    logger.info("=== Test d'importation avec apostrophes et point-virgule entre guillemets ===")
+    french_file = os.path.join(tempfile.mkdtemp(), "import-test-apostrophes.csv")
+    with open(os.path.join("data", "meta-data-1min30.csv"), encoding="utf-8-sig") as source:
+        content = source.read()
+    with open(french_file, "w", encoding="utf-8-sig") as f:
+        f.write(content.rstrip("\n") + "\n")
+        f.write('1;post;"Titre; avec point-virgule";"Desc"\n')
+    success, message, count = data_manager.import_from_csv(french_file)
+    logger.info(f"Résultat: {success}, {message}, {count} éléments importés")
+    os.remove(french_file)
+    item = next(item for item in data_manager.data["post"] if str(item["id"]) == "1")
+    if item["seo_title"] != "Titre; avec point-virgule" or item["seo_description"] != "Desc":
+        logger.error(f"Champ entre guillemets mal découpé: {item['seo_title']!r}, {item['seo_description']!r}")
+        sys.exit(1)
+    logger.info("Champ entre guillemets correctement lu")
+
     # Affichage des données mises à jour
     logger.info("=== Données après importation ===")
     for content_type, items in data_manager.data.items():
         for item in items:
             logger.info(f"ID: {item['id']}, Type: {item['type']}, Titre: {item['title']}, Titre SEO: {item['seo_title']}, Description SEO: {item['seo_description']}")
+    
+    # Fermeture de la session temporaire
+    data_manager._session_store().close()
 
 if __name__ == "__main__":
     main()
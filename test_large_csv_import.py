@@ -9,8 +9,10 @@ import os
 import sys
 import logging
 import time
+import tempfile
 import pandas as pd
 from data_manager import DataManager
+from csv_import import CSVChunkReader
 
 # Configuration du logger
 logging.basicConfig(
@@ -83,8 +85,9 @@ def test_import_performance(csv_file, separator=","):
     """
     logger.info(f"Test d'importation du fichier {csv_file}...")
     
-    # Création du gestionnaire de données
+    # Création du gestionnaire de données (session temporaire)
     data_manager = DataManager(logger)
+    data_manager.session_file = os.path.join(tempfile.mkdtemp(), "session.db")
     
     # Initialisation avec des données fictives pour simuler une importation WordPress
     content_data = {
@@ -141,6 +144,284 @@ def test_import_performance(csv_file, separator=","):
     
     return success, count, elapsed_time
 
+# Seuils du banc d'essai de fusion
+MERGE_MAX_SECONDS_PER_100K = 1.0  # Durée maximale de la fusion pour 100 000 lignes CSV
+MERGE_MAX_SCALING_RATIO = 3.0  # Rapport de durée maximal quand la taille double (4 = quadratique)
+UNDO_MAX_SECONDS_PER_100K = 2.5  # Durée maximale de l'annulation d'une fusion de 100 000 lignes CSV (journal de session compris)
+SEARCH_MAX_MS = 16  # Durée maximale d'une frappe dans la zone de recherche (une image à 60 Hz)
+
+def create_session(size, wait_search=True):
+    """
+    Crée un gestionnaire de données avec une session temporaire de size éléments
+    
+    Args:
+        size: Nombre d'éléments de la session
+        wait_search: Attendre la construction de l'index de recherche (thread de fond)
+    """
+    data_manager = DataManager(logger)
+    # Session temporaire pour ne pas écraser ni interroger la session de l'application
+    data_manager.session_file = os.path.join(tempfile.mkdtemp(), "session.db")
+    
+    content_data = {"post": [], "page": []}
+    for i in range(1, size + 1):
+        content_data["post" if i % 2 == 0 else "page"].append({
+            "id": i,
+            "title": f"Original Title {i}",
+            "link": f"https://example.com/test-{i}",
+            "modified": "2025-03-24T12:00:00",
+            "seo_title": f"Original Title {i}",
+            "seo_description": ""
+        })
+    data_manager.import_from_wp(content_data)
+    # Index de recherche construit en arrière-plan : attendu pour mesurer les opérations seules
+    if wait_search:
+        data_manager.wait_search_index()
+    return data_manager
+
+def generate_merge_frame(size, new_rows=0):
+    """
+    Génère les lignes CSV d'une fusion : un élément sur deux modifié, puis new_rows nouveaux éléments
+    
+    Args:
+        size: Nombre d'éléments existants couverts par le CSV
+        new_rows: Nombre de nouveaux éléments
+    """
+    data = [{
+        "id": str(i),
+        "type": "post" if i % 2 == 0 else "page",
+        "title": f"Original Title {i}",
+        "url": f"https://example.com/test-{i}",
+        "seo_title": f"Updated SEO Title {i}" if i % 2 == 0 else f"Original Title {i}",
+        "seo_description": f"Updated SEO Description {i}" if i % 2 == 0 else ""
+    } for i in range(1, size + 1)]
+    data.extend({
+        "id": str(i),
+        "type": "post",
+        "title": f"New Title {i}",
+        "url": f"https://example.com/new-{i}",
+        "seo_title": f"New SEO Title {i}",
+        "seo_description": f"New SEO Description {i}"
+    } for i in range(size + 1, size + new_rows + 1))
+    return pd.DataFrame(data)
+
+def test_merge_benchmark(size=100000, new_rows=1000):
+    """
+    Banc d'essai de la fusion vectorisée d'un CSV dans une session de même taille
+    
+    Args:
+        size: Nombre d'éléments de la session et de lignes existantes du CSV
+        new_rows: Nombre de nouveaux éléments du CSV
+    
+    Returns:
+        True si la fusion respecte le seuil de durée et produit le résultat attendu
+    """
+    logger.info(f"=== Banc d'essai : fusion de {size + new_rows} lignes dans une session de {size} éléments ===")
+    data_manager = create_session(size)
+    df = generate_merge_frame(size, new_rows)
+    
+    start_time = time.perf_counter()
+    count, _ = data_manager.merge_csv_frame(df)
+    merge_time = time.perf_counter() - start_time
+    
+    # Importation complète (lecture, fusion, filtres, sauvegarde de la session) à partir du même contenu
+    csv_file = os.path.join(os.path.dirname(data_manager.session_file), "merge_benchmark.csv")
+    df.assign(seo_title=df["seo_title"] + " v2").to_csv(csv_file, index=False, encoding="utf-8-sig")
+    start_time = time.perf_counter()
+    success, message, _ = data_manager.import_from_csv(csv_file, ",")
+    import_time = time.perf_counter() - start_time
+    os.remove(csv_file)
+    
+    threshold = MERGE_MAX_SECONDS_PER_100K * (size + new_rows) / 100000
+    passed = (merge_time <= threshold and success and count == size + new_rows
+              and data_manager.get_item_count() == size + new_rows
+              and data_manager.get_item(2, "post")["seo_title"] == "Updated SEO Title 2 v2")
+    
+    logger.info(f"Fusion: {merge_time:.3f}s (seuil {threshold:.2f}s), {count} éléments, {len(data_manager.modified_items)} modifiés")
+    logger.info(f"Importation complète: {import_time:.3f}s ({message})")
+    logger.info(f"Banc d'essai de fusion: {'OK' if passed else 'ÉCHEC'}")
+    return passed
+
+def test_merge_scaling(sizes=(10000, 20000, 40000)):
+    """
+    Vérifie que la durée de fusion croît linéairement avec la taille
+    
+    Chaque ligne du CSV correspond à un élément existant : avec une recherche linéaire par ligne
+    la durée quadruple quand la taille double, avec la jointure sur (type, id) elle ne fait que doubler.
+    
+    Args:
+        sizes: Tailles de session (et de CSV) à comparer
+    
+    Returns:
+        True si aucun rapport de durée ne dépasse MERGE_MAX_SCALING_RATIO
+    """
+    logger.info("=== Mise à l'échelle de la fusion CSV ===")
+    previous = None
+    passed = True
+    
+    for size in sizes:
+        data_manager = create_session(size)
+        df = generate_merge_frame(size)
+        
+        start_time = time.perf_counter()
+        data_manager.merge_csv_frame(df)
+        elapsed_time = time.perf_counter() - start_time
+        
+        ratio = elapsed_time / previous if previous else None
+        if ratio is not None and ratio > MERGE_MAX_SCALING_RATIO:
+            passed = False
+        
+        ratio_text = f", x{ratio:.2f} par rapport à la taille précédente" if ratio is not None else ""
+        logger.info(f"{size} éléments: {elapsed_time:.3f}s ({elapsed_time / size * 1e6:.1f} µs/ligne){ratio_text}")
+        previous = elapsed_time
+    
+    logger.info(f"Mise à l'échelle de la fusion: {'OK' if passed else 'ÉCHEC'}")
+    return passed
+
+def test_merge_undo(size=100000, new_rows=1000):
+    """
+    Vérifie l'annulation et le rétablissement d'une fusion CSV (entrée groupée de l'historique)
+    
+    Args:
+        size: Nombre d'éléments de la session et de lignes existantes du CSV (la moitié est modifiée)
+        new_rows: Nombre de nouveaux éléments du CSV
+    
+    Returns:
+        True si la session est retrouvée à l'identique dans les délais
+    """
+    logger.info(f"=== Annulation d'une fusion de {size + new_rows} lignes ===")
+    data_manager = create_session(size)
+    
+    def snapshot():
+        return ({key: (item["seo_title"], item["seo_description"]) for key, item in data_manager._index.items()},
+                set(data_manager.modified_items))
+    
+    before = snapshot()
+    data_manager.merge_csv_frame(generate_merge_frame(size, new_rows))
+    after = snapshot()
+    
+    # Indexation de la fusion pour la recherche (thread de fond) terminée avant la mesure
+    data_manager.wait_search_index()
+    
+    start_time = time.perf_counter()
+    undone = data_manager.restore_from_history()
+    undo_time = time.perf_counter() - start_time
+    undo_passed = undone and snapshot() == before
+    
+    start_time = time.perf_counter()
+    redone = data_manager.redo_from_history()
+    redo_time = time.perf_counter() - start_time
+    redo_passed = redone and snapshot() == after
+    
+    threshold = UNDO_MAX_SECONDS_PER_100K * (size + new_rows) / 100000
+    passed = undo_passed and redo_passed and undo_time <= threshold
+    
+    logger.info(f"Annulation: {undo_time:.3f}s (seuil {threshold:.2f}s, {'OK' if undo_passed else 'ÉCHEC'}), "
+                f"rétablissement: {redo_time:.3f}s ({'OK' if redo_passed else 'ÉCHEC'})")
+    return passed
+
+def test_chunked_import_undo(chunk_rows=2):
+    """
+    Vérifie l'annulation et le rétablissement d'une importation CSV lue en plusieurs blocs,
+    dont un nouvel élément ajouté par un bloc puis modifié par un bloc suivant
+    
+    Args:
+        chunk_rows: Lignes par bloc de lecture
+    
+    Returns:
+        True si la session est retrouvée à l'identique après l'annulation puis le rétablissement
+    """
+    logger.info(f"=== Annulation d'une importation CSV par blocs de {chunk_rows} lignes ===")
+    data_manager = create_session(10)
+    
+    def snapshot():
+        return ({key: (item["seo_title"], item["seo_description"]) for key, item in data_manager._index.items()},
+                set(data_manager.modified_items))
+    
+    csv_file = os.path.join(tempfile.mkdtemp(), "import-blocs.csv")
+    pd.DataFrame([
+        {"id": 2, "type": "post", "title": "Original Title 2", "url": "https://example.com/test-2", "seo_title": "Updated 2"},
+        {"id": 100, "type": "post", "title": "New Title 100", "url": "https://example.com/new-100", "seo_title": "A"},
+        {"id": 3, "type": "page", "title": "Original Title 3", "url": "https://example.com/test-3", "seo_title": "Updated 3"},
+        {"id": 100, "type": "post", "title": "New Title 100", "url": "https://example.com/new-100", "seo_title": "A2"}
+    ]).to_csv(csv_file, index=False, encoding="utf-8-sig")
+    
+    before = snapshot()
+    default_chunk_rows = CSVChunkReader.CHUNK_ROWS
+    CSVChunkReader.CHUNK_ROWS = chunk_rows
+    try:
+        success, message, count = data_manager.import_from_csv(csv_file)
+    finally:
+        CSVChunkReader.CHUNK_ROWS = default_chunk_rows
+        os.remove(csv_file)
+    after = snapshot()
+    
+    import_passed = success and data_manager.get_item(100, "post")["seo_title"] == "A2"
+    undo_passed = data_manager.restore_from_history() and snapshot() == before
+    redo_passed = data_manager.redo_from_history() and snapshot() == after
+    passed = import_passed and undo_passed and redo_passed
+    
+    logger.info(f"Importation: {'OK' if import_passed else 'ÉCHEC'}, annulation: {'OK' if undo_passed else 'ÉCHEC'}, "
+                f"rétablissement: {'OK' if redo_passed else 'ÉCHEC'}")
+    return passed
+
+def test_search_responsiveness(size=200000):
+    """
+    Mesure la durée d'une frappe dans la zone de recherche après une importation WordPress, une fusion
+    et une annulation volumineuses, et pendant une restauration progressive, puis vérifie les résultats
+    une fois l'indexation en arrière-plan terminée
+    
+    Args:
+        size: Nombre d'éléments de la session (et de lignes du CSV fusionné)
+    
+    Returns:
+        True si chaque frappe respecte SEARCH_MAX_MS et si les résultats finaux sont exacts
+    """
+    logger.info(f"=== Réactivité de la recherche avec {size} éléments ===")
+    data_manager = create_session(size, wait_search=False)
+    query = "updated seo title 1234"
+    
+    def keystroke(label):
+        start_time = time.perf_counter()
+        data_manager.set_filter_criteria({"search_text": query})
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(f"Frappe {label}: {elapsed_ms:.2f} ms")
+        return elapsed_ms <= SEARCH_MAX_MS
+    
+    def expected():
+        return sorted(item["id"] for item in data_manager._index.values()
+                      if query in " ".join(str(item.get(field, "")) for field in ("seo_title", "title")).lower())
+    
+    def results_exact(label):
+        data_manager.wait_search_index()
+        data_manager.set_filter_criteria({"search_text": query})
+        exact = sorted(item["id"] for item in data_manager.filtered_data) == expected()
+        logger.info(f"Résultats {label}: {len(data_manager.filtered_data)} ({'OK' if exact else 'ÉCHEC'})")
+        return exact
+    
+    passed = keystroke("après l'importation WordPress") and results_exact("après l'importation WordPress")
+    
+    data_manager.merge_csv_frame(generate_merge_frame(size))
+    passed = keystroke("après la fusion") and passed
+    passed = results_exact("après la fusion") and passed
+    
+    data_manager.restore_from_history()
+    passed = keystroke("après l'annulation") and passed
+    data_manager.redo_from_history()
+    passed = results_exact("après l'annulation et le rétablissement") and passed
+    
+    # Restauration progressive avec un filtre de recherche enregistré
+    data_manager.save_session_data()
+    start_time = time.perf_counter()
+    data_manager.restore_session()
+    logger.info(f"Premier affichage de la restauration: {(time.perf_counter() - start_time) * 1000:.1f} ms")
+    passed = keystroke("pendant la restauration") and passed
+    data_manager._finish_restore()
+    passed = results_exact("après la restauration") and passed
+    data_manager._session_store().close()
+    
+    logger.info(f"Réactivité de la recherche: {'OK' if passed else 'ÉCHEC'}")
+    return passed
+
 def main():
     """Fonction principale de test"""
     logger.info("=== Test d'importation de fichiers CSV volumineux ===")
@@ -162,6 +443,14 @@ def main():
         if os.path.exists(csv_file) and success:
             os.remove(csv_file)
             logger.info(f"Fichier de test {csv_file} supprimé")
+    
+    # Banc d'essai et mise à l'échelle de la fusion avec une session existante
+    passed = test_merge_benchmark()
+    passed = test_merge_scaling() and passed
+    passed = test_merge_undo() and passed
+    passed = test_chunked_import_undo() and passed
+    passed = test_search_responsiveness() and passed
+    return passed
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
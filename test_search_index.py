@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Script de test de l'index de recherche par trigrammes
+Vérifie que les résultats sont identiques à une recherche linéaire et mesure les temps de recherche
+"""
+
+import sys
+import time
+import random
+import logging
+from search_index import SearchIndex
+
+# Configuration du logger
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("test_search_index")
+
+WORDS = ["référencement", "été", "Optimisation", "naïve", "wordpress", "Crème", "brûlée", "guide",
+         "SEO", "méta", "description", "titre", "page", "article", "2025", "boutique", "façade", "Noël"]
+SYLLABLES = ["ma", "ri", "on", "tel", "pro", "vé", "lu", "can", "de", "sto", "ber", "ni", "qua", "gé", "ux"]
+
+def generate_items(num_items):
+    """
+    Génère des éléments fictifs
+    
+    Args:
+        num_items: Nombre d'éléments à générer
+    """
+    random.seed(42)
+    # Vocabulaire : quelques mots fréquents et des milliers de mots plus rares
+    vocabulary = WORDS + ["".join(random.choice(SYLLABLES) for _ in range(random.randint(2, 4))) for _ in range(5000)]
+    items = []
+    for i in range(1, num_items + 1):
+        title = " ".join(random.choice(vocabulary) for _ in range(6))
+        items.append({
+            "id": i,
+            "type": "post" if i % 2 == 0 else "page",
+            "title": title,
+            "url": f"https://example.com/{i}-" + title.lower().replace(" ", "-"),
+            "seo_title": " ".join(random.choice(vocabulary) for _ in range(7)),
+            "seo_description": " ".join(random.choice(vocabulary) for _ in range(20)),
+            "title_h1": title
+        })
+    return items
+
+def linear_search(items, query):
+    """Recherche de référence : sous-chaîne normalisée dans chaque champ"""
+    query = SearchIndex.normalize(query)
+    return [(item["type"], item["id"]) for item in items
+            if any(query in SearchIndex.normalize(item[field]) for field in SearchIndex.SEARCH_FIELDS)]
+
+def test_search(num_items=200000):
+    """
+    Construit l'index, compare les résultats à la recherche linéaire et mesure les temps
+    
+    Args:
+        num_items: Nombre d'éléments indexés
+    """
+    items = generate_items(num_items)
+    index = SearchIndex()
+    
+    start_time = time.perf_counter()
+    index.build(((item["type"], item["id"]), item) for item in items)
+    logger.info(f"Construction de l'index pour {num_items} éléments: {time.perf_counter() - start_time:.2f}s")
+    
+    # Modification et suppression après construction
+    items[10]["seo_title"] = "Titre modifié après l'import"
+    index.add((items[10]["type"], items[10]["id"]), items[10])
+    removed = items.pop(20)
+    index.remove((removed["type"], removed["id"]))
+    
+    queries = ["REFERENCEMENT", "creme brulee", "Noel 2025", "modifie apres", "façade naive", "ref", "se", "zzz", f"/{num_items // 2}-"]
+    all_passed = True
+    
+    for query in queries:
+        start_time = time.perf_counter()
+        results = index.search(query)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        
+        expected = linear_search(items, query)
+        passed = sorted(results) == sorted(expected)
+        all_passed = all_passed and passed
+        logger.info(f"'{query}': {len(results)} résultats en {elapsed_ms:.2f} ms ({'OK' if passed else 'ÉCHEC'})")
+    
+    return all_passed
+
+def test_incremental(num_items=200000, chunk_size=5000):
+    """
+    Alimente l'index par blocs (restauration, fusion, annulation), puis compare les résultats à la recherche linéaire
+    
+    Args:
+        num_items: Nombre d'éléments indexés
+        chunk_size: Éléments ajoutés par bloc
+    """
+    items = generate_items(num_items)
+    index = SearchIndex()
+    
+    # Blocs successifs, comme les étapes d'une restauration progressive
+    slowest = 0
+    for start in range(0, num_items, chunk_size):
+        start_time = time.perf_counter()
+        index.add_many(((item["type"], item["id"]), item) for item in items[start:start + chunk_size])
+        slowest = max(slowest, time.perf_counter() - start_time)
+    logger.info(f"Indexation par blocs de {chunk_size} éléments: {slowest * 1000:.0f} ms au plus par bloc")
+    
+    # Fusion volumineuse : un élément sur deux réécrit et réindexé en bloc
+    for item in items[::2]:
+        item["seo_description"] = f"Fusionné {item['id']} " + item["seo_description"]
+    start_time = time.perf_counter()
+    index.add_many(((item["type"], item["id"]), item) for item in items[::2])
+    logger.info(f"Réindexation de {len(items[::2])} éléments fusionnés: {time.perf_counter() - start_time:.2f}s")
+    
+    # Modifications un par un (regroupées en segment au-delà de DELTA_MAX) et suppressions
+    for item in items[1:2 * SearchIndex.DELTA_MAX + 4:2]:
+        item["title_h1"] = f"Modifié {item['id']}"
+        index.add((item["type"], item["id"]), item)
+    for removed in (items.pop(7), items.pop(num_items // 2)):
+        index.remove((removed["type"], removed["id"]))
+    
+    # Compactage des documents périmés, avec des modifications entre la copie des textes et le rattachement
+    texts = index.compaction_texts()
+    start_time = time.perf_counter()
+    segment = SearchIndex.prepare_compaction(texts)
+    logger.info(f"Compactage de {len(texts)} documents: {time.perf_counter() - start_time:.2f}s")
+    for item in items[3:3 * 5000:3]:
+        item["title"] = f"Compacté {item['id']}"
+    index.add_many(((item["type"], item["id"]), item) for item in items[3:3 * 5000:3])
+    removed = items.pop(11)
+    index.remove((removed["type"], removed["id"]))
+    index.attach_compaction(segment)
+    
+    queries = ["compacte 10", "fusionne 1001 ", "modifie 3", "REFERENCEMENT", "Noel 2025", "ref", "se", f"/{num_items // 2 + 1}-"]
+    all_passed = True
+    
+    for query in queries:
+        start_time = time.perf_counter()
+        results = index.search(query)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        
+        expected = linear_search(items, query)
+        passed = sorted(results) == sorted(expected)
+        all_passed = all_passed and passed
+        logger.info(f"'{query}': {len(results)} résultats en {elapsed_ms:.2f} ms ({'OK' if passed else 'ÉCHEC'})")
+    
+    return all_passed
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    sys.exit(0 if test_search(size) and test_incremental(size) else 1)
@@ -163,6 +163,12 @@ class MainWindow(QMainWindow):
         undo_action.triggered.connect(self.on_undo)
         edit_menu.addAction(undo_action)
         
+        # Action Rétablir
+        redo_action = QAction("Rétablir", self)
+        redo_action.setShortcut("Ctrl+Y")
+        redo_action.triggered.connect(self.on_redo)
+        edit_menu.addAction(redo_action)
+        
         # Menu Mise à jour
         update_menu = self.menuBar().addMenu("Mise à jour")
         
@@ -229,6 +235,10 @@ class MainWindow(QMainWindow):
         self.metadata_widget.set_update_manager(self.update_manager)
         self.schedule_widget.set_update_manager(self.update_manager)
         self.schedule_widget.set_data_manager(self.data_manager)
+        
+        # Backend MySQL asynchrone selon les paramètres (appliqué à chaque sauvegarde)
+        self.on_settings_changed()
+        self.settings_widget.settings_changed.connect(self.on_settings_changed)
     
     def connect_signals(self) -> None:
         """Connexion des signaux"""
@@ -270,8 +280,8 @@ class MainWindow(QMainWindow):
         
         # Sauvegarde de la session si des données sont présentes
         if self.data_manager and self.data_manager.data:
-            # Sauvegarde automatique de la session
-            self.data_manager.save_session_data()
+            # Sauvegarde automatique de la session (compactage du journal des modifications)
+            self.data_manager.flush_session()
             self.logger.info("Session sauvegardée automatiquement à la fermeture")
             
             # Confirmation de fermeture si des modifications sont en cours
@@ -292,6 +302,12 @@ class MainWindow(QMainWindow):
         if self.update_manager:
             self.update_manager._stop_scheduler()
         
+        # Fermeture des pools de connexions MySQL (pilote bloquant et backend asynchrone)
+        if self.update_manager:
+            self.update_manager.close_async_mysql()
+        if self.wp_direct_connector:
+            self.wp_direct_connector.close_pool()
+        
         # Acceptation de l'événement de fermeture
         event.accept()
     
@@ -326,16 +342,20 @@ class MainWindow(QMainWindow):
             return
         
         # Sélection du fichier de destination
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Exporter en CSV",
             os.path.join(os.path.expanduser("~"), "export_wp_meta.csv"),
-            "Fichiers CSV (*.csv)"
+            "Fichiers CSV (*.csv);;Fichiers CSV compressés (*.csv.gz)"
         )
         
         if not file_path:
             return
         
+        # Compression gzip si le filtre correspondant est choisi
+        if "*.csv.gz" in selected_filter and not file_path.lower().endswith(".gz"):
+            file_path = (file_path[:-4] if file_path.lower().endswith(".csv") else file_path) + ".csv.gz"
+        
         # Confirmation pour exporter tout ou seulement les sélectionnés
         export_all = True
         
@@ -443,6 +463,17 @@ class MainWindow(QMainWindow):
             else:
                 self.status_bar.showMessage("Impossible d'annuler")
     
+    @pyqtSlot()
+    def on_redo(self) -> None:
+        """Rétablissement de la dernière modification annulée"""
+        if self.data_manager:
+            success = self.data_manager.redo_from_history()
+            
+            if success:
+                self.status_bar.showMessage("Dernière modification rétablie")
+            else:
+                self.status_bar.showMessage("Impossible de rétablir")
+    
     @pyqtSlot()
     def on_update_selected(self) -> None:
         """Mise à jour des éléments sélectionnés"""
@@ -579,18 +610,17 @@ class MainWindow(QMainWindow):
         """Affichage de la boîte de dialogue À propos"""
         about_dialog = AboutDialog(self)
         about_dialog.exec()
-        
+    
     def restore_previous_session(self) -> None:
         """Restauration de la session précédente"""
         if not self.data_manager:
             return
-            
+        
         # Vérification si une session précédente existe
-        session_file = self.data_manager.session_file
-        if not os.path.exists(session_file):
+        if not self.data_manager.has_session():
             self.logger.info("Aucune session précédente trouvée")
             return
-            
+        
         # Demande à l'utilisateur s'il souhaite restaurer la session précédente
         reply = QMessageBox.question(
             self,
@@ -608,9 +638,11 @@ class MainWindow(QMainWindow):
                 # Passage à l'onglet de métadonnées
                 self.tabs.setCurrentWidget(self.metadata_widget)
                 
-                # Mise à jour du statut
-                total_items = sum(len(items) for items in self.data_manager.data.values())
-                self.status_bar.showMessage(f"Session restaurée: {total_items} éléments chargés")
+                # Mise à jour du statut (les éléments suivants sont chargés en arrière-plan)
+                if self.data_manager.is_restoring():
+                    self.status_bar.showMessage("Restauration de la session en cours...")
+                else:
+                    self.status_bar.showMessage(f"Session restaurée: {self.data_manager.get_item_count()} éléments chargés")
                 
                 # Mise à jour des types de contenu dans le widget de métadonnées
                 self.metadata_widget.update_content_types()
@@ -659,3 +691,9 @@ class MainWindow(QMainWindow):
             # Mise à jour du gestionnaire de mise à jour
             if self.update_manager:
                 self.update_manager.set_mysql_connection_available(False)
+    
+    @pyqtSlot()
+    def on_settings_changed(self) -> None:
+        """Application des paramètres sauvegardés au gestionnaire de mise à jour"""
+        if self.update_manager:
+            self.update_manager.set_use_async_mysql(self.settings_widget.async_mysql_check.isChecked())
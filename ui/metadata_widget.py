@@ -26,6 +26,8 @@ from PyQt6.QtCore import (
 )
 from PyQt6.QtGui import QIcon, QFont, QColor, QAction
 
+from data_manager import DataManager
+
 class MetadataTableModel(QAbstractTableModel):
     """Modèle de données pour le tableau des métadonnées"""
     
@@ -60,112 +62,88 @@ class MetadataTableModel(QAbstractTableModel):
         
         item = self.data_manager.filtered_data[index.row()]
         column = index.column()
+        # Qualité SEO précalculée par le gestionnaire de données
+        quality = item["seo_quality"]
+        # Indicateurs lus directement dans le stockage en colonnes
+        store = self.data_manager.store
+        row = self.data_manager.filtered_rows[index.row()]
         
         if role == Qt.ItemDataRole.DisplayRole:
             # Données à afficher
             if column == 0:
-                return str(item["id"])
+                return str(store.get(row, "id"))
             elif column == 1:
                 return item["type"]
             elif column == 2:
                 # Ajout d'un indicateur Rank Math au titre si applicable
-                is_rank_math = "rank_math_title" in item or "rank_math_description" in item or item.get("seo_source") == "rank_math"
-                if is_rank_math:
+                if store.get(row, "rank_math"):
                     return f"{item['title']} [RM]"
                 return item["title"]
             elif column == 3:
                 return item["url"]
             elif column == 4:
                 # Indication de la source pour le titre SEO
-                if "rank_math_title" in item or item.get("seo_title_source") == "rank_math":
+                if quality["rank_math_title"]:
                     return f"{item['seo_title']} [RM]"
                 return item["seo_title"]
             elif column == 5:
                 # Indication de la source pour la description SEO
-                if "rank_math_description" in item or item.get("seo_description_source") == "rank_math":
+                if quality["rank_math_description"]:
                     return f"{item['seo_description']} [RM]"
                 return item["seo_description"]
             elif column == 6:
-                return "Oui" if item["id"] in self.data_manager.modified_items else "Non"
+                return "Oui" if store.get(row, "modified") else "Non"
         
         elif role == Qt.ItemDataRole.BackgroundRole:
             # Couleur de fond
-            if item["id"] in self.data_manager.modified_items:
+            if store.get(row, "modified"):
                 # Élément modifié
                 return QColor(255, 255, 200)  # Jaune clair
             
-            # Vérification si c'est Rank Math SEO
-            is_rank_math = "rank_math_title" in item or "rank_math_description" in item or item.get("seo_source") == "rank_math"
-            
             # Couleur de fond légèrement verte pour les éléments Rank Math dans les colonnes 4 et 5
-            if is_rank_math and column in [4, 5]:
+            if store.get(row, "rank_math") and column in [4, 5]:
                 return QColor(240, 255, 240)  # Vert très clair
             
             # Analyse SEO
-            if column == 4:  # Titre SEO
-                title_length = len(item["seo_title"])
-                min_length = 40 if is_rank_math else 30
-                max_length = 60
-                if title_length < min_length or title_length > max_length:
-                    return QColor(255, 200, 200)  # Rouge clair
+            if column == 4 and store.get(row, "title_issue"):  # Titre SEO
+                return QColor(255, 200, 200)  # Rouge clair
             
-            elif column == 5:  # Description SEO
-                desc_length = len(item["seo_description"])
-                min_length = 120
-                max_length = 160
-                if desc_length < min_length or desc_length > max_length:
-                    return QColor(255, 200, 200)  # Rouge clair
+            elif column == 5 and store.get(row, "description_issue"):  # Description SEO
+                return QColor(255, 200, 200)  # Rouge clair
         
         elif role == Qt.ItemDataRole.CheckStateRole:
             # Case à cocher pour la sélection
             if column == 0:
-                return Qt.CheckState.Checked if item["id"] in self.data_manager.selected_items else Qt.CheckState.Unchecked
+                return Qt.CheckState.Checked if store.get(row, "selected") else Qt.CheckState.Unchecked
         
         elif role == Qt.ItemDataRole.ToolTipRole:
             # Infobulle
-            # Vérification si c'est Rank Math SEO
-            is_rank_math = "rank_math_title" in item or "rank_math_description" in item or item.get("seo_source") == "rank_math"
-            
-            if column == 2 and is_rank_math:  # Titre avec RM
+            if column == 2 and quality["rank_math"]:  # Titre avec RM
                 return "Métadonnées gérées par Rank Math SEO"
                 
             elif column == 4:  # Titre SEO
-                title_length = len(item["seo_title"])
-                # Ajustement des limites en fonction de la source
-                min_length = 40 if is_rank_math else 30
-                max_length = 60
-                
-                tooltip = ""
-                if is_rank_math:
-                    tooltip = "Titre Rank Math SEO: "
-                else:
-                    tooltip = "Titre SEO: "
+                title_length = quality["title_length"]
+                tooltip = "Titre Rank Math SEO: " if quality["rank_math"] else "Titre SEO: "
                 
-                if title_length < min_length:
-                    tooltip += f"Trop court ({title_length} caractères, min. recommandé: {min_length})"
-                elif title_length > max_length:
-                    tooltip += f"Trop long ({title_length} caractères, max. recommandé: {max_length})"
+                if quality["title_too_short"]:
+                    tooltip += f"Trop court ({title_length} caractères, min. recommandé: {quality['title_min_length']})"
+                elif quality["title_too_long"]:
+                    tooltip += f"Trop long ({title_length} caractères, max. recommandé: {quality['title_max_length']})"
                 else:
                     tooltip += f"Longueur optimale ({title_length} caractères)"
                 
                 return tooltip
             
             elif column == 5:  # Description SEO
-                desc_length = len(item["seo_description"])
-                # Limites standard pour Rank Math et autres
-                min_length = 120
-                max_length = 160
-                
-                tooltip = ""
-                if is_rank_math:
-                    tooltip = "Description Rank Math SEO: "
-                else:
-                    tooltip = "Description SEO: "
+                desc_length = quality["description_length"]
+                tooltip = "Description Rank Math SEO: " if quality["rank_math"] else "Description SEO: "
                 
-                if desc_length < min_length:
-                    tooltip += f"Trop courte ({desc_length} caractères, min. recommandé: {min_length})"
-                elif desc_length > max_length:
-                    tooltip += f"Trop longue ({desc_length} caractères, max. recommandé: {max_length})"
+                if quality["description_missing"]:
+                    tooltip += "Absente"
+                elif quality["description_too_short"]:
+                    tooltip += f"Trop courte ({desc_length} caractères, min. recommandé: {quality['description_min_length']})"
+                elif quality["description_too_long"]:
+                    tooltip += f"Trop longue ({desc_length} caractères, max. recommandé: {quality['description_max_length']})"
                 else:
                     tooltip += f"Longueur optimale ({desc_length} caractères)"
                 
@@ -235,74 +213,47 @@ class MetadataTableModel(QAbstractTableModel):
         """Rafraîchit le modèle de données"""
         self.beginResetModel()
         self.endResetModel()
+    
+    def connect_data_manager(self, data_manager) -> None:
+        """Associe le gestionnaire de données et suit ses modifications ligne par ligne"""
+        self.data_manager = data_manager
+        
+        data_manager.row_about_to_be_inserted.connect(self.on_row_about_to_be_inserted)
+        data_manager.row_inserted.connect(self.endInsertRows)
+        data_manager.row_about_to_be_removed.connect(self.on_row_about_to_be_removed)
+        data_manager.row_removed.connect(self.endRemoveRows)
+        data_manager.row_changed.connect(self.on_row_changed)
+        data_manager.rows_about_to_be_inserted.connect(self.on_rows_about_to_be_inserted)
+        data_manager.rows_inserted.connect(self.endInsertRows)
+    
+    def on_row_about_to_be_inserted(self, row: int) -> None:
+        """Début de l'insertion d'une ligne dans les données filtrées"""
+        self.beginInsertRows(QModelIndex(), row, row)
+    
+    def on_rows_about_to_be_inserted(self, first: int, last: int) -> None:
+        """Début de l'ajout d'un bloc de lignes (restauration progressive)"""
+        self.beginInsertRows(QModelIndex(), first, last)
+    
+    def on_row_about_to_be_removed(self, row: int) -> None:
+        """Début de la suppression d'une ligne des données filtrées"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+    
+    def on_row_changed(self, row: int) -> None:
+        """Notification de la modification d'une ligne"""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
 
 class MetadataFilterProxyModel(QSortFilterProxyModel):
-    """Modèle proxy pour le filtrage des métadonnées"""
+    """
+    Modèle proxy pour le tri des métadonnées
+    
+    Le filtrage est assuré par le gestionnaire de données (filtered_data, index de recherche) :
+    toutes les lignes du modèle source sont acceptées.
+    """
     
     def __init__(self, parent=None):
         """Initialisation du modèle proxy"""
         super().__init__(parent)
-        self.search_text = ""
-        self.content_type = "all"
-        self.modified_only = False
-        self.seo_issues = False
-    
-    def set_filters(self, search_text: str = "", content_type: str = "all", modified_only: bool = False, seo_issues: bool = False) -> None:
-        """Définit les filtres"""
-        self.search_text = search_text.lower()
-        self.content_type = content_type
-        self.modified_only = modified_only
-        self.seo_issues = seo_issues
-        self.invalidateFilter()
     
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
-        """Détermine si une ligne est acceptée par le filtre"""
-        # Récupération du modèle source
-        source_model = self.sourceModel()
-        
-        if not source_model or not source_model.data_manager:
-            return False
-        
-        # Récupération de l'élément
-        if source_row >= len(source_model.data_manager.filtered_data):
-            return False
-        
-        item = source_model.data_manager.filtered_data[source_row]
-        
-        # Filtre par type de contenu
-        if self.content_type != "all" and item["type"] != self.content_type:
-            return False
-        
-        # Filtre par texte de recherche
-        if self.search_text:
-            if (self.search_text not in item["title"].lower() and
-                self.search_text not in item["url"].lower() and
-                self.search_text not in item["seo_title"].lower() and
-                self.search_text not in item["seo_description"].lower() and
-                self.search_text not in item.get("title_h1", "").lower()):
-                return False
-        
-        # Filtre par état de modification
-        if self.modified_only and item["id"] not in source_model.data_manager.modified_items:
-            return False
-        
-        # Filtre par problèmes SEO
-        if self.seo_issues:
-            has_issues = False
-            
-            # Vérification de la longueur du titre SEO
-            if len(item["seo_title"]) < 30 or len(item["seo_title"]) > 60:
-                has_issues = True
-            
-            # Vérification de la longueur de la description SEO
-            if len(item["seo_description"]) < 120 or len(item["seo_description"]) > 160:
-                has_issues = True
-            
-            if not has_issues:
-                return False
-        
-        return True
-
 class EditMetadataDialog(QDialog):
     """Boîte de dialogue d'édition des métadonnées"""
     
@@ -316,17 +267,11 @@ class EditMetadataDialog(QDialog):
         
     def _detect_rank_math_seo(self) -> bool:
         """Détecte si les métadonnées proviennent de Rank Math SEO"""
-        # Vérifier si l'élément a des métadonnées Rank Math
-        if "rank_math_title" in self.item or "rank_math_description" in self.item:
-            return True
+        # Valeur précalculée par le gestionnaire de données si disponible
+        if "seo_quality" in self.item:
+            return self.item["seo_quality"]["rank_math"]
         
-        # Vérifier dans les métadonnées originales
-        if ("original_seo_title" in self.item and 
-            "original_seo_title_source" in self.item and 
-            self.item.get("original_seo_title_source") == "rank_math"):
-            return True
-            
-        return False
+        return DataManager.is_rank_math(self.item)
     
     def setup_ui(self) -> None:
         """Configuration de l'interface utilisateur"""
@@ -476,17 +421,11 @@ class EditMetadataDialog(QDialog):
     
     def update_title_counter(self, text: str) -> None:
         """Mise à jour du compteur de caractères pour le titre"""
-        length = len(text)
-        
-        # Détermination des limites en fonction de la source SEO
-        if self.is_rank_math:
-            # Limites spécifiques à Rank Math SEO
-            min_length = 40
-            max_length = 60
-        else:
-            # Limites génériques
-            min_length = 30
-            max_length = 60
+        # Limites communes au tableau et au filtre (minimum plus élevé pour Rank Math SEO)
+        quality = DataManager.evaluate_seo_quality(text, "", self.is_rank_math)
+        length = quality["title_length"]
+        min_length = quality["title_min_length"]
+        max_length = quality["title_max_length"]
         
         if length < min_length:
             self.title_counter.setText(f"<span style='color: red;'>{length} caractères (trop court, min. recommandé: {min_length})</span>")
@@ -497,17 +436,11 @@ class EditMetadataDialog(QDialog):
     
     def update_description_counter(self, text: str) -> None:
         """Mise à jour du compteur de caractères pour la description"""
-        length = len(text)
-        
-        # Détermination des limites en fonction de la source SEO
-        if self.is_rank_math:
-            # Limites spécifiques à Rank Math SEO
-            min_length = 120
-            max_length = 160
-        else:
-            # Limites génériques
-            min_length = 120
-            max_length = 160
+        # Limites communes au tableau et au filtre
+        quality = DataManager.evaluate_seo_quality("", text, self.is_rank_math)
+        length = quality["description_length"]
+        min_length = quality["description_min_length"]
+        max_length = quality["description_max_length"]
         
         if length < min_length:
             self.description_counter.setText(f"<span style='color: red;'>{length} caractères (trop court, min. recommandé: {min_length})</span>")
@@ -680,12 +613,14 @@ class MetadataWidget(QWidget):
     def set_data_manager(self, data_manager) -> None:
         """Définit le gestionnaire de données"""
         self.data_manager = data_manager
-        self.table_model.data_manager = data_manager
+        self.table_model.connect_data_manager(data_manager)
         
         # Connexion des signaux
         self.data_manager.data_changed.connect(self.on_data_changed)
+        self.data_manager.item_updated.connect(self.update_status)
         self.data_manager.import_progress.connect(self.on_import_progress)
         self.data_manager.export_progress.connect(self.on_export_progress)
+        self.data_manager.restore_progress.connect(self.on_restore_progress)
     
     def set_update_manager(self, update_manager) -> None:
         """Définit le gestionnaire de mises à jour"""
@@ -737,14 +672,16 @@ class MetadataWidget(QWidget):
         modified_only = self.modified_check.isChecked()
         seo_issues = self.seo_issues_check.isChecked()
         
-        # Application des filtres
-        self.proxy_model.set_filters(search_text, content_type, modified_only, seo_issues)
+        # Application des filtres par le gestionnaire de données
+        self.data_manager.set_filter_criteria({
+            "search_text": search_text,
+            "content_type": content_type,
+            "modified_only": modified_only,
+            "seo_issues": seo_issues
+        })
         
         # Mise à jour du statut
-        filtered_count = self.proxy_model.rowCount()
-        total_count = sum(len(items) for items in self.data_manager.data.values())
-        
-        self.status_label.setText(f"{filtered_count} éléments affichés sur {total_count}")
+        self.update_status()
     
     @pyqtSlot(QModelIndex)
     def on_table_clicked(self, index: QModelIndex) -> None:
@@ -816,16 +753,29 @@ class MetadataWidget(QWidget):
         self.table_model.refresh()
         
         # Mise à jour du statut
+        self.update_status()
+    
+    def update_status(self, item_id: int = None) -> None:
+        """Mise à jour du statut (nombre d'éléments affichés, total et modifiés)"""
         filtered_count = self.proxy_model.rowCount()
-        total_count = sum(len(items) for items in self.data_manager.data.values())
+        total_count = self.data_manager.get_item_count()
         modified_count = len(self.data_manager.modified_items)
+        issue_count = self.data_manager.get_issue_count()
         
-        self.status_label.setText(f"{filtered_count} éléments affichés sur {total_count} ({modified_count} modifiés)")
-        self.status_message.emit(f"{filtered_count} éléments affichés sur {total_count} ({modified_count} modifiés)")
+        status = f"{filtered_count} éléments affichés sur {total_count} ({modified_count} modifiés, {issue_count} avec problèmes SEO)"
+        self.status_label.setText(status)
+        self.status_message.emit(status)
     
     @pyqtSlot(int, int, str)
     def on_import_progress(self, current: int, total: int, message: str) -> None:
         """Gestion de la progression de l'importation"""
+        if current >= total:
+            # Importation terminée
+            self.progress_bar.setVisible(False)
+            self.status_label.setText(message)
+            self.status_message.emit(message)
+            return
+        
         # Mise à jour de la barre de progression
         self.progress_bar.setVisible(True)
         self.progress_bar.setMaximum(total)
@@ -838,9 +788,31 @@ class MetadataWidget(QWidget):
         # Traitement des événements pour éviter le gel de l'interface
         QApplication.processEvents()
     
+    @pyqtSlot(int, int)
+    def on_restore_progress(self, loaded: int, total: int) -> None:
+        """Gestion de la progression de la restauration de la session"""
+        if loaded >= total:
+            # Restauration terminée
+            self.progress_bar.setVisible(False)
+            self.update_status()
+            return
+        
+        # Mise à jour de la barre de progression sans interrompre la restauration
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(loaded)
+        self.status_label.setText(f"Restauration de la session: {loaded}/{total} éléments")
+    
     @pyqtSlot(int, int, str)
     def on_export_progress(self, current: int, total: int, message: str) -> None:
         """Gestion de la progression de l'exportation"""
+        if current >= total:
+            # Exportation terminée
+            self.progress_bar.setVisible(False)
+            self.status_label.setText(message)
+            self.status_message.emit(message)
+            return
+        
         # Mise à jour de la barre de progression
         self.progress_bar.setVisible(True)
         self.progress_bar.setMaximum(total)
@@ -1015,7 +987,8 @@ class MetadataWidget(QWidget):
         def fetch_data_thread():
             try:
                 # Récupération des données dans un thread séparé
-                content_data = self.wp_connector.fetch_all_content(selected_types, selected_category)
+                # L'extraction des métadonnées se fait ici, pendant que les pages suivantes sont récupérées
+                content_data = self.wp_connector.fetch_all_content(selected_types, selected_category, extract=True)
                 
                 # Traitement des données dans le thread principal
                 from PyQt6.QtCore import QMetaObject, Qt, Q_ARG
@@ -1047,8 +1020,8 @@ class MetadataWidget(QWidget):
         self.status_label.setText("Traitement des données importées...")
         self.status_message.emit("Traitement des données importées...")
         
-        # Importation des données
-        self.data_manager.import_from_wp(content_data)
+        # Importation des données (déjà extraites par le thread de récupération)
+        self.data_manager.import_from_wp(content_data, extracted=True)
     
     def _handle_import_error(self, error_message: str) -> None:
         """Gère les erreurs d'importation"""
@@ -1119,19 +1092,19 @@ class MetadataWidget(QWidget):
         export_all = export_all_check.isChecked()
         
         # Sélection du fichier de destination
-        filepath, _ = QFileDialog.getSaveFileName(
+        filepath, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Exporter vers CSV",
             "",
-            "Fichiers CSV (*.csv)"
+            "Fichiers CSV (*.csv);;Fichiers CSV compressés (*.csv.gz)"
         )
         
         if not filepath:
             return
         
-        # Ajout de l'extension .csv si nécessaire
-        if not filepath.lower().endswith(".csv"):
-            filepath += ".csv"
+        # Ajout de l'extension .csv (ou .csv.gz) si nécessaire
+        if not filepath.lower().endswith((".csv", ".csv.gz")):
+            filepath += ".csv.gz" if "*.csv.gz" in selected_filter else ".csv"
         
         # Exportation des données
         success = self.data_manager.export_to_csv(filepath, export_all)
@@ -257,7 +257,8 @@ class MySQLConnectionWidget(QWidget):
         def test_connection_thread():
             try:
                 # Test de la connexion dans un thread séparé
-                success = self.wp_direct_connector.connect()
+                # La connexion est empruntée au pool puis rendue dans ce même thread
+                success, _ = self.wp_direct_connector.test_connection()
                 
                 # Traitement du résultat dans le thread principal
                 from PyQt6.QtCore import QMetaObject, Qt, Q_ARG
@@ -296,9 +297,6 @@ class MySQLConnectionWidget(QWidget):
                 QMessageBox.StandardButton.Ok
             )
             
-            # Fermeture de la connexion
-            self.wp_direct_connector.disconnect()
-            
             # Émission du signal de connexion réussie
             self.connection_successful.emit(True, "Connexion MySQL établie avec succès")
         else:
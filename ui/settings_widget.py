@@ -332,6 +332,17 @@ class SettingsWidget(QWidget):
         
         layout.addWidget(cache_group)
         
+        # Groupe MySQL direct
+        mysql_group = QGroupBox("MySQL direct")
+        mysql_layout = QFormLayout(mysql_group)
+        
+        # Backend asynchrone (aiomysql)
+        self.async_mysql_check = QCheckBox()
+        self.async_mysql_check.setToolTip("Écrit plusieurs lots simultanément via aiomysql (repli sur le pilote bloquant s'il est absent)")
+        mysql_layout.addRow("Écriture MySQL asynchrone:", self.async_mysql_check)
+        
+        layout.addWidget(mysql_group)
+        
         # Espace flexible
         layout.addStretch(1)
     
@@ -378,6 +389,9 @@ class SettingsWidget(QWidget):
         self.enable_cache_check.setChecked(self.settings.value("cache/enable_cache", True, type=bool))
         self.cache_dir_edit.setText(self.settings.value("cache/cache_dir", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache")))
         self.cache_ttl_spin.setValue(int(self.settings.value("cache/cache_ttl", 7)))
+        
+        # Paramètres MySQL direct
+        self.async_mysql_check.setChecked(self.settings.value("mysql/async_write", False, type=bool))
     
     def save_settings(self) -> None:
         """Sauvegarde des paramètres"""
@@ -416,6 +430,9 @@ class SettingsWidget(QWidget):
         self.settings.setValue("cache/cache_dir", self.cache_dir_edit.text())
         self.settings.setValue("cache/cache_ttl", self.cache_ttl_spin.value())
         
+        # Paramètres MySQL direct
+        self.settings.setValue("mysql/async_write", self.async_mysql_check.isChecked())
+        
         # Émission du signal de changement de paramètres
         self.settings_changed.emit()
         
@@ -722,7 +739,7 @@ class SettingsWidget(QWidget):
                     )
                     
                     self.logger.info("Cache vidé")
-                    
+                
                 except Exception as e:
                     QMessageBox.warning(
                         self,
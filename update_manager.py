@@ -8,6 +8,7 @@ Gère la planification et l'exécution des mises à jour des métadonnées SEO
 
 import os
 import json
+import asyncio
 import logging
 import threading
 import time
@@ -44,6 +45,12 @@ class UpdateManager(QObject):
         # État de la connexion MySQL
         self.mysql_connection_available = False
         
+        # Backend MySQL asynchrone (aiomysql), optionnel
+        self.use_async_mysql = False
+        self._async_connector = None  # Connecteur asynchrone conservé d'une mise à jour à l'autre (pool réutilisé)
+        self._async_config = None  # Configuration MySQL du pool asynchrone
+        self._async_loop = None  # Boucle d'événements à laquelle le pool asynchrone est lié
+        
         # Chargement des mises à jour planifiées
         self._load_scheduled_updates()
     
@@ -69,6 +76,82 @@ class UpdateManager(QObject):
         self.mysql_connection_available = available
         self.logger.info(f"Connexion MySQL disponible: {available}")
     
+    def set_use_async_mysql(self, enabled: bool) -> None:
+        """
+        Active ou désactive le backend MySQL asynchrone (aiomysql)
+        
+        Args:
+            enabled: Utiliser le backend asynchrone s'il est disponible
+        """
+        from wp_meta_async_update import AIOMYSQL_AVAILABLE
+        
+        self.use_async_mysql = enabled and AIOMYSQL_AVAILABLE
+        if enabled and not AIOMYSQL_AVAILABLE:
+            self.logger.warning("Module aiomysql non disponible, utilisation du pilote MySQL bloquant")
+    
+    async def update_direct_async(self, items: List[Dict[str, Any]], progress_callback: Callable = None) -> Dict[str, Any]:
+        """
+        Met à jour les métadonnées via le backend MySQL asynchrone
+        
+        Le connecteur asynchrone et son pool sont conservés pour les mises à jour suivantes : la
+        coroutine doit s'exécuter dans la boucle d'événements du gestionnaire (_run_async).
+        
+        Args:
+            items: Liste des éléments à mettre à jour
+            progress_callback: Fonction de rappel pour suivre la progression
+        
+        Returns:
+            Statistiques de mise à jour
+        """
+        from wp_meta_async_update import AsyncWordPressDirectConnector
+        
+        # Connecteur recréé si le connecteur direct ou sa configuration ont changé
+        config = dict(self.wp_direct_connector.db_config)
+        if self._async_connector is not None and (self._async_connector.direct is not self.wp_direct_connector
+                                                  or self._async_config != config):
+            await self._async_connector.close()
+            self._async_connector = None
+        
+        if self._async_connector is None:
+            self._async_connector = AsyncWordPressDirectConnector(self.wp_direct_connector, self.logger)
+            self._async_config = config
+        
+        return await self._async_connector.bulk_update_metadata(items, progress_callback)
+    
+    def _run_async(self, coroutine) -> Any:
+        """
+        Exécute une coroutine dans la boucle d'événements du gestionnaire (créée au premier appel)
+        
+        Args:
+            coroutine: Coroutine à exécuter
+        
+        Returns:
+            Résultat de la coroutine
+        """
+        if self._async_loop is None:
+            self._async_loop = asyncio.new_event_loop()
+        return self._async_loop.run_until_complete(coroutine)
+    
+    def close_async_mysql(self) -> None:
+        """Ferme le pool MySQL asynchrone et sa boucle d'événements (fermeture de l'application)"""
+        if self._async_loop is None:
+            return
+        
+        if self._async_loop.is_running():
+            self.logger.warning("Mise à jour asynchrone en cours, pool MySQL asynchrone non fermé")
+            return
+        
+        try:
+            if self._async_connector is not None:
+                self._run_async(self._async_connector.close())
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la fermeture du pool MySQL asynchrone: {str(e)}")
+        finally:
+            self._async_loop.close()
+            self._async_loop = None
+            self._async_connector = None
+            self._async_config = None
+    
     def update_items(self, items: List[Dict[str, Any]], selected_only: bool = False, method: str = "api") -> None:
         """
         Alias pour update_metadata pour compatibilité avec l'interface utilisateur
@@ -167,8 +250,11 @@ class UpdateManager(QObject):
             # Exécution de la mise à jour selon la méthode choisie
             if method == "api":
                 stats = self.wp_connector.bulk_update_metadata(items, progress_callback)
+            elif self.use_async_mysql:
+                # Boucle d'événements du gestionnaire, conservée avec le pool asynchrone
+                stats = self._run_async(self.update_direct_async(items, progress_callback))
             else:  # method == "mysql"
-                # Connexion à la base de données
+                # Emprunt d'une connexion au pool du connecteur direct
                 if not self.wp_direct_connector.connect():
                     raise Exception("Impossible de se connecter à la base de données MySQL")
                 
@@ -176,7 +262,7 @@ class UpdateManager(QObject):
                     # Mise à jour des métadonnées
                     stats = self.wp_direct_connector.bulk_update_metadata(items, progress_callback)
                 finally:
-                    # Fermeture de la connexion
+                    # Restitution de la connexion au pool
                     self.wp_direct_connector.disconnect()
             
             # Journalisation des résultats
@@ -208,7 +294,7 @@ class UpdateManager(QObject):
                 
                 # Notification du changement de données
                 self.data_manager.data_changed.emit()
-            
+        
         except Exception as e:
             error_msg = f"Erreur lors de la mise à jour: {str(e)}"
             self.logger.error(error_msg)
@@ -266,7 +352,7 @@ class UpdateManager(QObject):
             recurring: Indique si la mise à jour est récurrente
             interval_days: Intervalle en jours pour les mises à jour récurrentes
             method: Méthode de mise à jour ("api" ou "mysql")
-            
+        
         Returns:
             Succès de la planification
         """
@@ -310,7 +396,7 @@ class UpdateManager(QObject):
         
         Args:
             update_id: ID de la mise à jour planifiée
-            
+        
         Returns:
             Succès de l'annulation
         """
@@ -383,7 +469,7 @@ class UpdateManager(QObject):
                 
                 # Attente avant la prochaine vérification
                 time.sleep(30)
-                
+            
             except Exception as e:
                 self.logger.error(f"Erreur dans le planificateur: {str(e)}")
                 time.sleep(60)  # Attente plus longue en cas d'erreur
@@ -405,12 +491,10 @@ class UpdateManager(QObject):
                 item_id = item_ref["id"]
                 item_type = item_ref["type"]
                 
-                # Recherche de l'élément dans les données
-                if self.data_manager and item_type in self.data_manager.data:
-                    for item in self.data_manager.data[item_type]:
-                        if item["id"] == item_id:
-                            items_to_update.append(item)
-                            break
+                # Recherche de l'élément par l'index du gestionnaire de données
+                item = self.data_manager.get_item(item_id, item_type) if self.data_manager else None
+                if item is not None:
+                    items_to_update.append(item)
             
             if not items_to_update:
                 self.logger.warning(f"Aucun élément trouvé pour la mise à jour planifiée: {update['name']}")
@@ -435,7 +519,7 @@ class UpdateManager(QObject):
                     update["last_error"] = "Connecteur WordPress MySQL non configuré"
                     return
                 
-                # Connexion à la base de données
+                # Emprunt d'une connexion au pool (aucune reconnexion si une connexion est libre)
                 if not self.wp_direct_connector.connect():
                     self.logger.error(f"Impossible de se connecter à la base de données MySQL pour la mise à jour planifiée: {update['name']}")
                     update["status"] = "error"
@@ -446,7 +530,7 @@ class UpdateManager(QObject):
                     # Mise à jour des métadonnées
                     stats = self.wp_direct_connector.bulk_update_metadata(items_to_update)
                 finally:
-                    # Fermeture de la connexion
+                    # Restitution de la connexion au pool
                     self.wp_direct_connector.disconnect()
             
             # Journalisation des résultats
@@ -461,7 +545,7 @@ class UpdateManager(QObject):
             }
             
             self.logger.info(f"Mise à jour planifiée terminée: {update['name']}")
-            
+        
         except Exception as e:
             error_msg = f"Erreur lors de l'exécution de la mise à jour planifiée: {str(e)}"
             self.logger.error(error_msg)
@@ -482,7 +566,7 @@ class UpdateManager(QObject):
             # Sauvegarde des données
             with open(save_file, "w", encoding="utf-8-sig") as f:
                 json.dump(self.scheduled_updates, f, indent=2, ensure_ascii=False)
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde des mises à jour planifiées: {str(e)}")
     
@@ -521,7 +605,7 @@ class UpdateManager(QObject):
                     update["method"] = "api"
             
             self.logger.info(f"Chargement de {len(self.scheduled_updates)} mises à jour planifiées")
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement des mises à jour planifiées: {str(e)}")
             self.scheduled_updates = []
@@ -11,7 +11,9 @@ import requests
 import json
 import time
 import gc
-from typing import Dict, List, Any, Optional, Tuple
+import math
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
@@ -26,6 +28,10 @@ class WordPressConnector:
     RETRY_BACKOFF = 2     # Facteur multiplicatif pour le délai exponentiel
     GC_FREQUENCY = 3      # Fréquence d'exécution du garbage collector (tous les X lots)
     
+    # Paramètres de lecture anticipée lors de la récupération paginée
+    READAHEAD_MIN = 1     # Nombre minimum de pages demandées à l'avance
+    READAHEAD_MAX = 3     # Nombre maximum de pages en vol (même limite que l'ancien pool de 3 workers)
+    
     # Types de contenu WordPress supportés
     CONTENT_TYPES = {
         "post": "Articles",
@@ -363,16 +369,169 @@ class WordPressConnector:
             self.logger.error(f"Erreur lors de la récupération des {content_type}s: {str(e)}")
             return [], 0, 0
     
-    def fetch_all_content(self, content_types: List[str] = None, category: str = None) -> Dict[str, List[Dict[str, Any]]]:
+    def _fetch_page_timed(self, content_type: str, page: int, per_page: int, category: str = None) -> Tuple[List[Dict[str, Any]], float]:
+        """Récupère une page et mesure le temps réseau correspondant"""
+        start = time.perf_counter()
+        items, _, _ = self.fetch_content_items(content_type, page, per_page, category)
+        return items, time.perf_counter() - start
+    
+    def _adapt_readahead(self, fetch_time: Optional[float], process_time: Optional[float]) -> int:
+        """
+        Calcule la profondeur du tampon de lecture anticipée
+        
+        Le nombre de pages en vol doit couvrir le temps réseau d'une page pendant
+        le traitement des pages précédentes: K = temps réseau / temps de traitement.
+        """
+        if not fetch_time:
+            return self.READAHEAD_MIN
+        
+        readahead = math.ceil(fetch_time / max(process_time or 0.0, 0.001))
+        return max(self.READAHEAD_MIN, min(self.READAHEAD_MAX, readahead))
+    
+    def iter_content_pages(self, content_type: str, category: str = None, per_page: int = 100) -> Iterator[Tuple[int, List[Dict[str, Any]], int]]:
+        """
+        Parcourt les pages d'un type de contenu avec un tampon de lecture anticipée
+        
+        Pendant que l'appelant traite une page, les K pages suivantes sont déjà
+        demandées en arrière-plan. K s'adapte au temps mesuré par page. Les pages
+        sont rendues dans l'ordre.
+        
+        Args:
+            content_type: Type de contenu (post, page, etc.)
+            category: Catégorie à filtrer (optionnel)
+            per_page: Nombre d'éléments par page
+            
+        Yields:
+            Tuple (numéro de page, éléments de la page, nombre total de pages)
+        """
+        first_page_items, _, total_pages = self.fetch_content_items(content_type, page=1, per_page=per_page, category=category)
+        
+        if total_pages <= 1:
+            yield 1, first_page_items, max(total_pages, 1)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=self.READAHEAD_MAX)
+        pending = deque()  # File ordonnée des (page, future) en vol
+        next_page = 2
+        fetch_time = None    # Moyenne glissante du temps réseau par page
+        process_time = None  # Moyenne glissante du temps de traitement par page
+        
+        def fill(readahead: int) -> None:
+            nonlocal next_page
+            while len(pending) < readahead and next_page <= total_pages:
+                future = executor.submit(self._fetch_page_timed, content_type, next_page, per_page, category)
+                pending.append((next_page, future))
+                next_page += 1
+        
+        try:
+            # La page 2 est demandée avant que la page 1 ne soit traitée
+            fill(self.READAHEAD_MIN)
+            
+            start = time.perf_counter()
+            yield 1, first_page_items, total_pages
+            process_time = time.perf_counter() - start
+            
+            while pending:
+                page, future = pending.popleft()
+                
+                try:
+                    page_items, elapsed = future.result(timeout=30)  # Timeout de 30 secondes
+                    fetch_time = elapsed if fetch_time is None else 0.7 * fetch_time + 0.3 * elapsed
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du traitement de la page {page}: {str(e)}")
+                    page_items = []
+                
+                # Ajustement du tampon avant de rendre la main à l'appelant
+                readahead = self._adapt_readahead(fetch_time, process_time)
+                fill(readahead)
+                self.logger.debug(f"Lecture anticipée pour {content_type}: {len(pending)} page(s) en vol (K={readahead})")
+                
+                start = time.perf_counter()
+                yield page, page_items, total_pages
+                elapsed = time.perf_counter() - start
+                process_time = 0.7 * process_time + 0.3 * elapsed
+        finally:
+            # Abandon des pages non consommées (interruption ou arrêt anticipé)
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def extract_item_metadata(self, item: Dict[str, Any], content_type: str) -> Dict[str, Any]:
+        """
+        Extrait les métadonnées d'un élément brut pour l'importation
+        
+        Args:
+            item: Élément de contenu WordPress
+            content_type: Type de contenu de l'élément
+            
+        Returns:
+            Métadonnées prêtes à être importées dans le gestionnaire de données
+        """
+        title_value = item.get("title", {}).get("rendered", "") if isinstance(item.get("title"), dict) else item.get("title", "")
+        
+        try:
+            metadata = self.extract_seo_metadata(item)
+            # S'assurer que le titre est correctement défini
+            if not metadata.get("title"):
+                metadata["title"] = title_value
+            # S'assurer que le type est correctement défini
+            metadata["type"] = content_type
+        except Exception as extract_error:
+            self.logger.warning(f"Erreur lors de l'extraction des métadonnées SEO: {str(extract_error)}")
+            # Fallback en cas d'erreur
+            metadata = {
+                "id": item.get("id", 0),
+                "type": content_type,
+                "title": title_value,
+                "url": item.get("link", ""),
+                "date_modified": item.get("modified", ""),
+                "seo_title": title_value,
+                "seo_description": "",
+                "original_seo_title": title_value,
+                "original_seo_description": "",
+                "title_h1": title_value,
+                "original_title_h1": title_value
+            }
+        
+        return metadata
+    
+    def iter_content_metadata(self, content_types: List[str] = None, category: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les métadonnées extraites de tout le contenu des types spécifiés, page par page
+        
+        Aucune liste n'est construite : chaque page est extraite puis rendue pendant que les suivantes
+        sont récupérées (exportation en flux sans session).
+        
+        Args:
+            content_types: Liste des types de contenu à récupérer (None = tous)
+            category: Catégorie à filtrer (optionnel)
+            
+        Yields:
+            Métadonnées de chaque élément
+        """
+        if content_types is None:
+            content_types = list(self.CONTENT_TYPES.keys())
+        
+        for content_type in content_types:
+            for page, page_items, total_pages in self.iter_content_pages(content_type, category):
+                for item in page_items:
+                    yield self.extract_item_metadata(item, content_type)
+                
+                if total_pages > 1:
+                    self.logger.info(f"Page {page}/{total_pages} exportée pour {content_type}")
+    
+    def fetch_all_content(self, content_types: List[str] = None, category: str = None, extract: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """
         Récupère tout le contenu des types spécifiés
         
         Args:
             content_types: Liste des types de contenu à récupérer (None = tous)
             category: Catégorie à filtrer (optionnel)
+            extract: Extraire les métadonnées SEO de chaque page pendant que les suivantes sont récupérées
             
         Returns:
             Dictionnaire avec les types de contenu comme clés et les listes d'éléments comme valeurs
+            (métadonnées extraites si extract=True, éléments bruts sinon)
         """
         if content_types is None:
             content_types = list(self.CONTENT_TYPES.keys())
@@ -381,57 +540,26 @@ class WordPressConnector:
         
         for content_type in content_types:
             items = []
-            page = 1
-            total_pages = 1
+            interrupted = False
             
-            # Récupération de la première page pour obtenir le nombre total de pages
-            first_page_items, _, total_pages = self.fetch_content_items(content_type, page=1, category=category)
-            items.extend(first_page_items)
-            
-            # Récupération des pages restantes en parallèle si nécessaire
-            if total_pages > 1:
-                # Réduction du nombre de workers pour éviter de surcharger le serveur
-                max_workers = min(self.max_workers, 3)  # Limiter à 3 workers maximum
-                
-                # Ajout d'un délai entre les requêtes pour éviter les limitations de taux
-                delay_between_batches = 0.5  # 500ms entre chaque lot de requêtes
-                
-                # Traitement par lots pour mieux gérer les ressources
-                batch_size = 5  # Nombre de pages à traiter en parallèle
-                
-                for batch_start in range(2, total_pages + 1, batch_size):
-                    batch_end = min(batch_start + batch_size, total_pages + 1)
-                    
-                    self.logger.info(f"Traitement du lot de pages {batch_start}-{batch_end-1} sur {total_pages} pour {content_type}")
-                    
-                    try:
-                        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                            future_to_page = {
-                                executor.submit(self.fetch_content_items, content_type, p, 100, category): p
-                                for p in range(batch_start, batch_end)
-                            }
-                            
-                            # Utilisation de as_completed pour traiter les résultats au fur et à mesure
-                            from concurrent.futures import as_completed
-                            for future in as_completed(future_to_page):
-                                try:
-                                    page = future_to_page[future]
-                                    page_items, _, _ = future.result(timeout=30)  # Timeout de 30 secondes
-                                    items.extend(page_items)
-                                    self.logger.info(f"Page {page}/{total_pages} traitée pour {content_type}")
-                                except Exception as e:
-                                    self.logger.error(f"Erreur lors du traitement de la page {future_to_page[future]}: {str(e)}")
-                    except KeyboardInterrupt:
-                        self.logger.warning("Interruption utilisateur détectée, arrêt de la récupération des données")
-                        break
+            try:
+                for page, page_items, total_pages in self.iter_content_pages(content_type, category):
+                    # Le traitement de cette page chevauche la récupération des pages suivantes
+                    if extract:
+                        page_items = [self.extract_item_metadata(item, content_type) for item in page_items]
+                    items.extend(page_items)
                     
-                    # Pause entre les lots pour éviter de surcharger le serveur
-                    if batch_end < total_pages + 1:
-                        import time
-                        time.sleep(delay_between_batches)
+                    if total_pages > 1:
+                        self.logger.info(f"Page {page}/{total_pages} traitée pour {content_type}")
+            except KeyboardInterrupt:
+                self.logger.warning("Interruption utilisateur détectée, arrêt de la récupération des données")
+                interrupted = True
             
             result[content_type] = items
             self.logger.info(f"Total de {len(items)} {content_type}s récupérés")
+            
+            if interrupted:
+                break
         
         return result
     
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WordPress Meta Async Update
+Backend asynchrone (aiomysql) du connecteur direct : plusieurs lots sont écrits
+simultanément depuis une seule boucle d'événements, sur des connexions distinctes.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from wp_meta_direct_update import WordPressDirectConnector
+
+# Import conditionnel du pilote MySQL asynchrone
+try:
+    import aiomysql
+    AIOMYSQL_AVAILABLE = True
+except ImportError:
+    AIOMYSQL_AVAILABLE = False
+
+class AsyncWordPressDirectConnector:
+    """Backend asynchrone du connecteur direct, partageant sa configuration et ses requêtes"""
+    
+    CONCURRENCY = 4  # Nombre de lots écrits simultanément (une connexion chacun)
+    
+    def __init__(self, direct_connector: WordPressDirectConnector, logger: logging.Logger = None):
+        """
+        Initialisation du backend asynchrone
+        
+        Args:
+            direct_connector: Connecteur direct configuré (paramètres de connexion, préfixe, requêtes)
+            logger: Logger (celui du connecteur direct par défaut)
+        """
+        self.direct = direct_connector
+        self.logger = logger or direct_connector.logger
+        self.concurrency = self.CONCURRENCY
+        self._pool = None
+        
+        if not AIOMYSQL_AVAILABLE:
+            self.logger.warning("Module aiomysql non disponible. Le backend asynchrone est désactivé.")
+    
+    async def open(self) -> None:
+        """Crée le pool de connexions asynchrones"""
+        if self._pool is not None:
+            return
+        
+        if not AIOMYSQL_AVAILABLE:
+            raise ConnectionError("Module aiomysql non disponible")
+        
+        config = self.direct.db_config
+        self._pool = await aiomysql.create_pool(
+            host=config.get("host"),
+            port=int(config.get("port", 3306)),
+            user=config.get("user"),
+            password=config.get("password"),
+            db=config.get("database"),
+            charset="utf8mb4",
+            autocommit=False,
+            minsize=1,
+            maxsize=self.concurrency
+        )
+        self.logger.info(f"Pool asynchrone de {self.concurrency} connexions créé pour {config.get('database')}")
+    
+    async def close(self) -> None:
+        """Ferme le pool de connexions asynchrones"""
+        if self._pool is None:
+            return
+        
+        self._pool.close()
+        await self._pool.wait_closed()
+        self._pool = None
+    
+    async def test_connection(self) -> Tuple[bool, str]:
+        """
+        Teste la connexion asynchrone
+        
+        Returns:
+            Tuple (succès, message)
+        """
+        try:
+            await self.open()
+            async with self._pool.acquire() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT 1")
+                    await cursor.fetchone()
+            return True, "Connexion asynchrone établie"
+        except Exception as e:
+            return False, str(e)
+    
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> Tuple[List[Tuple[Dict[str, Any], bool, str]], Optional[float]]:
+        """
+        Écrit un lot d'articles dans une seule transaction, sur une connexion du pool
+        
+        Même déroulement que WordPressDirectConnector._write_batch : écriture ensembliste, puis
+        en cas d'échec reprise article par article, chacun sous son propre SAVEPOINT.
+        
+        Args:
+            batch: Articles du lot
+        
+        Returns:
+            Tuple (liste de (article, succès, message) dans l'ordre du lot, durée du commit en ms,
+            None si le lot a échoué)
+        """
+        direct = self.direct
+        
+        async with self._pool.acquire() as connection:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                # Préchargement de l'existence et des métadonnées SEO
+                try:
+                    post_ids = list(dict.fromkeys(int(item["id"]) for item in batch))
+                    prefetched = {}
+                    for start in range(0, len(post_ids), direct.PREFETCH_CHUNK):
+                        await cursor.execute(*direct.prefetch_query(post_ids[start:start + direct.PREFETCH_CHUNK]))
+                        direct.collect_prefetch_rows(await cursor.fetchall(), prefetched)
+                    plugins = direct.detect_seo_plugins(prefetched)
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du préchargement asynchrone du lot: {str(e)}")
+                    await self._rollback(connection)
+                    return [(item, False, str(e)) for item in batch], None
+                
+                results, meta_rows, titles = direct.prepare_rows(batch, plugins)
+                
+                try:
+                    await self._write_rows(cursor, meta_rows, titles)
+                except Exception as e:
+                    self.logger.warning(f"Écriture ensembliste asynchrone du lot impossible ({str(e)}), reprise article par article")
+                    await self._rollback(connection)
+                    try:
+                        results = await self._write_items_with_savepoints(cursor, results, plugins)
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de l'écriture asynchrone du lot: {str(e)}")
+                        await self._rollback(connection)
+                        return [(item, False, str(e)) for item in batch], None
+            
+            try:
+                start_time = time.perf_counter()
+                await connection.commit()
+                return results, (time.perf_counter() - start_time) * 1000
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la validation asynchrone du lot: {str(e)}")
+                await self._rollback(connection)
+                return [(item, False, str(e)) for item in batch], None
+    
+    async def _rollback(self, connection) -> None:
+        """Annule la transaction en cours en ignorant les erreurs de connexion"""
+        try:
+            await connection.rollback()
+        except Exception:
+            pass
+    
+    async def _ensure_plugin_tables(self, cursor) -> None:
+        """Détecte une fois les tables de plugins SEO présentes (détection partagée avec le connecteur bloquant)"""
+        if self.direct.needs_plugin_tables():
+            await cursor.execute(*self.direct.plugin_tables_query())
+            self.direct.set_plugin_tables(await cursor.fetchall())
+    
+    async def _write_rows(self, cursor, meta_rows: Dict[Tuple[int, str], Any], titles: Dict[int, str]) -> None:
+        """
+        Écrit un lot de façon ensembliste : table temporaire, fusion dans postmeta et les tables de plugins, titres
+        
+        Args:
+            cursor: Curseur de la connexion du lot
+            meta_rows: Dictionnaire {(post_id, meta_key): meta_value}
+            titles: Dictionnaire {ID: titre}
+        """
+        direct = self.direct
+        
+        if meta_rows:
+            for statement in direct.staging_statements():
+                await cursor.execute(statement)
+            await cursor.executemany(
+                direct.staging_insert_query(),
+                [(post_id, meta_key, meta_value) for (post_id, meta_key), meta_value in meta_rows.items()]
+            )
+            await self._ensure_plugin_tables(cursor)
+            for statement in direct.merge_statements():
+                await cursor.execute(statement)
+        
+        if titles:
+            await cursor.execute(*direct.titles_query(titles))
+    
+    async def _write_item(self, cursor, post_id: int, seo_plugin: str, seo_title: str, seo_description: str, title: str = None) -> None:
+        """
+        Écrit les métadonnées SEO et le titre d'un article sans valider la transaction
+        
+        Mêmes requêtes que WordPressDirectConnector._write_item.
+        
+        Args:
+            cursor: Curseur de la connexion du lot
+            post_id: ID de l'article
+            seo_plugin: Plugin SEO détecté
+            seo_title: Nouveau titre SEO
+            seo_description: Nouvelle description SEO
+            title: Nouveau titre H1 (None = pas de changement)
+        """
+        direct = self.direct
+        title_key, description_key = direct.SEO_META_KEYS[seo_plugin]
+        
+        for meta_key, meta_value in ((title_key, seo_title), (description_key, seo_description)):
+            lookup, update, insert = direct.postmeta_upsert_queries(post_id, meta_key, meta_value)
+            await cursor.execute(*lookup)
+            await cursor.execute(*(update if await cursor.fetchone() else insert))
+        
+        # Tables propres au plugin (Yoast indexables, AIOSEO)
+        await self._ensure_plugin_tables(cursor)
+        for query, params in direct.plugin_item_statements(post_id, seo_plugin, seo_title, seo_description):
+            await cursor.execute(query, params)
+        
+        # Mise à jour du titre H1 si spécifié
+        if title:
+            await cursor.execute(*direct.title_query(post_id, title))
+    
+    async def _write_items_with_savepoints(self, cursor, results: List[Tuple[Dict[str, Any], bool, str]],
+                                           plugins: Dict[int, str]) -> List[Tuple[Dict[str, Any], bool, str]]:
+        """
+        Rejoue un lot article par article, chaque article sous son propre SAVEPOINT
+        
+        Args:
+            cursor: Curseur de la connexion du lot
+            results: Résultats préparés par prepare_rows (les échecs sont conservés tels quels)
+            plugins: Dictionnaire {ID: plugin}
+        
+        Returns:
+            Liste de (article, succès, message) dans l'ordre du lot
+        """
+        replayed = []
+        
+        for item, success, message in results:
+            if not success:
+                replayed.append((item, success, message))
+                continue
+            
+            post_id = int(item["id"])
+            try:
+                await cursor.execute("SAVEPOINT wpmeta_item")
+                await self._write_item(cursor, post_id, plugins[post_id], item["seo_title"], item["seo_description"], item.get("title_h1"))
+                await cursor.execute("RELEASE SAVEPOINT wpmeta_item")
+                replayed.append((item, True, message))
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la mise à jour des métadonnées SEO de l'article {post_id}: {str(e)}")
+                try:
+                    await cursor.execute("ROLLBACK TO SAVEPOINT wpmeta_item")
+                except Exception as rollback_error:
+                    # Interblocage ou attente de verrou expirée : MySQL a déjà annulé toute la transaction
+                    self.logger.warning(f"Retour au savepoint impossible ({str(rollback_error)}), annulation du lot")
+                    raise e
+                replayed.append((item, False, str(e)))
+        
+        return replayed
+    
+    async def bulk_update_metadata(self, items: List[Dict[str, Any]], callback=None, commit_size: int = None) -> Dict[str, Any]:
+        """
+        Met à jour les métadonnées SEO en masse, avec plusieurs lots en vol simultanément
+        
+        Args:
+            items: Liste des articles à mettre à jour
+            callback: Fonction de rappel pour suivre la progression
+            commit_size: Nombre d'articles validés par transaction (BATCH_SIZE par défaut)
+        
+        Returns:
+            Statistiques de mise à jour, au même format que WordPressDirectConnector.bulk_update_metadata
+        """
+        commit_size = max(1, int(commit_size or self.direct.BATCH_SIZE))
+        
+        stats = {
+            "total": len(items),
+            "success": 0,
+            "failed": 0,
+            "errors": [],
+            "commit_latency_ms": []
+        }
+        
+        if not items:
+            return stats
+        
+        await self.open()
+        
+        # Lots par ID croissant, les doublons d'un ID restant dans le même lot (comme les plages du mode parallèle)
+        batches = self.direct.split_shards(items, -(-len(items) // commit_size))
+        self.logger.info(f"Traitement asynchrone de {len(items)} éléments en {len(batches)} lots de {commit_size} maximum")
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        progress = {"current": 0}
+        
+        async def run_batch(batch):
+            async with semaphore:
+                # Débit global MAX_ROWS_PER_SECOND (créneaux partagés avec le connecteur bloquant), sans bloquer la boucle
+                delay = self.direct.throttle_delay(len(batch))
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                results, commit_ms = await self._write_batch(batch)
+            
+            for _ in results:
+                progress["current"] += 1
+                if callback:
+                    callback(progress["current"], len(items))
+            
+            return results, commit_ms
+        
+        # Fusion des statistiques dans l'ordre des lots
+        for results, commit_ms in await asyncio.gather(*(run_batch(batch) for batch in batches)):
+            # Lots en échec exclus de la latence des commits
+            if commit_ms is not None:
+                stats["commit_latency_ms"].append(round(commit_ms, 2))
+            for item, success, message in results:
+                if success:
+                    stats["success"] += 1
+                else:
+                    stats["failed"] += 1
+                    stats["errors"].append({
+                        "id": item["id"],
+                        "type": item.get("type", "post"),
+                        "title": item.get("title", ""),
+                        "error": message
+                    })
+        
+        self.logger.info(f"Mise à jour asynchrone terminée: {stats['success']} réussies, {stats['failed']} échouées")
+        return stats
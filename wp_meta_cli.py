@@ -11,14 +11,16 @@ import sys
 import json
 import logging
 import argparse
+import asyncio
 import csv
-import pandas as pd
 import requests
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
 # Import des modules existants (sans les dépendances PyQt6)
 from wp_connector import WordPressConnector
+from csv_import import CSVChunkReader, REQUIRED_COLUMNS, SEO_COLUMNS
+from csv_export import write_csv
 
 # Import conditionnel du module MySQL
 try:
@@ -61,12 +63,13 @@ class CLIDataManager:
         self.modified_items = set()
         self.logger.info("Données effacées")
     
-    def import_from_wp(self, content_data: Dict[str, List[Dict[str, Any]]]) -> None:
+    def import_from_wp(self, content_data: Dict[str, List[Dict[str, Any]]], extracted: bool = False) -> None:
         """
         Importe les données depuis WordPress
         
         Args:
             content_data: Dictionnaire avec les types de contenu comme clés et les listes d'éléments comme valeurs
+            extracted: Les éléments sont déjà des métadonnées extraites (fetch_all_content avec extract=True)
         """
         self.logger.info("Importation des données depuis WordPress")
         
@@ -85,7 +88,7 @@ class CLIDataManager:
                 print(f"Traitement de {processed}/{total_items} : {content_type} {item.get('id', 'inconnu')}")
                 
                 # Extraction des métadonnées SEO
-                if "extract_seo_metadata" in item:
+                if extracted or "extract_seo_metadata" in item:
                     # Si les métadonnées sont déjà extraites
                     metadata = item
                 else:
@@ -152,12 +155,21 @@ class CLIDataManager:
         Args:
             filepath: Chemin du fichier CSV
             content_type: Type de contenu à exporter (None = tous)
-            
+        
         Returns:
             Succès de l'exportation
         """
-        # (Code d'exportation CSV existant)
-        return True
+        try:
+            content_types = [content_type] if content_type else list(self.data.keys())
+            rows = (item for key in content_types for item in self.data.get(key, []))
+            count = write_csv(rows, filepath)
+            
+            self.logger.info(f"Exportation CSV réussie: {count} éléments exportés vers {filepath}")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'exportation CSV: {str(e)}")
+            return False
     
     def import_from_csv(self, filepath: str) -> Tuple[bool, str, int]:
         """
@@ -165,12 +177,54 @@ class CLIDataManager:
         
         Args:
             filepath: Chemin du fichier CSV
-            
+        
         Returns:
             Tuple (succès, message, nombre d'éléments importés)
         """
-        # (Code d'importation CSV existant)
-        return True, "Importation réussie", 0
+        try:
+            reader = CSVChunkReader(filepath)
+            
+            # Vérification des colonnes requises
+            if reader.missing_columns:
+                error_msg = f"Colonnes requises manquantes: {', '.join(reader.missing_columns)}"
+                self.logger.error(error_msg)
+                return False, error_msg, 0
+            
+            # Index (type, id) -> élément des données récupérées
+            index = {(content_type, int(item["id"])): item for content_type, items in self.data.items() for item in items}
+            fields = [field for field in SEO_COLUMNS if field in reader.columns]
+            updated_count = 0
+            
+            # Fusion bloc par bloc (un seul bloc en mémoire)
+            for records in reader.iter_records():
+                for record in records:
+                    try:
+                        item = index.get((record["type"], int(record["id"])))
+                    except ValueError:
+                        continue
+                    if item is None:
+                        continue
+                    
+                    for field in fields:
+                        item[field] = record[field]
+                    
+                    # Élément modifié si une valeur diffère de l'originale
+                    if any(item.get(field) != item.get(f"original_{field}", item.get(field)) for field in SEO_COLUMNS):
+                        self.modified_items.add(item["id"])
+                    else:
+                        self.modified_items.discard(item["id"])
+                    updated_count += 1
+                
+                self.logger.info(f"Importation CSV: {updated_count} éléments mis à jour ({reader.progress():.0%} du fichier)")
+            
+            self.logger.info(f"Importation CSV réussie: {updated_count} éléments mis à jour depuis {filepath} "
+                             f"(analyse {reader.engine}: {reader.throughput():.1f} Mo/s)")
+            return True, f"Importation réussie: {updated_count} éléments mis à jour", updated_count
+        
+        except Exception as e:
+            error_msg = f"Erreur lors de l'importation CSV: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg, 0
     
     def get_items_for_update(self) -> List[Dict[str, Any]]:
         """
@@ -190,7 +244,7 @@ class CLIDataManager:
         return items_to_update
 
 # Fonction pour mettre à jour les métadonnées
-def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, method="api", mysql_connector=None):
+def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, method="api", mysql_connector=None, commit_size=None, staging=False, use_async=False):
     """
     Met à jour les métadonnées SEO sur WordPress
     
@@ -201,6 +255,9 @@ def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, m
         skip_auth_check: Ignorer les erreurs d'autorisation
         method: Méthode de mise à jour ("api" ou "mysql")
         mysql_connector: Instance de WordPressDirectConnector (pour la méthode "mysql")
+        commit_size: Nombre d'articles validés par transaction MySQL (pour la méthode "mysql")
+        staging: Passer par des tables temporaires MySQL et une fusion unique (pour la méthode "mysql")
+        use_async: Écrire les lots via le backend asynchrone aiomysql (pour la méthode "mysql")
     """
     # Récupération des éléments à mettre à jour
     items_to_update = data_manager.get_items_for_update()
@@ -264,7 +321,15 @@ def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, m
             print("Connecteur MySQL non configuré")
             return
         
-        # Connexion à la base de données
+        # Backend asynchrone optionnel : repli sur le pilote bloquant si aiomysql est absent
+        if use_async:
+            from wp_meta_async_update import AIOMYSQL_AVAILABLE
+            if not AIOMYSQL_AVAILABLE:
+                logger.warning("Module aiomysql non disponible, utilisation du pilote MySQL bloquant")
+                print("Module aiomysql non disponible, utilisation du pilote MySQL bloquant")
+                use_async = False
+        
+        # Emprunt d'une connexion au pool
         print(f"Mise à jour de {len(items_to_update)} éléments via connexion MySQL directe...")
         if not mysql_connector.connect():
             logger.error("Impossible de se connecter à la base de données MySQL")
@@ -277,10 +342,16 @@ def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, m
                 print(f"Progression: {current}/{total}")
             
             # Exécution de la mise à jour
-            stats = mysql_connector.bulk_update_metadata(items_to_update, progress_callback)
+            if staging:
+                stats = mysql_connector.bulk_update_staged(items_to_update, progress_callback)
+            elif use_async:
+                stats = asyncio.run(update_metadata_async(mysql_connector, items_to_update, logger, progress_callback, commit_size))
+            else:
+                stats = mysql_connector.bulk_update_metadata(items_to_update, progress_callback, commit_size)
         finally:
-            # Fermeture de la connexion
+            # Restitution de la connexion puis fermeture du pool
             mysql_connector.disconnect()
+            mysql_connector.close_pool()
     
     else:
         logger.error(f"Méthode de mise à jour non reconnue: {method}")
@@ -298,6 +369,28 @@ def update_metadata(wp_connector, data_manager, logger, skip_auth_check=False, m
         for error in stats.get("errors", []):
             print(f"  - {error['type']} {error['id']} ({error['title']}): {error['error']}")
 
+async def update_metadata_async(mysql_connector, items, logger, progress_callback=None, commit_size=None):
+    """
+    Met à jour les métadonnées via le backend MySQL asynchrone (aiomysql)
+    
+    Args:
+        mysql_connector: Instance de WordPressDirectConnector configurée
+        items: Liste des éléments à mettre à jour
+        logger: Instance de Logger
+        progress_callback: Fonction de rappel pour suivre la progression
+        commit_size: Nombre d'articles validés par transaction MySQL
+    
+    Returns:
+        Statistiques de mise à jour
+    """
+    from wp_meta_async_update import AsyncWordPressDirectConnector
+    
+    async_connector = AsyncWordPressDirectConnector(mysql_connector, logger)
+    try:
+        return await async_connector.bulk_update_metadata(items, progress_callback, commit_size)
+    finally:
+        await async_connector.close()
+
 # Fonction pour journaliser les résultats de mise à jour
 def log_update_results(stats, logger, method="api"):
     """
@@ -340,10 +433,12 @@ def main():
     
     # Commande d'exportation
     export_parser = subparsers.add_parser("export", help="Exporter les métadonnées SEO en CSV")
-    export_parser.add_argument("--url", required=True, help="URL du site WordPress")
-    export_parser.add_argument("--token", required=True, help="Jeton d'authentification WordPress")
+    export_parser.add_argument("--url", help="URL du site WordPress (méthode api)")
+    export_parser.add_argument("--token", help="Jeton d'authentification WordPress (méthode api)")
     export_parser.add_argument("--output", required=True, help="Chemin du fichier CSV de sortie")
     export_parser.add_argument("--type", help="Type de contenu à exporter (par défaut: tous)")
+    export_parser.add_argument("--method", choices=["api", "mysql"], default="api", help="Méthode d'exportation (api ou mysql)")
+    export_parser.add_argument("--gzip", action="store_true", help="Compresser le fichier CSV en gzip (automatique avec l'extension .gz)")
     
     # Commande d'importation
     import_parser = subparsers.add_parser("import", help="Importer et mettre à jour les métadonnées SEO depuis un CSV")
@@ -354,13 +449,19 @@ def main():
     import_parser.add_argument("--skip-auth-check", action="store_true", help="Ignorer la vérification d'autorisation lors de la récupération des posts")
     import_parser.add_argument("--method", choices=["api", "mysql"], default="api", help="Méthode de mise à jour (api ou mysql)")
     
-    # Arguments MySQL pour la commande d'importation
+    # Arguments MySQL pour les commandes d'exportation et d'importation
     if MYSQL_AVAILABLE:
-        import_parser.add_argument("--db-host", help="Hôte de la base de données MySQL")
-        import_parser.add_argument("--db-user", help="Nom d'utilisateur MySQL")
-        import_parser.add_argument("--db-password", help="Mot de passe MySQL")
-        import_parser.add_argument("--db-name", help="Nom de la base de données")
-        import_parser.add_argument("--db-prefix", default="wp_", help="Préfixe des tables WordPress (par défaut: wp_)")
+        for mysql_parser in (export_parser, import_parser):
+            mysql_parser.add_argument("--db-host", help="Hôte de la base de données MySQL")
+            mysql_parser.add_argument("--db-user", help="Nom d'utilisateur MySQL")
+            mysql_parser.add_argument("--db-password", help="Mot de passe MySQL")
+            mysql_parser.add_argument("--db-name", help="Nom de la base de données")
+            mysql_parser.add_argument("--db-prefix", default="wp_", help="Préfixe des tables WordPress (par défaut: wp_)")
+            mysql_parser.add_argument("--db-pool-size", type=int, default=WordPressDirectConnector.POOL_SIZE, help=f"Taille du pool de connexions MySQL (par défaut: {WordPressDirectConnector.POOL_SIZE})")
+        import_parser.add_argument("--db-workers", type=int, default=WordPressDirectConnector.WORKERS, help=f"Nombre de workers MySQL parallèles (par défaut: {WordPressDirectConnector.WORKERS})")
+        import_parser.add_argument("--db-staging", action="store_true", help="Charger les lignes dans des tables temporaires MySQL (LOAD DATA si disponible) puis fusionner en une fois")
+        import_parser.add_argument("--db-commit-size", type=int, default=WordPressDirectConnector.BATCH_SIZE, help=f"Nombre d'articles validés par transaction MySQL (par défaut: {WordPressDirectConnector.BATCH_SIZE})")
+        import_parser.add_argument("--db-async", action="store_true", help="Écrire les lots simultanément via le pilote MySQL asynchrone (aiomysql requis)")
     
     # Commande de liste des types de contenu
     list_parser = subparsers.add_parser("list-types", help="Lister les types de contenu disponibles")
@@ -384,19 +485,54 @@ def main():
     
     # Initialisation du connecteur MySQL si nécessaire
     mysql_connector = None
-    if MYSQL_AVAILABLE and args.command == "import" and args.method == "mysql":
+    if MYSQL_AVAILABLE and args.command in ("export", "import") and args.method == "mysql":
         # Vérification des arguments MySQL
         if not args.db_host or not args.db_user or not args.db_password or not args.db_name:
-            logger.error("Arguments MySQL manquants pour la méthode de mise à jour MySQL")
+            logger.error("Arguments MySQL manquants pour la méthode MySQL")
             print("Erreur: Pour utiliser la méthode MySQL, vous devez spécifier --db-host, --db-user, --db-password et --db-name")
             return
         
         # Initialisation du connecteur MySQL
         mysql_connector = WordPressDirectConnector(logger)
-        mysql_connector.configure(args.db_host, args.db_user, args.db_password, args.db_name, args.db_prefix)
+        # Une connexion par worker en plus de celle du thread principal
+        workers = getattr(args, "db_workers", WordPressDirectConnector.WORKERS)
+        mysql_connector.configure(args.db_host, args.db_user, args.db_password, args.db_name, args.db_prefix,
+                                  max(args.db_pool_size, workers + 1))
+        mysql_connector.workers = workers
+    
+    # Progression de l'exportation en flux (fréquence limitée par write_csv)
+    def export_progress(count, total):
+        print(f"Progression: {count} éléments exportés")
     
     # Exécution de la commande
-    if args.command == "export":
+    if args.command == "export" and args.method == "mysql":
+        if not mysql_connector:
+            print("Erreur: l'exportation MySQL nécessite le module mysql.connector")
+            return
+        
+        # Lecture en flux depuis la base et écriture directe dans le CSV (mémoire constante)
+        print("Exportation directe depuis la base de données MySQL...")
+        content_types = [args.type] if args.type else None
+        start_time = datetime.now()
+        try:
+            count = write_csv(mysql_connector.iter_seo_metadata(content_types), args.output,
+                              compress=args.gzip or None, callback=export_progress)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exportation MySQL: {str(e)}")
+            print(f"Erreur lors de l'exportation MySQL: {str(e)}")
+            return
+        finally:
+            mysql_connector.close_pool()
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Exportation MySQL réussie: {count} éléments exportés vers {args.output} en {elapsed:.1f}s")
+        print(f"{count} éléments exportés vers {args.output} en {elapsed:.1f}s")
+    
+    elif args.command == "export":
+        if not args.url or not args.token:
+            print("Erreur: la méthode api nécessite --url et --token")
+            return
+        
         # Configuration de la connexion WordPress
         wp_connector.configure(args.url, args.token)
         
@@ -407,21 +543,22 @@ def main():
             print(f"Échec de la connexion: {message}")
             return
         
-        # Récupération des données
-        print("Récupération des données depuis WordPress...")
+        # Récupération des données et écriture directe dans le CSV, page par page (sans session)
+        print("Exportation des données depuis WordPress...")
         content_types = [args.type] if args.type else None
-        content_data = wp_connector.fetch_all_content(content_types)
-        
-        # Initialisation du gestionnaire de données
-        data_manager = CLIDataManager(logger)
-        # Ajout du connecteur WordPress au gestionnaire de données
-        data_manager.wp_connector = wp_connector
-        
-        # Importation des données
-        data_manager.import_from_wp(content_data)
+        start_time = datetime.now()
+        try:
+            # L'extraction des métadonnées chevauche la récupération des pages suivantes
+            count = write_csv(wp_connector.iter_content_metadata(content_types), args.output,
+                              compress=args.gzip or None, callback=export_progress)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exportation: {str(e)}")
+            print(f"Erreur lors de l'exportation: {str(e)}")
+            return
         
-        # Exportation vers CSV
-        data_manager.export_to_csv(args.output, args.type)
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Exportation réussie: {count} éléments exportés vers {args.output} en {elapsed:.1f}s")
+        print(f"{count} éléments exportés vers {args.output} en {elapsed:.1f}s")
     
     elif args.command == "import":
         # Configuration de la connexion WordPress
@@ -434,23 +571,21 @@ def main():
             print(f"Échec de la connexion: {message}")
             return
         
-        # Lire d'abord le fichier CSV pour extraire les IDs des posts à mettre à jour
+        # Lire d'abord le fichier CSV pour extraire les IDs des posts à mettre à jour (colonnes id et type, par blocs)
         try:
-            df_import = pd.read_csv(args.input, encoding="utf-8-sig", sep='\t')
-            if "id" not in df_import.columns or "type" not in df_import.columns:
+            reader = CSVChunkReader(args.input, columns=REQUIRED_COLUMNS)
+            if reader.missing_columns:
                 logger.error("Le fichier CSV doit contenir les colonnes 'id' et 'type'")
                 print("Le fichier CSV doit contenir les colonnes 'id' et 'type'")
                 return
-                
+            
             # Extraire les IDs et types uniques
             post_ids_by_type = {}
-            for _, row in df_import.iterrows():
-                post_type = row["type"]
-                post_id = int(row["id"])
-                if post_type not in post_ids_by_type:
-                    post_ids_by_type[post_type] = []
-                post_ids_by_type[post_type].append(post_id)
-                
+            for chunk in reader:
+                for post_type, post_id in zip(chunk["type"], chunk["id"]):
+                    post_ids_by_type.setdefault(post_type, {})[int(post_id)] = None
+            post_ids_by_type = {post_type: list(ids) for post_type, ids in post_ids_by_type.items()}
+            
             # Récupérer uniquement les posts spécifiés dans le CSV
             print("Récupération des données spécifiques depuis WordPress...")
             content_data = {}
@@ -502,7 +637,9 @@ def main():
         
         # Mise à jour sur WordPress si demandé
         if args.update and count > 0:
-            update_metadata(wp_connector, data_manager, logger, args.skip_auth_check, args.method, mysql_connector)
+            update_metadata(wp_connector, data_manager, logger, args.skip_auth_check, args.method, mysql_connector,
+                            getattr(args, "db_commit_size", None), getattr(args, "db_staging", False),
+                            getattr(args, "db_async", False))
     
     elif args.command == "list-types":
         # Configuration de la connexion WordPress
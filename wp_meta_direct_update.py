@@ -12,15 +12,24 @@ import sys
 import json
 import logging
 import argparse
-import csv
-import pandas as pd
+import itertools
+import time
+import threading
+import tempfile
+import shutil
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from csv_import import CSVChunkReader, SEO_COLUMNS
+from csv_export import write_csv
 
 # Importation conditionnelle de mysql.connector
 try:
     import mysql.connector
+    import mysql.connector.pooling
     MYSQL_AVAILABLE = True
 except ImportError:
     MYSQL_AVAILABLE = False
@@ -48,72 +57,287 @@ class WordPressDirectConnector:
     """Classe pour se connecter directement à la base de données WordPress"""
     
     # Paramètres de traitement par lots pour les mises à jour massives
-    BATCH_SIZE = 20       # Nombre d'éléments par lot
-    BATCH_DELAY_MS = 200  # Délai entre les lots en millisecondes
+    BATCH_SIZE = 500      # Nombre d'éléments écrits par lot (une transaction ensembliste par lot)
+    BATCH_DELAY_MS = 200  # Délai entre les lots en millisecondes (sans limitation par MAX_ROWS_PER_SECOND)
     GC_FREQUENCY = 5      # Fréquence d'exécution du garbage collector (tous les X lots)
+    WORKERS = 1           # Nombre de workers parallèles (une plage d'IDs et une connexion chacun)
+    MAX_ROWS_PER_SECOND = 5000  # Débit global maximal en articles/s, tous workers confondus (0 = illimité)
+    
+    # Paramètres du pool de connexions
+    POOL_SIZE = 5         # Nombre de connexions conservées dans le pool
+    POOL_MAX_SIZE = 32    # Limite imposée par mysql.connector.pooling
+    POOL_TIMEOUT_S = 30   # Attente maximale d'une connexion libre en secondes
+    
+    # Clés de métadonnées (titre, description) par plugin SEO, dans l'ordre de détection
+    SEO_META_KEYS = {
+        "yoast": ("_yoast_wpseo_title", "_yoast_wpseo_metadesc"),
+        "rank_math": ("rank_math_title", "rank_math_description"),
+        "aioseo": ("_aioseo_title", "_aioseo_description"),
+        "seopress": ("_seopress_titles_title", "_seopress_titles_desc"),
+        "generic": ("seo_title", "seo_description")
+    }
+    
+    PREFETCH_CHUNK = 1000  # Nombre maximal d'IDs par requête de préchargement
+    
+    # Statuts exportés (les médias ont toujours le statut "inherit")
+    EXPORT_POST_STATUSES = ("publish",)
+    EXPORT_TYPES = ("post", "page")  # Types exportés par défaut
+    
+    # Tables propres aux plugins SEO, mises à jour avec postmeta : {plugin: (table, colonne ID, filtre)}
+    WRITE_PLUGIN_TABLES = True
+    PLUGIN_TABLES = {
+        "yoast": ("yoast_indexable", "object_id", "t.object_type = 'post'"),
+        "aioseo": ("aioseo_posts", "post_id", "")
+    }
+    
+    # Tables temporaires (propres à chaque connexion) utilisées pour les écritures ensemblistes
+    STAGING_TABLE = "wpmeta_stage_postmeta"
+    STAGING_TITLES_TABLE = "wpmeta_stage_titles"
+    STAGING_DIFF_TABLE = "wpmeta_stage_diff"
+    STAGING_CHUNK = 5000  # Lignes par executemany quand LOAD DATA n'est pas disponible
+    LOOKUP_INDEX = "wpmeta_post_meta_key"  # Index (post_id, meta_key) temporaire des mises à jour massives
+    EXPLAIN_SAMPLE = 1000  # Articles récents chargés dans la table temporaire pour expliquer la fusion
     
     def __init__(self, logger: logging.Logger):
         """Initialisation du connecteur direct"""
         self.logger = logger
-        self.connection = None
-        self.cursor = None
         self.db_config = {}
         self.table_prefix = "wp_"
+        self.pool_size = self.POOL_SIZE
+        
+        # Pool partagé par tous les threads, connexion et curseur propres à chaque thread
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        
+        # Parallélisme et limitation de débit partagée par les workers
+        self.workers = self.WORKERS
+        self._throttle_lock = threading.Lock()
+        self._throttle_next = 0.0
+        self._local_infile_allowed = None  # Inconnu jusqu'au premier LOAD DATA
+        self._staging_dir = None  # Dossier privé du pool, seul autorisé pour LOAD DATA LOCAL INFILE
+        self._plugin_tables = None  # Tables propres aux plugins SEO, détectées à la première écriture
         
         # Vérification de la disponibilité du module MySQL
         if not MYSQL_AVAILABLE:
             self.logger.warning("Module mysql.connector non disponible. Les fonctionnalités MySQL seront désactivées.")
     
-    def configure(self, host: str, user: str, password: str, database: str, table_prefix: str = "wp_"):
+    @property
+    def connection(self):
+        """Connexion empruntée au pool par le thread courant"""
+        return getattr(self._local, "connection", None)
+    
+    @connection.setter
+    def connection(self, value) -> None:
+        self._local.connection = value
+    
+    @property
+    def cursor(self):
+        """Curseur du thread courant"""
+        return getattr(self._local, "cursor", None)
+    
+    @cursor.setter
+    def cursor(self, value) -> None:
+        self._local.cursor = value
+    
+    def configure(self, host: str, user: str, password: str, database: str, table_prefix: str = "wp_", pool_size: int = None):
         """Configure les paramètres de connexion à la base de données"""
-        self.db_config = {
+        db_config = {
             "host": host,
             "user": user,
             "password": password,
             "database": database
         }
+        
+        # Un changement de configuration invalide le pool existant
+        if db_config != self.db_config or (pool_size and pool_size != self.pool_size):
+            self.close_pool()
+        
+        self.db_config = db_config
         self.table_prefix = table_prefix
+        self._plugin_tables = None
+        if pool_size:
+            self.pool_size = max(1, min(int(pool_size), self.POOL_MAX_SIZE))
         self.logger.info(f"Configuration de la connexion à la base de données {database} sur {host}")
     
+    def _get_pool(self):
+        """Retourne le pool de connexions, créé à la première utilisation"""
+        with self._pool_lock:
+            if self._pool is None:
+                # Dossier privé (et non le dossier temporaire du système) : un serveur malveillant ne peut
+                # demander par LOAD DATA LOCAL que les fichiers de chargement de ce connecteur
+                if self._staging_dir is None:
+                    self._staging_dir = tempfile.mkdtemp(prefix="wpmeta_staging_")
+                self._pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name=f"wpmeta_{id(self)}_{int(time.time())}",
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    allow_local_infile_in_path=self._staging_dir,
+                    **self.db_config
+                )
+                self.logger.info(f"Pool de {self.pool_size} connexions créé pour {self.db_config.get('database')}")
+            return self._pool
+    
+    def _acquire_connection(self):
+        """
+        Emprunte une connexion au pool et vérifie qu'elle est vivante (pré-ping)
+        
+        Returns:
+            Connexion du pool, reconnectée si le serveur l'avait fermée
+        """
+        pool = self._get_pool()
+        deadline = time.monotonic() + self.POOL_TIMEOUT_S
+        
+        while True:
+            try:
+                connection = pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                # Toutes les connexions sont empruntées: attente d'une libération
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+                continue
+            
+            try:
+                connection.ping(reconnect=True, attempts=2, delay=0)
+                return connection
+            except Exception as e:
+                self.logger.warning(f"Connexion du pool inutilisable, nouvelle tentative: {str(e)}")
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+                if time.monotonic() >= deadline:
+                    raise
+    
     def connect(self) -> bool:
-        """Établit la connexion à la base de données"""
+        """Emprunte une connexion au pool pour le thread courant"""
         if not MYSQL_AVAILABLE:
             self.logger.error("Impossible de se connecter: module mysql.connector non disponible")
             return False
-            
+        
+        # Connexion déjà empruntée par ce thread: appels imbriqués
+        if self.connection is not None:
+            self._local.depth = getattr(self._local, "depth", 1) + 1
+            return True
+        
         try:
-            self.connection = mysql.connector.connect(**self.db_config)
+            self.connection = self._acquire_connection()
             self.cursor = self.connection.cursor(dictionary=True)
+            self._local.depth = 1
+            self._local.pool = self._pool  # Pool d'origine (fermeture à la restitution si le pool a été fermé)
             self.logger.info("Connexion à la base de données établie")
             return True
         except Exception as e:
             self.logger.error(f"Erreur lors de la connexion à la base de données: {str(e)}")
+            self.connection = None
+            self.cursor = None
             return False
     
     def disconnect(self):
-        """Ferme la connexion à la base de données"""
-        if self.cursor:
-            self.cursor.close()
+        """Rend la connexion du thread courant au pool"""
+        depth = getattr(self._local, "depth", 0)
+        if depth > 1:
+            self._local.depth = depth - 1
+            return
         
-        if self.connection:
-            self.connection.close()
+        try:
+            if self.cursor:
+                self.cursor.close()
+            
+            # Sur une connexion du pool, close() la remet à disposition des autres threads ;
+            # si le pool a été fermé entre-temps, la connexion est fermée réellement
+            if self.connection:
+                if getattr(self._local, "pool", None) is self._pool:
+                    self.connection.close()
+                else:
+                    self.connection.disconnect()
+        except Exception as e:
+            self.logger.warning(f"Erreur lors de la libération de la connexion: {str(e)}")
+        finally:
+            self.cursor = None
+            self.connection = None
+            self._local.pool = None
+            self._local.depth = 0
         
         self.logger.info("Connexion à la base de données fermée")
     
+    def close_pool(self) -> None:
+        """
+        Ferme les connexions inactives du pool et l'abandonne (arrêt de l'application ou reconfiguration),
+        et supprime le dossier privé de LOAD DATA LOCAL INFILE
+        
+        Les connexions encore empruntées par un thread sont fermées par disconnect() au lieu d'être
+        rendues à l'ancien pool.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+            staging_dir, self._staging_dir = self._staging_dir, None
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        if pool is None:
+            return
+        
+        # Connexions inactives vidées du pool puis fermées (disconnect est délégué à la connexion MySQL)
+        closed = 0
+        while True:
+            try:
+                connection = pool.get_connection()
+            except Exception:
+                # Pool vide (ou connexion inactive impossible à rouvrir)
+                break
+            try:
+                connection.disconnect()
+                closed += 1
+            except Exception as e:
+                self.logger.warning(f"Erreur lors de la fermeture d'une connexion du pool: {str(e)}")
+        
+        self.logger.info(f"Pool de connexions fermé ({closed} connexions inactives fermées)")
+    
+    @contextmanager
+    def pooled_connection(self):
+        """
+        Emprunte une connexion pour la durée d'un bloc with
+        
+        Raises:
+            ConnectionError: si aucune connexion n'a pu être obtenue
+        """
+        if not self.connect():
+            raise ConnectionError("Impossible de se connecter à la base de données MySQL")
+        
+        try:
+            yield self.connection
+        finally:
+            self.disconnect()
+    
+    def test_connection(self) -> Tuple[bool, str]:
+        """Teste la connexion en empruntant et rendant une connexion du pool dans le même thread"""
+        if not MYSQL_AVAILABLE:
+            return False, "Module mysql.connector non disponible"
+        
+        try:
+            with self.pooled_connection():
+                self.cursor.execute("SELECT 1")
+                self.cursor.fetchall()
+            return True, "Connexion MySQL établie avec succès"
+        except Exception as e:
+            self.logger.error(f"Erreur lors du test de connexion MySQL: {str(e)}")
+            return False, str(e)
+    
     def get_post(self, post_id: int) -> Optional[Dict[str, Any]]:
         """
         Récupère un article par son ID
         
         Args:
             post_id: ID de l'article
-            
+        
         Returns:
             Dictionnaire contenant les informations de l'article, ou None si non trouvé
         """
         if not MYSQL_AVAILABLE or not self.connection:
             self.logger.error("Connexion MySQL non disponible")
             return None
-            
+        
         try:
             # Requête pour récupérer l'article
             query = f"""
@@ -139,7 +363,7 @@ class WordPressDirectConnector:
                     post_data["meta"][row["meta_key"]] = row["meta_value"]
             
             return post_data
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la récupération de l'article {post_id}: {str(e)}")
             return None
@@ -153,67 +377,70 @@ class WordPressDirectConnector:
             seo_title: Nouveau titre SEO
             seo_description: Nouvelle description SEO
             title: Nouveau titre H1 (None = pas de changement)
-            
+        
         Returns:
             Tuple (succès, message)
         """
         if not MYSQL_AVAILABLE or not self.connection:
             return False, "Connexion MySQL non disponible"
-            
+        
         try:
-            # Vérification si l'article existe
-            post = self.get_post(post_id)
+            # Vérification de l'existence et lecture des seules métadonnées SEO
+            prefetched = self.prefetch_seo_metadata([post_id])
             
-            if not post:
+            if int(post_id) not in prefetched:
                 return False, f"Article {post_id} non trouvé"
             
             # Détection du plugin SEO utilisé
-            seo_plugin = self.detect_seo_plugin(post)
+            seo_plugin = self.detect_seo_plugin({"meta": prefetched[int(post_id)]})
             
             if not seo_plugin:
                 self.logger.warning(f"Aucun plugin SEO détecté pour l'article {post_id}")
                 seo_plugin = "generic"
             
-            # Mise à jour des métadonnées en fonction du plugin
-            if seo_plugin == "yoast":
-                # Yoast SEO
-                self.update_postmeta(post_id, "_yoast_wpseo_title", seo_title)
-                self.update_postmeta(post_id, "_yoast_wpseo_metadesc", seo_description)
-            elif seo_plugin == "rank_math":
-                # Rank Math
-                self.update_postmeta(post_id, "rank_math_title", seo_title)
-                self.update_postmeta(post_id, "rank_math_description", seo_description)
-            elif seo_plugin == "aioseo":
-                # All in One SEO
-                self.update_postmeta(post_id, "_aioseo_title", seo_title)
-                self.update_postmeta(post_id, "_aioseo_description", seo_description)
-            elif seo_plugin == "seopress":
-                # SEOPress
-                self.update_postmeta(post_id, "_seopress_titles_title", seo_title)
-                self.update_postmeta(post_id, "_seopress_titles_desc", seo_description)
-            else:
-                # Générique
-                self.update_postmeta(post_id, "seo_title", seo_title)
-                self.update_postmeta(post_id, "seo_description", seo_description)
-            
-            # Mise à jour du titre H1 si spécifié
-            if title:
-                query = f"""
-                    UPDATE {self.table_prefix}posts
-                    SET post_title = %s
-                    WHERE ID = %s
-                """
-                
-                self.cursor.execute(query, (title, post_id))
-                self.connection.commit()
+            # Écriture atomique : les métadonnées et le titre sont validés ensemble
+            self._write_item(post_id, seo_plugin, seo_title, seo_description, title)
+            self.connection.commit()
             
             self.logger.info(f"Métadonnées SEO mises à jour pour l'article {post_id}")
             return True, "Métadonnées SEO mises à jour avec succès"
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la mise à jour des métadonnées SEO de l'article {post_id}: {str(e)}")
+            self._rollback()
             return False, str(e)
     
+    def _write_item(self, post_id: int, seo_plugin: str, seo_title: str, seo_description: str, title: str = None) -> None:
+        """
+        Écrit les métadonnées SEO et le titre d'un article sans valider la transaction
+        
+        Args:
+            post_id: ID de l'article
+            seo_plugin: Plugin SEO détecté
+            seo_title: Nouveau titre SEO
+            seo_description: Nouvelle description SEO
+            title: Nouveau titre H1 (None = pas de changement)
+        """
+        title_key, description_key = self.SEO_META_KEYS[seo_plugin]
+        self._upsert_postmeta(post_id, title_key, seo_title)
+        self._upsert_postmeta(post_id, description_key, seo_description)
+        
+        # Tables propres au plugin (Yoast indexables, AIOSEO)
+        self._ensure_plugin_tables()
+        for query, params in self.plugin_item_statements(post_id, seo_plugin, seo_title, seo_description):
+            self.cursor.execute(query, params)
+        
+        # Mise à jour du titre H1 si spécifié
+        if title:
+            self.cursor.execute(*self.title_query(post_id, title))
+    
+    def _rollback(self) -> None:
+        """Annule la transaction en cours en ignorant les erreurs de connexion"""
+        try:
+            self.connection.rollback()
+        except Exception:
+            pass
+    
     def update_postmeta(self, post_id: int, meta_key: str, meta_value: str) -> bool:
         """
         Met à jour une métadonnée d'un article
@@ -222,230 +449,1527 @@ class WordPressDirectConnector:
             post_id: ID de l'article
             meta_key: Clé de la métadonnée
             meta_value: Valeur de la métadonnée
-            
+        
         Returns:
             Succès de la mise à jour
         """
         if not MYSQL_AVAILABLE or not self.connection:
             return False
-            
+        
         try:
-            # Vérification si la métadonnée existe déjà
-            query = f"""
-                SELECT meta_id
-                FROM {self.table_prefix}postmeta
-                WHERE post_id = %s AND meta_key = %s
-            """
-            
-            self.cursor.execute(query, (post_id, meta_key))
-            result = self.cursor.fetchone()
-            
-            if result:
-                # Mise à jour de la métadonnée existante
-                query = f"""
-                    UPDATE {self.table_prefix}postmeta
-                    SET meta_value = %s
-                    WHERE post_id = %s AND meta_key = %s
-                """
-                
-                self.cursor.execute(query, (meta_value, post_id, meta_key))
-            else:
-                # Création d'une nouvelle métadonnée
-                query = f"""
-                    INSERT INTO {self.table_prefix}postmeta (post_id, meta_key, meta_value)
-                    VALUES (%s, %s, %s)
-                """
-                
-                self.cursor.execute(query, (post_id, meta_key, meta_value))
-            
+            self._upsert_postmeta(post_id, meta_key, meta_value)
             self.connection.commit()
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la mise à jour de la métadonnée {meta_key} pour l'article {post_id}: {str(e)}")
+            self._rollback()
             return False
     
+    def _upsert_postmeta(self, post_id: int, meta_key: str, meta_value: str) -> None:
+        """
+        Crée ou met à jour une métadonnée sans valider la transaction
+        
+        Args:
+            post_id: ID de l'article
+            meta_key: Clé de la métadonnée
+            meta_value: Valeur de la métadonnée
+        """
+        lookup, update, insert = self.postmeta_upsert_queries(post_id, meta_key, meta_value)
+        
+        # Vérification si la métadonnée existe déjà
+        self.cursor.execute(*lookup)
+        result = self.cursor.fetchone()
+        
+        # Mise à jour de la métadonnée existante ou création d'une nouvelle métadonnée
+        self.cursor.execute(*(update if result else insert))
+    
+    def postmeta_upsert_queries(self, post_id: int, meta_key: str, meta_value: str) -> Tuple[Tuple[str, tuple], ...]:
+        """
+        Construit les requêtes d'écriture d'une métadonnée (partagées avec le backend asynchrone)
+        
+        Args:
+            post_id: ID de l'article
+            meta_key: Clé de la métadonnée
+            meta_value: Valeur de la métadonnée
+        
+        Returns:
+            Tuple de (requête, paramètres) : recherche, mise à jour si elle existe, création sinon
+        """
+        postmeta = f"{self.table_prefix}postmeta"
+        return (
+            (f"SELECT meta_id FROM {postmeta} WHERE post_id = %s AND meta_key = %s", (post_id, meta_key)),
+            (f"UPDATE {postmeta} SET meta_value = %s WHERE post_id = %s AND meta_key = %s", (meta_value, post_id, meta_key)),
+            (f"INSERT INTO {postmeta} (post_id, meta_key, meta_value) VALUES (%s, %s, %s)", (post_id, meta_key, meta_value))
+        )
+    
+    def title_query(self, post_id: int, title: str) -> Tuple[str, tuple]:
+        """
+        Construit la requête de mise à jour du titre H1 d'un article
+        
+        Args:
+            post_id: ID de l'article
+            title: Nouveau titre
+        
+        Returns:
+            Tuple (requête, paramètres)
+        """
+        return f"UPDATE {self.table_prefix}posts SET post_title = %s WHERE ID = %s", (title, post_id)
+    
     def detect_seo_plugin(self, post: Dict[str, Any]) -> Optional[str]:
         """
         Détecte le plugin SEO utilisé pour un article
         
         Args:
             post: Données de l'article
-            
+        
         Returns:
             Nom du plugin SEO détecté, ou None si aucun plugin n'est détecté
         """
         meta = post.get("meta", {})
         
-        # Yoast SEO
-        if "_yoast_wpseo_title" in meta or "_yoast_wpseo_metadesc" in meta:
-            return "yoast"
+        # Yoast SEO, Rank Math, All in One SEO puis SEOPress
+        for plugin, meta_keys in self.SEO_META_KEYS.items():
+            if plugin == "generic":
+                continue
+            if any(key in meta for key in meta_keys):
+                return plugin
+        
+        return None
+    
+    def prefetch_seo_metadata(self, post_ids: List[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Précharge l'existence et les métadonnées SEO d'une liste d'articles
+        
+        Seules les clés SEO connues sont lues (pas les colonnes de l'article ni les
+        autres métadonnées), en une requête par tranche de PREFETCH_CHUNK IDs.
         
-        # Rank Math
-        if "rank_math_title" in meta or "rank_math_description" in meta:
-            return "rank_math"
+        Args:
+            post_ids: IDs des articles
         
-        # All in One SEO
-        if "_aioseo_title" in meta or "_aioseo_description" in meta:
-            return "aioseo"
+        Returns:
+            Dictionnaire compact {ID: {meta_key: meta_value}} limité aux articles existants
+            (dictionnaire vide pour un article sans métadonnée SEO)
+        """
+        unique_ids = list(dict.fromkeys(int(post_id) for post_id in post_ids))
         
-        # SEOPress
-        if "_seopress_titles_title" in meta or "_seopress_titles_desc" in meta:
-            return "seopress"
+        prefetched = {}
+        for start in range(0, len(unique_ids), self.PREFETCH_CHUNK):
+            self.cursor.execute(*self.prefetch_query(unique_ids[start:start + self.PREFETCH_CHUNK]))
+            self.collect_prefetch_rows(self.cursor.fetchall(), prefetched)
         
-        return None
+        return prefetched
     
-    def bulk_update_metadata(self, items: List[Dict[str, Any]], callback=None) -> Dict[str, Any]:
+    def prefetch_query(self, post_ids: List[int]) -> Tuple[str, tuple]:
         """
-        Met à jour les métadonnées SEO de plusieurs articles en masse avec traitement par lots
+        Construit la requête de préchargement des métadonnées SEO d'une tranche d'articles
         
         Args:
-            items: Liste des articles à mettre à jour
-            callback: Fonction de rappel pour suivre la progression
-            
+            post_ids: IDs des articles (au plus PREFETCH_CHUNK)
+        
         Returns:
-            Statistiques de mise à jour
+            Tuple (requête, paramètres)
         """
-        import gc
-        import time
+        seo_keys = [key for keys in self.SEO_META_KEYS.values() for key in keys]
+        key_placeholders = ", ".join(["%s"] * len(seo_keys))
+        id_placeholders = ", ".join(["%s"] * len(post_ids))
         
-        stats = {
-            "total": len(items),
-            "success": 0,
-            "failed": 0,
-            "errors": []
+        query = f"""
+            SELECT p.ID AS post_id, pm.meta_key, pm.meta_value
+            FROM {self.table_prefix}posts p
+            LEFT JOIN {self.table_prefix}postmeta pm
+                ON pm.post_id = p.ID
+                AND pm.meta_key IN ({key_placeholders})
+                AND pm.meta_value <> ''
+            WHERE p.ID IN ({id_placeholders})
+        """
+        
+        return query, tuple(seo_keys) + tuple(post_ids)
+    
+    @staticmethod
+    def collect_prefetch_rows(rows: List[Dict[str, Any]], prefetched: Dict[int, Dict[str, str]]) -> None:
+        """
+        Ajoute les lignes de la requête de préchargement au dictionnaire compact
+        
+        Args:
+            rows: Lignes (post_id, meta_key, meta_value)
+            prefetched: Dictionnaire {ID: {meta_key: meta_value}} complété sur place
+        """
+        for row in rows:
+            meta = prefetched.setdefault(int(row["post_id"]), {})
+            if row["meta_key"]:
+                meta[row["meta_key"]] = row["meta_value"]
+    
+    def detect_seo_plugins(self, prefetched: Dict[int, Dict[str, str]]) -> Dict[int, str]:
+        """
+        Détecte le plugin SEO de chaque article préchargé
+        
+        Args:
+            prefetched: Résultat de prefetch_seo_metadata
+        
+        Returns:
+            Dictionnaire {ID: plugin} ("generic" si aucun plugin)
+        """
+        return {
+            post_id: self.detect_seo_plugin({"meta": meta}) or "generic"
+            for post_id, meta in prefetched.items()
         }
+    
+    def iter_seo_metadata(self, content_types: List[str] = None):
+        """
+        Lit en flux les métadonnées SEO des contenus, sans charger le résultat en mémoire
         
-        if not items:
-            return stats
-            
-        if not MYSQL_AVAILABLE or not self.connection:
-            stats["failed"] = len(items)
-            stats["errors"].append({
-                "id": 0,
-                "type": "system",
-                "title": "Erreur système",
-                "error": "Connexion MySQL non disponible"
-            })
-            return stats
+        Une requête par type joint posts et les seules clés SEO. Elle est lue par un
+        curseur non tamponné (côté serveur) sur une connexion dédiée du pool, triée
+        par ID pour regrouper les métadonnées d'un article au fil de la lecture.
         
-        # Nombre total d'éléments pour le calcul de progression
-        total_items = len(items)
-        current_progress = 0
+        Args:
+            content_types: Types de contenu (post_type) à exporter (EXPORT_TYPES par défaut)
         
-        # Diviser les éléments en lots
-        batches = [items[i:i + self.BATCH_SIZE] for i in range(0, len(items), self.BATCH_SIZE)]
-        self.logger.info(f"Traitement de {len(items)} éléments en {len(batches)} lots de {self.BATCH_SIZE} maximum")
+        Yields:
+            Dictionnaires au format de DataManager (id, type, title, url, date_modified, ...)
+        """
+        seo_keys = [key for keys in self.SEO_META_KEYS.values() for key in keys]
+        key_placeholders = ", ".join(["%s"] * len(seo_keys))
+        status_placeholders = ", ".join(["%s"] * len(self.EXPORT_POST_STATUSES))
         
-        # Traitement de chaque lot
-        for batch_index, batch in enumerate(batches):
-            self.logger.info(f"Traitement du lot {batch_index + 1}/{len(batches)} ({len(batch)} éléments)")
-            
-            # Exécution du garbage collector périodiquement
-            if batch_index % self.GC_FREQUENCY == 0 and batch_index > 0:
-                self.logger.info("Exécution du garbage collector")
-                collected = gc.collect()
-                self.logger.info(f"Objets collectés: {collected}")
-            
-            # Traitement des éléments du lot
-            for item in batch:
-                # Vérification si le titre H1 est présent dans l'élément
-                title = item.get("title_h1") if "title_h1" in item else None
-                
-                # Mise à jour des métadonnées
-                success, message = self.update_seo_metadata(
-                    item["id"],
-                    item["seo_title"],
-                    item["seo_description"],
-                    title
-                )
+        query = f"""
+            SELECT p.ID, p.post_type, p.post_title, p.guid, p.post_modified, pm.meta_key, pm.meta_value
+            FROM {self.table_prefix}posts p
+            LEFT JOIN {self.table_prefix}postmeta pm
+                ON pm.post_id = p.ID
+                AND pm.meta_key IN ({key_placeholders})
+                AND pm.meta_value <> ''
+            WHERE p.post_type = %s
+                AND (p.post_status IN ({status_placeholders}) OR p.post_type = 'attachment')
+            ORDER BY p.ID
+        """
+        
+        connection = self._acquire_connection()
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        
+        try:
+            for content_type in content_types or self.EXPORT_TYPES:
+                self.logger.info(f"Export direct des contenus de type {content_type}")
+                cursor.execute(query, tuple(seo_keys) + (content_type,) + self.EXPORT_POST_STATUSES)
                 
-                if success:
-                    stats["success"] += 1
-                else:
-                    stats["failed"] += 1
-                    stats["errors"].append({
-                        "id": item["id"],
-                        "type": item.get("type", "post"),
-                        "title": item.get("title", ""),
-                        "error": message
-                    })
+                current, meta = None, {}
+                for row in cursor:
+                    if current is not None and row["ID"] != current["ID"]:
+                        yield self._build_export_record(current, meta)
+                        meta = {}
+                    current = row
+                    if row["meta_key"]:
+                        meta[row["meta_key"]] = row["meta_value"]
                 
-                # Mise à jour de la progression
-                current_progress += 1
-                if callback:
-                    callback(current_progress, total_items)
-            
-            # Pause entre les lots pour éviter de surcharger la base de données
-            if batch_index < len(batches) - 1:  # Pas de pause après le dernier lot
-                self.logger.info(f"Pause de {self.BATCH_DELAY_MS}ms entre les lots")
-                time.sleep(self.BATCH_DELAY_MS / 1000)
-        
-        self.logger.info(f"Mise à jour en masse terminée: {stats['success']} réussies, {stats['failed']} échouées")
-        return stats
-
-def import_from_csv(filepath: str) -> List[Dict[str, Any]]:
-    """
-    Importe les données depuis un fichier CSV
+                if current is not None:
+                    yield self._build_export_record(current, meta)
+        finally:
+            # Lecture interrompue : les lignes restantes doivent être consommées avant de rendre la connexion
+            try:
+                connection.consume_results()
+                cursor.close()
+            except Exception:
+                pass
+            connection.close()
     
-    Args:
-        filepath: Chemin du fichier CSV
+    def _build_export_record(self, row: Dict[str, Any], meta: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Construit l'enregistrement exporté d'un article à partir de sa ligne et de ses métadonnées SEO
         
-    Returns:
-        Liste des éléments importés
-    """
-    try:
-        # Lecture du fichier CSV
-        df = pd.read_csv(filepath, encoding="utf-8-sig", sep='\t')
+        Args:
+            row: Ligne de posts (ID, post_type, post_title, guid, post_modified)
+            meta: Métadonnées SEO non vides de l'article
         
-        # Vérification des colonnes requises
-        required_columns = ["id", "type"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        Returns:
+            Dictionnaire au format de DataManager
+        """
+        seo_plugin = self.detect_seo_plugin({"meta": meta}) or "generic"
+        title_key, description_key = self.SEO_META_KEYS[seo_plugin]
         
-        if missing_columns:
-            print(f"Colonnes requises manquantes: {', '.join(missing_columns)}")
-            return []
+        title = row["post_title"] or ""
+        seo_title = meta.get(title_key) or title
+        seo_description = meta.get(description_key) or ""
+        date_modified = row["post_modified"]
         
-        # Conversion en liste de dictionnaires
-        csv_data = df.to_dict(orient="records")
+        return {
+            "id": row["ID"],
+            "type": row["post_type"],
+            "title": title,
+            # Le permalien n'est pas stocké en base : guid est l'URL d'origine de l'article
+            "url": row["guid"],
+            "date_modified": date_modified.isoformat() if hasattr(date_modified, "isoformat") else date_modified,
+            "original_seo_title": seo_title,
+            "original_seo_description": seo_description,
+            "original_title_h1": title,
+            "seo_title": seo_title,
+            "seo_description": seo_description,
+            "title_h1": title
+        }
+    
+    def _bulk_upsert_postmeta(self, meta_rows: Dict[Tuple[int, str], Any]) -> None:
+        """
+        Écrit un lot de métadonnées en trois instructions ensemblistes
         
-        # Filtrage des éléments avec des métadonnées SEO
-        items_to_update = []
+        Les lignes sont chargées dans une table temporaire, puis appliquées par une
+        jointure UPDATE sur les couples (post_id, meta_key) existants et un
+        INSERT ... SELECT pour les couples manquants. Aucun commit n'est effectué.
         
-        for item in csv_data:
-            if "seo_title" in item or "seo_description" in item or "title_h1" in item:
-                items_to_update.append(item)
+        Args:
+            meta_rows: Dictionnaire {(post_id, meta_key): meta_value}
+        """
+        if not meta_rows:
+            return
         
-        return items_to_update
+        self._prepare_staging_table()
         
-    except Exception as e:
-        print(f"Erreur lors de l'importation CSV: {str(e)}")
-        return []
-
-def main():
-    # Vérification de la disponibilité du module MySQL
-    if not MYSQL_AVAILABLE:
-        print("Erreur: Le module mysql.connector n'est pas installé.")
-        print("Veuillez l'installer avec la commande: pip install mysql-connector-python")
-        return
+        # executemany regroupe les valeurs en un INSERT multi-lignes
+        self.cursor.executemany(
+            self.staging_insert_query(),
+            [(post_id, meta_key, meta_value) for (post_id, meta_key), meta_value in meta_rows.items()]
+        )
         
-    # Initialisation du parser d'arguments
-    parser = argparse.ArgumentParser(description="WordPress Meta Direct Update - Mise à jour directe des métadonnées SEO dans la base de données WordPress")
+        self._merge_staged_postmeta()
     
-    # Arguments de connexion à la base de données
-    parser.add_argument("--host", required=True, help="Hôte de la base de données MySQL")
-    parser.add_argument("--user", required=True, help="Nom d'utilisateur MySQL")
-    parser.add_argument("--password", required=True, help="Mot de passe MySQL")
-    parser.add_argument("--database", required=True, help="Nom de la base de données WordPress")
-    parser.add_argument("--prefix", default="wp_", help="Préfixe des tables WordPress (par défaut: wp_)")
+    def staging_statements(self) -> List[str]:
+        """Instructions de création (si besoin) et de vidage de la table temporaire de postmeta"""
+        return [
+            # Même structure et collations que postmeta (pas de conflit de collation dans les jointures)
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {self.STAGING_TABLE} LIKE {self.table_prefix}postmeta",
+            # DELETE plutôt que TRUNCATE, qui provoquerait un commit implicite
+            f"DELETE FROM {self.STAGING_TABLE}"
+        ]
     
-    # Arguments d'importation
-    parser.add_argument("--input", required=True, help="Chemin du fichier CSV d'entrée")
+    def staging_insert_query(self) -> str:
+        """Requête d'insertion d'une ligne (post_id, meta_key, meta_value) dans la table temporaire"""
+        return f"INSERT INTO {self.STAGING_TABLE} (post_id, meta_key, meta_value) VALUES (%s, %s, %s)"
     
-    # Analyse des arguments
-    args = parser.parse_args()
+    def merge_statements(self) -> List[str]:
+        """Instructions de fusion de la table temporaire dans postmeta"""
+        stage = self.STAGING_TABLE
+        postmeta = f"{self.table_prefix}postmeta"
+        
+        return [
+            # Mise à jour des métadonnées existantes
+            f"""
+                UPDATE {postmeta} pm
+                JOIN {stage} s ON s.post_id = pm.post_id AND s.meta_key = pm.meta_key
+                SET pm.meta_value = s.meta_value
+            """,
+            # Création des métadonnées manquantes
+            f"""
+                INSERT INTO {postmeta} (post_id, meta_key, meta_value)
+                SELECT s.post_id, s.meta_key, s.meta_value
+                FROM {stage} s
+                LEFT JOIN {postmeta} pm ON pm.post_id = s.post_id AND pm.meta_key = s.meta_key
+                WHERE pm.meta_id IS NULL
+            """
+        ] + self._plugin_table_statements()
     
-    # Initialisation du logger
+    def plugin_tables_query(self) -> Tuple[str, tuple]:
+        """Requête listant les tables de plugins SEO présentes pour le préfixe configuré"""
+        tables = tuple(f"{self.table_prefix}{table}" for table, _, _ in self.PLUGIN_TABLES.values())
+        query = f"""
+            SELECT TABLE_NAME
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({", ".join(["%s"] * len(tables))})
+        """
+        return query, tables
+    
+    def set_plugin_tables(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Mémorise les plugins dont la table existe, à partir du résultat de plugin_tables_query
+        
+        Args:
+            rows: Lignes (TABLE_NAME)
+        """
+        existing = {row["TABLE_NAME"] for row in rows}
+        self._plugin_tables = {
+            plugin for plugin, (table, _, _) in self.PLUGIN_TABLES.items()
+            if f"{self.table_prefix}{table}" in existing
+        }
+        if self._plugin_tables:
+            self.logger.info(f"Tables de plugins SEO mises à jour avec postmeta: {', '.join(sorted(self._plugin_tables))}")
+    
+    def needs_plugin_tables(self) -> bool:
+        """Indique si les tables de plugins SEO restent à détecter (plugin_tables_query puis set_plugin_tables)"""
+        return self._plugin_tables is None and self.WRITE_PLUGIN_TABLES
+    
+    def _ensure_plugin_tables(self) -> None:
+        """Détecte une fois les tables de plugins SEO présentes"""
+        if self.needs_plugin_tables():
+            self.cursor.execute(*self.plugin_tables_query())
+            self.set_plugin_tables(self.cursor.fetchall())
+    
+    def _plugin_table_statements(self) -> List[str]:
+        """
+        Instructions ensemblistes d'écriture des tables de plugins depuis la table temporaire
+        
+        Les index Yoast existants sont mis à jour (Yoast crée lui-même les manquants à
+        partir de postmeta) ; les lignes AIOSEO manquantes sont créées, AIOSEO 4 lisant
+        uniquement sa table.
+        
+        Returns:
+            Liste d'instructions (vide si aucune table de plugin n'est connue)
+        """
+        statements = []
+        stage = self.STAGING_TABLE
+        
+        for plugin in sorted(self._plugin_tables or ()):
+            table, id_column, condition = self.PLUGIN_TABLES[plugin]
+            table = f"{self.table_prefix}{table}"
+            title_key, description_key = self.SEO_META_KEYS[plugin]
+            
+            where = f"WHERE {condition}" if condition else ""
+            
+            for meta_key, column in ((title_key, "title"), (description_key, "description")):
+                statements.append(f"""
+                    UPDATE {table} t
+                    JOIN {stage} s ON s.post_id = t.{id_column} AND s.meta_key = '{meta_key}'
+                    SET t.{column} = s.meta_value
+                    {where}
+                """)
+            
+            if plugin == "aioseo":
+                statements.append(f"""
+                    INSERT INTO {table} (post_id, title, description, created, updated)
+                    SELECT
+                        s.post_id,
+                        MAX(CASE WHEN s.meta_key = '{title_key}' THEN s.meta_value END),
+                        MAX(CASE WHEN s.meta_key = '{description_key}' THEN s.meta_value END),
+                        NOW(), NOW()
+                    FROM {stage} s
+                    LEFT JOIN {table} t ON t.post_id = s.post_id
+                    WHERE t.post_id IS NULL AND s.meta_key IN ('{title_key}', '{description_key}')
+                    GROUP BY s.post_id
+                """)
+        
+        return statements
+    
+    def plugin_item_statements(self, post_id: int, seo_plugin: str, seo_title: str, seo_description: str) -> List[Tuple[str, tuple]]:
+        """
+        Instructions d'écriture des tables de plugins pour un seul article
+        
+        Args:
+            post_id: ID de l'article
+            seo_plugin: Plugin SEO détecté
+            seo_title: Nouveau titre SEO
+            seo_description: Nouvelle description SEO
+        
+        Returns:
+            Liste de (requête, paramètres)
+        """
+        if seo_plugin not in (self._plugin_tables or ()):
+            return []
+        
+        table, id_column, condition = self.PLUGIN_TABLES[seo_plugin]
+        table = f"{self.table_prefix}{table}"
+        statements = [(f"""
+            UPDATE {table} t
+            SET t.title = %s, t.description = %s
+            WHERE t.{id_column} = %s {f"AND {condition}" if condition else ""}
+        """, (seo_title, seo_description, post_id))]
+        
+        if seo_plugin == "aioseo":
+            statements.append((f"""
+                INSERT INTO {table} (post_id, title, description, created, updated)
+                SELECT %s, %s, %s, NOW(), NOW()
+                FROM DUAL
+                WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.post_id = %s)
+            """, (post_id, seo_title, seo_description, post_id)))
+        
+        return statements
+    
+    def _prepare_staging_table(self) -> None:
+        """Crée (si besoin) et vide la table temporaire de postmeta"""
+        for statement in self.staging_statements():
+            self.cursor.execute(statement)
+    
+    def _merge_staged_postmeta(self) -> None:
+        """Applique la table temporaire à postmeta (UPDATE des clés existantes, INSERT des manquantes) et aux tables de plugins"""
+        self._ensure_plugin_tables()
+        for statement in self.merge_statements():
+            self.cursor.execute(statement)
+    
+    def _bulk_update_titles(self, titles: Dict[int, str]) -> None:
+        """
+        Met à jour les titres H1 d'un lot d'articles en une seule instruction
+        
+        Args:
+            titles: Dictionnaire {ID: nouveau titre}
+        """
+        if not titles:
+            return
+        
+        self.cursor.execute(*self.titles_query(titles))
+    
+    def titles_query(self, titles: Dict[int, str]) -> Tuple[str, tuple]:
+        """
+        Construit la mise à jour des titres H1 d'un lot en une seule instruction
+        
+        Args:
+            titles: Dictionnaire {ID: nouveau titre} (non vide)
+        
+        Returns:
+            Tuple (requête, paramètres)
+        """
+        cases = " ".join(["WHEN %s THEN %s"] * len(titles))
+        id_placeholders = ", ".join(["%s"] * len(titles))
+        params = [value for pair in titles.items() for value in pair] + list(titles.keys())
+        
+        query = f"""
+            UPDATE {self.table_prefix}posts
+            SET post_title = CASE ID {cases} END
+            WHERE ID IN ({id_placeholders})
+        """
+        
+        return query, tuple(params)
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> Tuple[List[Tuple[Dict[str, Any], bool, str]], Optional[float]]:
+        """
+        Écrit un lot d'articles dans une seule transaction
+        
+        Le lot est d'abord écrit de façon ensembliste. Si cette écriture échoue, il est
+        rejoué article par article, chacun sous son propre SAVEPOINT : une ligne
+        fautive est annulée seule sans perdre le reste du lot.
+        
+        Args:
+            batch: Articles du lot
+        
+        Returns:
+            Tuple (liste de (article, succès, message) dans l'ordre du lot, durée du commit en ms,
+            None si le lot a échoué)
+        """
+        try:
+            plugins = self.detect_seo_plugins(self.prefetch_seo_metadata([item["id"] for item in batch]))
+        except Exception as e:
+            self.logger.error(f"Erreur lors du préchargement du lot: {str(e)}")
+            self._rollback()
+            return [(item, False, str(e)) for item in batch], None
+        
+        results, meta_rows, titles = self.prepare_rows(batch, plugins)
+        
+        try:
+            self._bulk_upsert_postmeta(meta_rows)
+            self._bulk_update_titles(titles)
+        except Exception as e:
+            self.logger.warning(f"Écriture ensembliste du lot impossible ({str(e)}), reprise article par article")
+            self._rollback()
+            try:
+                results = self._write_items_with_savepoints(results, plugins)
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'écriture du lot: {str(e)}")
+                self._rollback()
+                return [(item, False, str(e)) for item in batch], None
+        
+        try:
+            start_time = time.perf_counter()
+            self.connection.commit()
+            commit_ms = (time.perf_counter() - start_time) * 1000
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la validation du lot: {str(e)}")
+            self._rollback()
+            return [(item, False, str(e)) for item in batch], None
+        
+        return results, commit_ms
+    
+    def prepare_rows(self, items: List[Dict[str, Any]], plugins: Dict[int, str]):
+        """
+        Prépare les lignes postmeta et les titres à écrire pour une série d'articles
+        
+        Args:
+            items: Articles à écrire
+            plugins: Dictionnaire {ID: plugin} des articles existants
+        
+        Returns:
+            Tuple (liste de (article, succès, message), {(post_id, meta_key): meta_value}, {ID: titre})
+        """
+        results = []
+        meta_rows = {}
+        titles = {}
+        
+        for item in items:
+            post_id = int(item["id"])
+            
+            if post_id not in plugins:
+                results.append((item, False, f"Article {post_id} non trouvé"))
+                continue
+            
+            if plugins[post_id] == "generic":
+                self.logger.warning(f"Aucun plugin SEO détecté pour l'article {post_id}")
+            
+            # En cas de doublon, la dernière valeur l'emporte (comme en écriture unitaire)
+            title_key, description_key = self.SEO_META_KEYS[plugins[post_id]]
+            meta_rows[(post_id, title_key)] = item["seo_title"]
+            meta_rows[(post_id, description_key)] = item["seo_description"]
+            
+            # Mise à jour du titre H1 si spécifié
+            title = item.get("title_h1")
+            if title:
+                titles[post_id] = title
+            
+            results.append((item, True, "Métadonnées SEO mises à jour avec succès"))
+        
+        return results, meta_rows, titles
+    
+    def _write_items_with_savepoints(self, results: List[Tuple[Dict[str, Any], bool, str]],
+                                     plugins: Dict[int, str]) -> List[Tuple[Dict[str, Any], bool, str]]:
+        """
+        Rejoue un lot article par article, chaque article sous son propre SAVEPOINT
+        
+        Args:
+            results: Résultats préparés par _write_batch (les échecs sont conservés tels quels)
+            plugins: Dictionnaire {ID: plugin}
+        
+        Returns:
+            Liste de (article, succès, message) dans l'ordre du lot
+        """
+        replayed = []
+        
+        for item, success, message in results:
+            if not success:
+                replayed.append((item, success, message))
+                continue
+            
+            post_id = int(item["id"])
+            try:
+                self.cursor.execute("SAVEPOINT wpmeta_item")
+                self._write_item(post_id, plugins[post_id], item["seo_title"], item["seo_description"], item.get("title_h1"))
+                self.cursor.execute("RELEASE SAVEPOINT wpmeta_item")
+                replayed.append((item, True, message))
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la mise à jour des métadonnées SEO de l'article {post_id}: {str(e)}")
+                try:
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT wpmeta_item")
+                except Exception as rollback_error:
+                    # Interblocage ou attente de verrou expirée : MySQL a déjà annulé toute la transaction
+                    # (savepoint compris), le lot entier est annulé sur l'erreur d'origine
+                    self.logger.warning(f"Retour au savepoint impossible ({str(rollback_error)}), annulation du lot")
+                    raise e
+                replayed.append((item, False, str(e)))
+        
+        return replayed
+    
+    def bulk_update_metadata(self, items: List[Dict[str, Any]], callback=None, commit_size: int = None,
+                             workers: int = None) -> Dict[str, Any]:
+        """
+        Met à jour les métadonnées SEO de plusieurs articles en masse avec traitement par lots
+        
+        Avec plusieurs workers, les articles sont triés par ID et répartis en plages
+        contiguës : chaque worker écrit sa plage avec sa propre connexion du pool et ses
+        propres transactions, sans toucher aux pages d'index des autres plages.
+        
+        Args:
+            items: Liste des articles à mettre à jour
+            callback: Fonction de rappel pour suivre la progression
+            commit_size: Nombre d'articles validés par transaction (BATCH_SIZE par défaut)
+            workers: Nombre de workers parallèles (self.workers par défaut)
+        
+        Returns:
+            Statistiques de mise à jour (dont la durée de chaque commit en ms)
+        """
+        commit_size = max(1, int(commit_size or self.BATCH_SIZE))
+        
+        # Le thread appelant conserve sa connexion : les workers se partagent le reste du pool
+        workers = max(1, min(int(workers or self.workers), self.pool_size - 1, len(items) or 1))
+        
+        stats = {
+            "total": len(items),
+            "success": 0,
+            "failed": 0,
+            "errors": [],
+            "commit_latency_ms": []
+        }
+        
+        if not items:
+            return stats
+        
+        if not MYSQL_AVAILABLE or not self.connection:
+            stats["failed"] = len(items)
+            stats["errors"].append({
+                "id": 0,
+                "type": "system",
+                "title": "Erreur système",
+                "error": "Connexion MySQL non disponible"
+            })
+            return stats
+        
+        # Progression globale, partagée par les workers
+        total_items = len(items)
+        progress = {"current": 0}
+        progress_lock = threading.Lock()
+        
+        def item_done():
+            with progress_lock:
+                progress["current"] += 1
+                current_progress = progress["current"]
+            if callback:
+                callback(current_progress, total_items)
+        
+        if workers == 1:
+            shard_stats = [self._update_shard(items, commit_size, item_done)]
+        else:
+            shards = self.split_shards(items, workers)
+            self.logger.info(f"Répartition de {len(items)} éléments sur {len(shards)} workers par plages d'IDs")
+            
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                futures = [
+                    executor.submit(self._update_shard_pooled, shard, commit_size, item_done, shard_index + 1)
+                    for shard_index, shard in enumerate(shards)
+                ]
+                shard_stats = [future.result() for future in futures]
+        
+        # Fusion des statistiques dans l'ordre des plages
+        for partial in shard_stats:
+            stats["success"] += partial["success"]
+            stats["failed"] += partial["failed"]
+            stats["errors"].extend(partial["errors"])
+            stats["commit_latency_ms"].extend(partial["commit_latency_ms"])
+        
+        if stats["commit_latency_ms"]:
+            average_ms = sum(stats["commit_latency_ms"]) / len(stats["commit_latency_ms"])
+            self.logger.info(f"Latence moyenne des commits: {average_ms:.1f}ms sur {len(stats['commit_latency_ms'])} lots")
+        
+        self.logger.info(f"Mise à jour en masse terminée: {stats['success']} réussies, {stats['failed']} échouées")
+        return stats
+    
+    def split_shards(self, items: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+        """
+        Répartit les articles en plages d'IDs contiguës et disjointes
+        
+        Les doublons d'un même ID restent dans la même plage, dans leur ordre d'origine.
+        
+        Args:
+            items: Articles à répartir
+            workers: Nombre de plages souhaité
+        
+        Returns:
+            Liste des plages, par ID croissant
+        """
+        ordered = sorted(items, key=lambda item: int(item["id"]))
+        shard_size = -(-len(ordered) // workers)
+        
+        shards = []
+        start = 0
+        while start < len(ordered):
+            end = min(start + shard_size, len(ordered))
+            while end < len(ordered) and int(ordered[end]["id"]) == int(ordered[end - 1]["id"]):
+                end += 1
+            shards.append(ordered[start:end])
+            start = end
+        
+        return shards
+    
+    def _update_shard_pooled(self, items: List[Dict[str, Any]], commit_size: int, item_done, shard_number: int) -> Dict[str, Any]:
+        """
+        Met à jour une plage d'articles depuis un worker, avec sa propre connexion du pool
+        
+        Args:
+            items: Articles de la plage
+            commit_size: Nombre d'articles validés par transaction
+            item_done: Fonction appelée après chaque article
+            shard_number: Numéro de la plage (journalisation)
+        
+        Returns:
+            Statistiques partielles de la plage
+        """
+        self.logger.info(f"Worker {shard_number}: IDs {items[0]['id']} à {items[-1]['id']} ({len(items)} éléments)")
+        
+        try:
+            with self.pooled_connection():
+                return self._update_shard(items, commit_size, item_done)
+        except ConnectionError as e:
+            self.logger.error(f"Worker {shard_number}: {str(e)}")
+            for _ in items:
+                item_done()
+            return {
+                "success": 0,
+                "failed": len(items),
+                "errors": [{"id": item["id"], "type": item.get("type", "post"), "title": item.get("title", ""), "error": str(e)}
+                           for item in items],
+                "commit_latency_ms": []
+            }
+    
+    def _update_shard(self, items: List[Dict[str, Any]], commit_size: int, item_done) -> Dict[str, Any]:
+        """
+        Met à jour une série d'articles par lots, sur la connexion du thread courant
+        
+        Args:
+            items: Articles à mettre à jour
+            commit_size: Nombre d'articles validés par transaction
+            item_done: Fonction appelée après chaque article
+        
+        Returns:
+            Statistiques partielles (success, failed, errors, commit_latency_ms)
+        """
+        import gc
+        
+        stats = {"success": 0, "failed": 0, "errors": [], "commit_latency_ms": []}
+        
+        # Diviser les éléments en lots
+        batches = [items[i:i + commit_size] for i in range(0, len(items), commit_size)]
+        self.logger.info(f"Traitement de {len(items)} éléments en {len(batches)} lots de {commit_size} maximum")
+        
+        # Traitement de chaque lot
+        for batch_index, batch in enumerate(batches):
+            self.logger.info(f"Traitement du lot {batch_index + 1}/{len(batches)} ({len(batch)} éléments)")
+            
+            # Exécution du garbage collector périodiquement
+            if batch_index % self.GC_FREQUENCY == 0 and batch_index > 0:
+                self.logger.info("Exécution du garbage collector")
+                collected = gc.collect()
+                self.logger.info(f"Objets collectés: {collected}")
+            
+            # Débit global limité, tous workers confondus
+            self._throttle(len(batch))
+            
+            # Écriture ensembliste du lot dans une seule transaction
+            results, commit_ms = self._write_batch(batch)
+            if commit_ms is not None:
+                # Lots en échec exclus de la latence des commits
+                stats["commit_latency_ms"].append(round(commit_ms, 2))
+                self.logger.info(f"Lot {batch_index + 1}/{len(batches)} validé en {commit_ms:.1f}ms")
+            else:
+                self.logger.error(f"Lot {batch_index + 1}/{len(batches)} en échec")
+            
+            for item, success, message in results:
+                if success:
+                    stats["success"] += 1
+                else:
+                    stats["failed"] += 1
+                    stats["errors"].append({
+                        "id": item["id"],
+                        "type": item.get("type", "post"),
+                        "title": item.get("title", ""),
+                        "error": message
+                    })
+                
+                # Mise à jour de la progression
+                item_done()
+            
+            # Pause fixe entre les lots, seulement sans limitation de débit (elle s'y ajouterait)
+            if batch_index < len(batches) - 1 and not self.MAX_ROWS_PER_SECOND:  # Pas de pause après le dernier lot
+                self.logger.info(f"Pause de {self.BATCH_DELAY_MS}ms entre les lots")
+                time.sleep(self.BATCH_DELAY_MS / 1000)
+        
+        return stats
+    
+    def _throttle(self, rows: int) -> None:
+        """
+        Attend le créneau d'écriture réservé dans le débit global MAX_ROWS_PER_SECOND
+        
+        Args:
+            rows: Nombre d'articles du lot à écrire
+        """
+        delay = self.throttle_delay(rows)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def throttle_delay(self, rows: int) -> float:
+        """
+        Réserve un créneau d'écriture dans le débit global MAX_ROWS_PER_SECOND
+        
+        Le créneau est partagé par les workers et par le backend asynchrone, qui attend
+        le délai retourné sans bloquer sa boucle d'événements.
+        
+        Args:
+            rows: Nombre d'articles du lot à écrire
+        
+        Returns:
+            Délai d'attente avant l'écriture en secondes (0 sans limitation)
+        """
+        if not self.MAX_ROWS_PER_SECOND:
+            return 0.0
+        
+        with self._throttle_lock:
+            now = time.monotonic()
+            start = max(now, self._throttle_next)
+            self._throttle_next = start + rows / self.MAX_ROWS_PER_SECOND
+        
+        return start - now
+    
+    def bulk_update_staged(self, items: List[Dict[str, Any]], callback=None, benchmark: bool = False) -> Dict[str, Any]:
+        """
+        Met à jour un très grand nombre d'articles via des tables temporaires et une fusion unique
+        
+        Les lignes préparées sont écrites dans un fichier temporaire et chargées par
+        LOAD DATA LOCAL INFILE quand le serveur l'autorise (executemany par tranches
+        sinon), puis appliquées à postmeta et posts en une fusion ensembliste, dans une
+        seule transaction.
+        
+        Args:
+            items: Liste des articles à mettre à jour
+            callback: Fonction de rappel pour suivre la progression
+            benchmark: Charger les lignes par les deux méthodes et comparer leur débit
+        
+        Returns:
+            Statistiques de mise à jour, avec le détail du chargement dans stats["staging"]
+        """
+        stats = {
+            "total": len(items),
+            "success": 0,
+            "failed": 0,
+            "errors": [],
+            "staging": {}
+        }
+        
+        if not items:
+            return stats
+        
+        if not MYSQL_AVAILABLE or not self.connection:
+            stats["failed"] = len(items)
+            stats["errors"].append({
+                "id": 0,
+                "type": "system",
+                "title": "Erreur système",
+                "error": "Connexion MySQL non disponible"
+            })
+            return stats
+        
+        try:
+            plugins = self.detect_seo_plugins(self.prefetch_seo_metadata([item["id"] for item in items]))
+            results, meta_rows, titles = self.prepare_rows(items, plugins)
+            
+            # Chargement des tables temporaires
+            self._prepare_staging_table()
+            self.cursor.execute(f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {self.STAGING_TITLES_TABLE} (
+                    ID BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+                    post_title TEXT NOT NULL
+                ) DEFAULT CHARSET = utf8mb4
+            """)
+            self.cursor.execute(f"DELETE FROM {self.STAGING_TITLES_TABLE}")
+            
+            meta_values = [(post_id, meta_key, meta_value) for (post_id, meta_key), meta_value in meta_rows.items()]
+            methods = ("load_data", "executemany") if benchmark else (None,)
+            for method in methods:
+                self.cursor.execute(f"DELETE FROM {self.STAGING_TABLE}")
+                used_method, elapsed = self._load_staging(self.STAGING_TABLE, ("post_id", "meta_key", "meta_value"), meta_values, method)
+                rate = len(meta_values) / elapsed if elapsed > 0 else 0.0
+                # Cumul par méthode : un repli de LOAD DATA sur executemany ne remplace pas la mesure précédente
+                merge_update_stats(stats, {"staging": {used_method: {"rows": len(meta_values), "seconds": elapsed}}})
+                self.logger.info(f"Chargement de {len(meta_values)} lignes par {used_method}: {elapsed:.2f}s ({rate:.0f} lignes/s)")
+            
+            self._load_staging(self.STAGING_TITLES_TABLE, ("ID", "post_title"), list(titles.items()))
+            
+            # Fusion ensembliste et validation unique
+            start_time = time.perf_counter()
+            self._merge_staged_postmeta()
+            self.cursor.execute(f"""
+                UPDATE {self.table_prefix}posts p
+                JOIN {self.STAGING_TITLES_TABLE} t ON t.ID = p.ID
+                SET p.post_title = t.post_title
+            """)
+            self.connection.commit()
+            merge_s = time.perf_counter() - start_time
+            stats["staging"]["merge_seconds"] = round(merge_s, 3)
+            self.logger.info(f"Fusion des tables temporaires validée en {merge_s:.2f}s")
+        
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la mise à jour par tables temporaires: {str(e)}")
+            self._rollback()
+            results = [(item, False, str(e)) for item in items]
+        
+        for item, success, message in results:
+            if success:
+                stats["success"] += 1
+            else:
+                stats["failed"] += 1
+                stats["errors"].append({
+                    "id": item["id"],
+                    "type": item.get("type", "post"),
+                    "title": item.get("title", ""),
+                    "error": message
+                })
+        
+        if callback:
+            callback(len(items), len(items))
+        
+        self.logger.info(f"Mise à jour par tables temporaires terminée: {stats['success']} réussies, {stats['failed']} échouées")
+        return stats
+    
+    def _load_staging(self, table: str, columns: Tuple[str, ...], rows: List[Tuple], method: str = None) -> Tuple[str, float]:
+        """
+        Charge des lignes dans une table temporaire
+        
+        Args:
+            table: Table temporaire
+            columns: Colonnes chargées
+            rows: Lignes à charger
+            method: "load_data", "executemany" ou None (LOAD DATA si le serveur l'autorise)
+        
+        Returns:
+            Tuple (méthode utilisée, durée en secondes)
+        """
+        start_time = time.perf_counter()
+        
+        if not rows:
+            return method or "executemany", 0.0
+        
+        if method != "executemany" and self._local_infile_allowed is not False:
+            try:
+                self._load_data_infile(table, columns, rows)
+                self._local_infile_allowed = True
+                return "load_data", time.perf_counter() - start_time
+            except Exception as e:
+                # local_infile désactivé côté serveur ou client : repli sur les INSERT multi-lignes
+                self.logger.warning(f"LOAD DATA LOCAL INFILE indisponible ({str(e)}), repli sur executemany")
+                self._local_infile_allowed = False
+                self.cursor.execute(f"DELETE FROM {table}")
+                start_time = time.perf_counter()
+        
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        for start in range(0, len(rows), self.STAGING_CHUNK):
+            self.cursor.executemany(query, rows[start:start + self.STAGING_CHUNK])
+        
+        return "executemany", time.perf_counter() - start_time
+    
+    def _load_data_infile(self, table: str, columns: Tuple[str, ...], rows: List[Tuple]) -> None:
+        """
+        Charge des lignes par LOAD DATA LOCAL INFILE depuis un fichier temporaire
+        
+        Args:
+            table: Table temporaire
+            columns: Colonnes chargées
+            rows: Lignes à charger
+        """
+        def field(value) -> str:
+            if value is None:
+                return "\\N"
+            return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+                    .replace("\n", "\\n").replace("\r", "\\r").replace("\0", "\\0"))
+        
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", suffix=".tsv",
+                                         dir=self._staging_dir, delete=False) as f:
+            for row in rows:
+                f.write("\t".join(field(value) for value in row) + "\n")
+            filepath = f.name
+        
+        try:
+            self.cursor.execute(f"""
+                LOAD DATA LOCAL INFILE %s
+                INTO TABLE {table}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY '\\t'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(columns)})
+            """, (filepath,))
+        finally:
+            os.remove(filepath)
+    
+    def preview_updates(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Calcule, sans rien écrire, la différence entre les articles à mettre à jour et la base
+        
+        Les lignes sont chargées dans une table temporaire. Les métadonnées SEO actuelles
+        des articles concernés sont agrégées en une requête, puis une seule requête de
+        différence détecte le plugin, compare chaque champ (comparaison binaire, sensible
+        à la casse) et repère les métadonnées à créer.
+        
+        Args:
+            items: Liste des articles à mettre à jour
+        
+        Returns:
+            Dictionnaire {"counts": {unchanged, changed, missing, new_meta_rows, seo_title,
+            seo_description, title_h1}, "rows": lignes de différence exportables (DIFF_COLUMNS)}
+        """
+        def text(value) -> Optional[str]:
+            # Valeurs absentes de pandas (NaN) et None : pas de valeur
+            if value is None or (isinstance(value, float) and value != value):
+                return None
+            return str(value)
+        
+        seo_keys = [key for keys in self.SEO_META_KEYS.values() for key in keys]
+        key_placeholders = ", ".join(["%s"] * len(seo_keys))
+        stage = self.STAGING_DIFF_TABLE
+        current = f"{stage}_current"
+        
+        try:
+            # Table temporaire des valeurs proposées (une ligne par ligne du fichier)
+            self.cursor.execute(f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {stage} (
+                    row_num INT UNSIGNED NOT NULL PRIMARY KEY,
+                    post_id BIGINT UNSIGNED NOT NULL,
+                    seo_title LONGTEXT NULL,
+                    seo_description LONGTEXT NULL,
+                    title_h1 TEXT NULL,
+                    KEY post_id (post_id)
+                ) DEFAULT CHARSET = utf8mb4
+            """)
+            self.cursor.execute(f"DELETE FROM {stage}")
+            self._load_staging(stage, ("row_num", "post_id", "seo_title", "seo_description", "title_h1"), [
+                (row_num, int(item["id"]), text(item.get("seo_title")), text(item.get("seo_description")), text(item.get("title_h1")))
+                for row_num, item in enumerate(items)
+            ])
+            
+            # Valeurs actuelles de toutes les clés SEO des articles concernés (NULL = clé absente)
+            columns = ",\n".join(f"MAX(CASE WHEN pm.meta_key = %s THEN pm.meta_value END) AS k{index}"
+                                  for index in range(len(seo_keys)))
+            self.cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {current}")
+            self.cursor.execute(f"""
+                CREATE TEMPORARY TABLE {current} (PRIMARY KEY (post_id))
+                SELECT pm.post_id, {columns}
+                FROM (SELECT DISTINCT post_id FROM {stage}) s
+                JOIN {self.table_prefix}postmeta pm
+                    ON pm.post_id = s.post_id AND pm.meta_key IN ({key_placeholders})
+                GROUP BY pm.post_id
+            """, tuple(seo_keys) + tuple(seo_keys))
+            
+            # Détection du plugin dans l'ordre de detect_seo_plugin (clés non vides)
+            plugins = [plugin for plugin in self.SEO_META_KEYS if plugin != "generic"]
+            plugin_case = " ".join(
+                f"WHEN c.k{2 * index} <> '' OR c.k{2 * index + 1} <> '' THEN '{plugin}'"
+                for index, plugin in enumerate(plugins)
+            )
+            title_case = " ".join(f"WHEN '{plugin}' THEN d.k{2 * index}" for index, plugin in enumerate(self.SEO_META_KEYS))
+            description_case = " ".join(f"WHEN '{plugin}' THEN d.k{2 * index + 1}" for index, plugin in enumerate(self.SEO_META_KEYS))
+            key_columns = ", ".join(f"c.k{index}" for index in range(len(seo_keys)))
+            
+            self.cursor.execute(f"""
+                SELECT
+                    x.*,
+                    NOT (BINARY x.seo_title <=> BINARY x.current_seo_title) AS seo_title_changed,
+                    NOT (BINARY x.seo_description <=> BINARY x.current_seo_description) AS seo_description_changed,
+                    (x.title_h1 <> '' AND NOT (BINARY x.title_h1 <=> BINARY x.current_title_h1)) AS title_h1_changed,
+                    (x.current_seo_title IS NULL) + (x.current_seo_description IS NULL) AS new_meta_rows
+                FROM (
+                    SELECT
+                        d.row_num, d.post_id, d.found, d.plugin,
+                        d.seo_title, d.seo_description, d.title_h1,
+                        d.post_title AS current_title_h1,
+                        CASE d.plugin {title_case} END AS current_seo_title,
+                        CASE d.plugin {description_case} END AS current_seo_description
+                    FROM (
+                        SELECT
+                            s.row_num, s.post_id, s.seo_title, s.seo_description, s.title_h1,
+                            p.ID IS NOT NULL AS found, p.post_title, {key_columns},
+                            CASE {plugin_case} ELSE 'generic' END AS plugin
+                        FROM {stage} s
+                        LEFT JOIN {self.table_prefix}posts p ON p.ID = s.post_id
+                        LEFT JOIN {current} c ON c.post_id = s.post_id
+                    ) d
+                ) x
+                ORDER BY x.row_num
+            """)
+            diff_rows = self.cursor.fetchall()
+        finally:
+            # Aucune écriture durable : seules les tables temporaires ont été modifiées
+            self._rollback()
+        
+        counts = {"unchanged": 0, "changed": 0, "missing": 0, "new_meta_rows": 0,
+                  "seo_title": 0, "seo_description": 0, "title_h1": 0}
+        rows = []
+        
+        for row in diff_rows:
+            changed_fields = []
+            if not row["found"]:
+                status = "missing"
+            else:
+                changed_fields = [field for field in ("seo_title", "seo_description", "title_h1") if row[f"{field}_changed"]]
+                status = "changed" if changed_fields else "unchanged"
+                counts["new_meta_rows"] += int(row["new_meta_rows"])
+                for field in changed_fields:
+                    counts[field] += 1
+            counts[status] += 1
+            
+            rows.append({
+                "id": row["post_id"],
+                "status": status,
+                "changed_fields": "|".join(changed_fields),
+                "plugin": row["plugin"] if row["found"] else "",
+                "new_meta_rows": int(row["new_meta_rows"]) if row["found"] else 0,
+                "current_seo_title": row["current_seo_title"],
+                "seo_title": row["seo_title"],
+                "current_seo_description": row["current_seo_description"],
+                "seo_description": row["seo_description"],
+                "current_title_h1": row["current_title_h1"],
+                "title_h1": row["title_h1"]
+            })
+        
+        self.logger.info(
+            f"Simulation: {counts['changed']} modifiés, {counts['unchanged']} inchangés, "
+            f"{counts['missing']} introuvables, {counts['new_meta_rows']} métadonnées à créer"
+        )
+        return {"counts": counts, "rows": rows}
+    
+    def inspect_schema(self) -> Dict[str, Any]:
+        """
+        Inspecte les index et la taille des tables WordPress du préfixe configuré
+        
+        Returns:
+            Dictionnaire {"tables": {table: tailles}, "indexes": {table: {index: colonnes}},
+            "lookup_index": index couvrant (post_id, meta_key) ou None, "local_infile": bool}
+        """
+        report = {"tables": {}, "indexes": {}, "lookup_index": None, "local_infile": False}
+        
+        # Tailles estimées (TABLE_ROWS est une estimation InnoDB)
+        self.cursor.execute("""
+            SELECT TABLE_NAME, ENGINE, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE %s
+            ORDER BY DATA_LENGTH + INDEX_LENGTH DESC
+        """, (self.table_prefix.replace("_", "\\_") + "%",))
+        for row in self.cursor.fetchall():
+            report["tables"][row["TABLE_NAME"]] = {
+                "engine": row["ENGINE"],
+                "rows": int(row["TABLE_ROWS"] or 0),
+                "data_mb": round((row["DATA_LENGTH"] or 0) / 1048576, 1),
+                "index_mb": round((row["INDEX_LENGTH"] or 0) / 1048576, 1)
+            }
+        
+        for table in ("posts", "postmeta"):
+            self.cursor.execute(f"SHOW INDEX FROM {self.table_prefix}{table}")
+            indexes = {}
+            for row in self.cursor.fetchall():
+                column = row["Column_name"] + (f"({row['Sub_part']})" if row["Sub_part"] else "")
+                indexes.setdefault(row["Key_name"], []).append(column)
+            report["indexes"][f"{self.table_prefix}{table}"] = indexes
+        
+        # Index permettant de résoudre (post_id, meta_key) sans parcourir toutes les métadonnées de l'article
+        for name, columns in report["indexes"][f"{self.table_prefix}postmeta"].items():
+            if len(columns) >= 2 and columns[0] == "post_id" and columns[1].startswith("meta_key"):
+                report["lookup_index"] = name
+                break
+        
+        self.cursor.execute("SELECT @@GLOBAL.local_infile AS local_infile")
+        report["local_infile"] = bool(int(self.cursor.fetchone()["local_infile"] or 0))
+        
+        return report
+    
+    def explain_queries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Exécute EXPLAIN sur les requêtes réellement utilisées par le connecteur
+        
+        Les requêtes sont expliquées pour un article existant (le plus récent) et ne
+        sont pas exécutées. Pour la fusion, la table temporaire est d'abord remplie avec
+        les métadonnées SEO des EXPLAIN_SAMPLE articles les plus récents (sur une table
+        vide, le plan et l'estimation de l'optimiseur n'auraient pas de sens), puis vidée.
+        
+        Returns:
+            Dictionnaire {requête: {"rows": lignes examinées estimées, "plan": lignes EXPLAIN}}
+        """
+        self.cursor.execute(f"SELECT ID FROM {self.table_prefix}posts ORDER BY ID DESC LIMIT %s", (self.EXPLAIN_SAMPLE,))
+        sample_ids = [row["ID"] for row in self.cursor.fetchall()]
+        post_id = sample_ids[0] if sample_ids else 0
+        seo_keys = [key for keys in self.SEO_META_KEYS.values() for key in keys]
+        key_placeholders = ", ".join(["%s"] * len(seo_keys))
+        postmeta = f"{self.table_prefix}postmeta"
+        
+        # Table temporaire remplie comme pour une vraie mise à jour (titre et description de chaque article)
+        self._prepare_staging_table()
+        self.cursor.executemany(self.staging_insert_query(), [
+            (sample_id, meta_key, "") for sample_id in sample_ids for meta_key in self.SEO_META_KEYS["yoast"]
+        ])
+        
+        queries = {
+            "prefetch": (f"""
+                SELECT p.ID AS post_id, pm.meta_key, pm.meta_value
+                FROM {self.table_prefix}posts p
+                LEFT JOIN {postmeta} pm
+                    ON pm.post_id = p.ID
+                    AND pm.meta_key IN ({key_placeholders})
+                    AND pm.meta_value <> ''
+                WHERE p.ID IN (%s)
+            """, tuple(seo_keys) + (post_id,)),
+            "lookup": (f"SELECT meta_id FROM {postmeta} WHERE post_id = %s AND meta_key = %s",
+                       (post_id, seo_keys[0])),
+            "update": (f"UPDATE {postmeta} SET meta_value = %s WHERE post_id = %s AND meta_key = %s",
+                       ("", post_id, seo_keys[0])),
+            "merge_update": (f"""
+                UPDATE {postmeta} pm
+                JOIN {self.STAGING_TABLE} s ON s.post_id = pm.post_id AND s.meta_key = pm.meta_key
+                SET pm.meta_value = s.meta_value
+            """, ())
+        }
+        
+        plans = {}
+        try:
+            for name, (query, params) in queries.items():
+                self.cursor.execute("EXPLAIN " + query, params)
+                plan = self.cursor.fetchall()
+                # Pour la jointure, seules les lignes examinées par ligne temporaire comptent
+                examined = [int(row["rows"] or 0) for row in plan if row["table"] != "s"]
+                plans[name] = {"rows": max(examined) if examined else 0, "plan": plan}
+        finally:
+            self.cursor.execute(f"DELETE FROM {self.STAGING_TABLE}")
+        
+        return plans
+    
+    def advise(self) -> Dict[str, Any]:
+        """
+        Diagnostique le schéma et recommande une stratégie d'écriture
+        
+        Returns:
+            Rapport (voir inspect_schema) complété par "explain", "cost_per_item"
+            (lignes examinées par article pour chaque stratégie) et "advice" (liste de conseils)
+        """
+        report = self.inspect_schema()
+        report["explain"] = self.explain_queries()
+        
+        # Deux métadonnées par article : recherche + écriture par article, jointure par ligne temporaire
+        explain = report["explain"]
+        report["cost_per_item"] = {
+            "unitaire": 2 * (explain["lookup"]["rows"] + explain["update"]["rows"]),
+            "ensembliste": explain["prefetch"]["rows"] + 2 * explain["merge_update"]["rows"]
+        }
+        
+        postmeta_rows = report["tables"].get(f"{self.table_prefix}postmeta", {}).get("rows", 0)
+        advice = []
+        
+        if not report["lookup_index"]:
+            advice.append(
+                f"Aucun index (post_id, meta_key) sur {self.table_prefix}postmeta : chaque recherche parcourt "
+                f"toutes les métadonnées de l'article. Utiliser --temp-index pendant les mises à jour massives."
+            )
+        
+        if report["local_infile"]:
+            advice.append("local_infile est activé : --staging (LOAD DATA) est la stratégie la plus rapide pour plus de 10 000 articles.")
+        else:
+            advice.append("local_infile est désactivé : --staging utilisera executemany, préférer --workers pour plus de 10 000 articles.")
+        
+        if postmeta_rows > 1000000:
+            advice.append(
+                f"{self.table_prefix}postmeta compte environ {postmeta_rows} lignes : garder un --commit-size "
+                f"modéré ({self.BATCH_SIZE}) pour limiter la durée des verrous."
+            )
+        else:
+            advice.append("Table postmeta de taille modeste : le mode par lots par défaut suffit.")
+        
+        report["advice"] = advice
+        return report
+    
+    def create_lookup_index(self) -> bool:
+        """
+        Crée l'index temporaire (post_id, meta_key) si aucun index équivalent n'existe
+        
+        Returns:
+            True si l'index a été créé (et devra être supprimé), False sinon
+        """
+        if self.inspect_schema()["lookup_index"]:
+            return False
+        
+        self.logger.info(f"Création de l'index temporaire {self.LOOKUP_INDEX} sur {self.table_prefix}postmeta")
+        # meta_key(191) : longueur maximale indexable en utf8mb4 sur les anciennes versions d'InnoDB
+        method = self._alter_postmeta(f"ADD INDEX {self.LOOKUP_INDEX} (post_id, meta_key(191))")
+        self.logger.info(f"Index temporaire {self.LOOKUP_INDEX} créé ({method})")
+        return True
+    
+    def drop_lookup_index(self) -> bool:
+        """
+        Supprime l'index temporaire (post_id, meta_key) s'il existe
+        
+        Returns:
+            True si l'index a été supprimé, False s'il n'existait pas
+        """
+        self.cursor.execute(f"SHOW INDEX FROM {self.table_prefix}postmeta WHERE Key_name = %s", (self.LOOKUP_INDEX,))
+        if not self.cursor.fetchall():
+            self.logger.info(f"Index temporaire {self.LOOKUP_INDEX} absent, rien à supprimer")
+            return False
+        
+        self.logger.info(f"Suppression de l'index temporaire {self.LOOKUP_INDEX}")
+        method = self._alter_postmeta(f"DROP INDEX {self.LOOKUP_INDEX}")
+        self.logger.info(f"Index temporaire {self.LOOKUP_INDEX} supprimé ({method})")
+        return True
+    
+    def _alter_postmeta(self, operation: str) -> str:
+        """
+        Modifie un index de la table postmeta, en DDL en ligne si le serveur l'accepte
+        
+        Les serveurs anciens (MySQL 5.5, certaines versions de MariaDB) ou certains moteurs refusent
+        ALGORITHM = INPLACE, LOCK = NONE : l'opération est alors reprise par un ALTER TABLE simple,
+        qui peut bloquer les écritures sur la table pendant sa durée.
+        
+        Args:
+            operation: Clause de l'ALTER TABLE (ADD INDEX ... ou DROP INDEX ...)
+        
+        Returns:
+            Méthode utilisée ("DDL en ligne" ou "ALTER TABLE simple")
+        """
+        try:
+            self.cursor.execute(f"ALTER TABLE {self.table_prefix}postmeta {operation}, ALGORITHM = INPLACE, LOCK = NONE")
+            return "DDL en ligne"
+        except mysql.connector.Error as e:
+            self.logger.warning(f"DDL en ligne refusé par le serveur ({str(e)}), reprise par un ALTER TABLE simple")
+        
+        self.cursor.execute(f"ALTER TABLE {self.table_prefix}postmeta {operation}")
+        return "ALTER TABLE simple"
+    
+    @contextmanager
+    def temporary_lookup_index(self):
+        """Crée l'index (post_id, meta_key) pour la durée d'un bloc with s'il n'existe pas déjà"""
+        created = self.create_lookup_index()
+        try:
+            yield
+        finally:
+            if created:
+                self.drop_lookup_index()
+
+def iter_import_chunks(filepath: str, chunk_rows: int = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Lit un fichier CSV par blocs et produit les éléments à mettre à jour de chaque bloc
+    
+    Un seul bloc est converti en dictionnaires à la fois : la mémoire occupée dépend de la taille
+    des blocs et non de celle du fichier.
+    
+    Args:
+        filepath: Chemin du fichier CSV (séparateur détecté automatiquement)
+        chunk_rows: Lignes par bloc (CSVChunkReader.CHUNK_ROWS par défaut)
+    
+    Returns:
+        Itérateur de listes d'éléments
+    """
+    reader = CSVChunkReader(filepath, chunk_rows=chunk_rows)
+    
+    # Vérification des colonnes requises
+    if reader.missing_columns:
+        print(f"Colonnes requises manquantes: {', '.join(reader.missing_columns)}")
+        return
+    
+    # Éléments avec des métadonnées SEO uniquement
+    if not any(column in reader.columns for column in SEO_COLUMNS):
+        return
+    
+    for items in reader.iter_records():
+        print(f"Lecture de {filepath}: {reader.progress():.0%} ({reader.bytes_read / 1e6:.1f} Mo, {reader.throughput():.1f} Mo/s)")
+        yield items
+    
+    print(f"Analyse CSV terminée ({reader.engine}): {reader.bytes_read / 1e6:.1f} Mo à {reader.throughput():.1f} Mo/s")
+
+def import_from_csv(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Importe les données depuis un fichier CSV
+    
+    Args:
+        filepath: Chemin du fichier CSV
+    
+    Returns:
+        Liste des éléments importés
+    """
+    try:
+        items_to_update = []
+        for items in iter_import_chunks(filepath):
+            items_to_update.extend(items)
+        return items_to_update
+    
+    except Exception as e:
+        print(f"Erreur lors de l'importation CSV: {str(e)}")
+        return []
+
+def merge_update_stats(stats: Dict[str, Any], partial: Dict[str, Any]) -> None:
+    """
+    Ajoute les statistiques de mise à jour d'un bloc aux statistiques globales
+    
+    Args:
+        stats: Statistiques globales (modifiées en place)
+        partial: Statistiques du bloc
+    """
+    for key in ("total", "success", "failed"):
+        stats[key] = stats.get(key, 0) + partial.get(key, 0)
+    stats.setdefault("errors", []).extend(partial.get("errors", []))
+    
+    for method, result in partial.get("staging", {}).items():
+        staging = stats.setdefault("staging", {})
+        if isinstance(result, dict):
+            total = staging.setdefault(method, {"rows": 0, "seconds": 0.0, "rows_per_s": 0})
+            total["rows"] += result["rows"]
+            total["seconds"] = round(total["seconds"] + result["seconds"], 3)
+            total["rows_per_s"] = round(total["rows"] / total["seconds"]) if total["seconds"] else 0
+        else:
+            staging[method] = round(staging.get(method, 0) + result, 3)
+
+# Colonnes du fichier de différence de WordPressDirectConnector.preview_updates
+DIFF_COLUMNS = [
+    "id", "status", "changed_fields", "plugin", "new_meta_rows",
+    "current_seo_title", "seo_title", "current_seo_description", "seo_description",
+    "current_title_h1", "title_h1"
+]
+
+def advise_schema(wp_direct: WordPressDirectConnector, args) -> None:
+    """
+    Affiche le diagnostic du schéma et gère l'index temporaire (sous-commande advise)
+    
+    Args:
+        wp_direct: Connecteur connecté
+        args: Arguments de la ligne de commande
+    """
+    if args.drop_index:
+        if wp_direct.drop_lookup_index():
+            print(f"Index {wp_direct.LOOKUP_INDEX} supprimé")
+        else:
+            print(f"Index {wp_direct.LOOKUP_INDEX} absent, rien à supprimer")
+    
+    if args.create_index:
+        if wp_direct.create_lookup_index():
+            print(f"Index {wp_direct.LOOKUP_INDEX} créé")
+        else:
+            print("Un index (post_id, meta_key) existe déjà")
+    
+    report = wp_direct.advise()
+    
+    print("Tables:")
+    for table, info in report["tables"].items():
+        print(f"  - {table} ({info['engine']}): ~{info['rows']} lignes, données {info['data_mb']} Mo, index {info['index_mb']} Mo")
+    
+    print("Index:")
+    for table, indexes in report["indexes"].items():
+        for name, columns in indexes.items():
+            print(f"  - {table}.{name} ({', '.join(columns)})")
+    
+    print("Plans d'exécution (lignes examinées estimées):")
+    for name, explain in report["explain"].items():
+        keys = ", ".join(str(row.get("key")) for row in explain["plan"])
+        print(f"  - {name}: {explain['rows']} lignes, index utilisés: {keys}")
+    
+    print("Coût estimé par article (lignes examinées):")
+    for strategy, cost in report["cost_per_item"].items():
+        print(f"  - {strategy}: {cost}")
+    
+    print("Recommandations:")
+    for advice in report["advice"]:
+        print(f"  - {advice}")
+
+def main():
+    # Vérification de la disponibilité du module MySQL
+    if not MYSQL_AVAILABLE:
+        print("Erreur: Le module mysql.connector n'est pas installé.")
+        print("Veuillez l'installer avec la commande: pip install mysql-connector-python")
+        return
+    
+    # Initialisation du parser d'arguments
+    parser = argparse.ArgumentParser(description="WordPress Meta Direct Update - Mise à jour directe des métadonnées SEO dans la base de données WordPress")
+    
+    # Arguments de connexion à la base de données
+    parser.add_argument("--host", required=True, help="Hôte de la base de données MySQL")
+    parser.add_argument("--user", required=True, help="Nom d'utilisateur MySQL")
+    parser.add_argument("--password", required=True, help="Mot de passe MySQL")
+    parser.add_argument("--database", required=True, help="Nom de la base de données WordPress")
+    parser.add_argument("--prefix", default="wp_", help="Préfixe des tables WordPress (par défaut: wp_)")
+    parser.add_argument("--pool-size", type=int, default=WordPressDirectConnector.POOL_SIZE, help=f"Taille du pool de connexions (par défaut: {WordPressDirectConnector.POOL_SIZE})")
+    parser.add_argument("--workers", type=int, default=WordPressDirectConnector.WORKERS, help=f"Nombre de workers parallèles (par défaut: {WordPressDirectConnector.WORKERS})")
+    parser.add_argument("--staging", action="store_true", help=f"Charger les lignes dans des tables temporaires (LOAD DATA si disponible) puis les fusionner, une transaction par bloc de {CSVChunkReader.CHUNK_ROWS} lignes du fichier")
+    parser.add_argument("--benchmark-staging", action="store_true", help="Comme --staging, en mesurant le débit de LOAD DATA et d'executemany")
+    parser.add_argument("--commit-size", type=int, default=WordPressDirectConnector.BATCH_SIZE, help=f"Nombre d'articles validés par transaction (par défaut: {WordPressDirectConnector.BATCH_SIZE})")
+    
+    parser.add_argument("--dry-run", action="store_true", help="Calculer les différences avec la base sans rien écrire")
+    parser.add_argument("--diff-output", help="Chemin du fichier CSV des différences (avec --dry-run)")
+    parser.add_argument("--temp-index", action="store_true", help="Créer un index (post_id, meta_key) pour la durée de la mise à jour s'il n'existe pas")
+    
+    # Arguments d'importation
+    parser.add_argument("--input", help="Chemin du fichier CSV d'entrée")
+    
+    # Sous-commande de diagnostic
+    subparsers = parser.add_subparsers(dest="command", help="Commande à exécuter (par défaut: mise à jour depuis --input)")
+    advise_parser = subparsers.add_parser("advise", help="Analyser les index et tables, et recommander une stratégie d'écriture")
+    advise_parser.add_argument("--create-index", action="store_true", help=f"Créer l'index {WordPressDirectConnector.LOOKUP_INDEX} (post_id, meta_key)")
+    advise_parser.add_argument("--drop-index", action="store_true", help=f"Supprimer l'index {WordPressDirectConnector.LOOKUP_INDEX}")
+    
+    # Analyse des arguments
+    args = parser.parse_args()
+    
+    if args.command != "advise" and not args.input:
+        parser.error("l'argument --input est requis pour la mise à jour")
+    
+    # Initialisation du logger
     logger = setup_logging()
     logger.info("Démarrage de l'application de mise à jour directe")
     
@@ -453,40 +1977,108 @@ def main():
     wp_direct = WordPressDirectConnector(logger)
     
     # Configuration de la connexion à la base de données
-    wp_direct.configure(args.host, args.user, args.password, args.database, args.prefix)
+    # Une connexion par worker en plus de celle du thread principal
+    wp_direct.configure(args.host, args.user, args.password, args.database, args.prefix, max(args.pool_size, args.workers + 1))
     
     # Connexion à la base de données
     if not wp_direct.connect():
         print("Échec de la connexion à la base de données")
         return
     
-    # Importation des données depuis le CSV
+    if args.command == "advise":
+        try:
+            advise_schema(wp_direct, args)
+        except Exception as e:
+            print(f"Erreur lors du diagnostic: {str(e)}")
+        finally:
+            wp_direct.disconnect()
+            wp_direct.close_pool()
+        return
+    
+    # Importation des données depuis le CSV, bloc par bloc (mémoire bornée par la taille des blocs)
     print(f"Importation des données depuis {args.input}...")
-    items_to_update = import_from_csv(args.input)
+    try:
+        chunks = iter_import_chunks(args.input)
+        first_chunk = next(chunks, None)
+    except Exception as e:
+        print(f"Erreur lors de l'importation CSV: {str(e)}")
+        first_chunk = None
     
-    if not items_to_update:
+    if not first_chunk:
         print("Aucun élément à mettre à jour")
         wp_direct.disconnect()
+        wp_direct.close_pool()
+        return
+    
+    chunks = itertools.chain([first_chunk], chunks)
+    
+    if args.dry_run:
+        print("Simulation de la mise à jour...")
+        counts = {}
+        
+        # Différences calculées bloc par bloc, lignes écrites au fil de l'eau
+        def diff_rows():
+            for items in chunks:
+                diff = wp_direct.preview_updates(items)
+                for key, value in diff["counts"].items():
+                    counts[key] = counts.get(key, 0) + value
+                yield from diff["rows"]
+        
+        try:
+            if args.diff_output:
+                write_csv(diff_rows(), args.diff_output, DIFF_COLUMNS)
+            else:
+                for _ in diff_rows():
+                    pass
+            print(f"Modifiés: {counts['changed']} (titres SEO: {counts['seo_title']}, descriptions: {counts['seo_description']}, titres H1: {counts['title_h1']})")
+            print(f"Inchangés: {counts['unchanged']}, introuvables: {counts['missing']}, métadonnées à créer: {counts['new_meta_rows']}")
+            if args.diff_output:
+                print(f"Différences exportées vers {args.diff_output}")
+        except Exception as e:
+            print(f"Erreur lors de la simulation: {str(e)}")
+        finally:
+            wp_direct.disconnect()
+            wp_direct.close_pool()
         return
     
     # Fonction de callback pour la progression
     def progress_callback(current, total):
         print(f"Progression: {current}/{total}")
     
-    # Mise à jour des métadonnées
-    print(f"Mise à jour de {len(items_to_update)} éléments...")
-    stats = wp_direct.bulk_update_metadata(items_to_update, progress_callback)
+    # Mise à jour des métadonnées, bloc par bloc
+    stats = {"total": 0, "success": 0, "failed": 0, "errors": []}
+    try:
+        with wp_direct.temporary_lookup_index() if args.temp_index else nullcontext():
+            try:
+                for items_to_update in chunks:
+                    print(f"Mise à jour de {len(items_to_update)} éléments...")
+                    if args.staging or args.benchmark_staging:
+                        # Chargement et fusion par bloc : un article répété dans deux blocs garde la valeur
+                        # du dernier (la table temporaire n'a pas de clé unique), et chaque transaction reste bornée
+                        merge_update_stats(stats, wp_direct.bulk_update_staged(items_to_update, progress_callback, args.benchmark_staging))
+                    else:
+                        merge_update_stats(stats, wp_direct.bulk_update_metadata(items_to_update, progress_callback, args.commit_size, args.workers))
+            except Exception as e:
+                print(f"Erreur lors de l'importation CSV: {str(e)}")
+    except Exception as e:
+        # Création ou suppression de l'index temporaire refusée (droits, verrou, espace disque)
+        print(f"Erreur lors de la gestion de l'index temporaire {wp_direct.LOOKUP_INDEX}: {str(e)}")
+    finally:
+        # Fermeture de la connexion
+        wp_direct.disconnect()
+        wp_direct.close_pool()
     
     # Affichage des résultats
     print(f"Mise à jour terminée: {stats['success']} réussies, {stats['failed']} échouées")
     
+    for method, result in stats.get("staging", {}).items():
+        if isinstance(result, dict):
+            print(f"Chargement {method}: {result['rows']} lignes en {result['seconds']}s ({result['rows_per_s']} lignes/s)")
+    
     if stats["failed"] > 0:
         print("Erreurs:")
         for error in stats.get("errors", []):
             print(f"  - {error['type']} {error['id']} ({error['title']}): {error['error']}")
-    
-    # Fermeture de la connexion
-    wp_direct.disconnect()
 
 if __name__ == "__main__":
     main()